@@ -0,0 +1,40 @@
+"""add maintenance filter indexes
+
+Revision ID: a9c4e2d7b813
+Revises: f2b9d7a4c610
+Create Date: 2026-10-17 19:41:08.271530
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9c4e2d7b813'
+down_revision: Union[str, None] = 'f2b9d7a4c610'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (name, table, columns)
+INDEXES = [
+    ('ix_maintenance_requests_unit_id_status_created_at', 'maintenance_requests', ['unit_id', 'status', 'created_at']),
+    ('ix_maintenance_requests_tenant_id_created_at', 'maintenance_requests', ['tenant_id', 'created_at']),
+    ('ix_maintenance_requests_reported_by_id_created_at', 'maintenance_requests', ['reported_by_id', 'created_at']),
+    ('ix_maintenance_requests_status_created_at', 'maintenance_requests', ['status', 'created_at']),
+]
+
+
+def upgrade() -> None:
+    # Built CONCURRENTLY so request intake is not blocked; needs autocommit
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,73 @@
+"""add property search
+
+Revision ID: b3d8f1a6c925
+Revises: a9c4e2d7b813
+Create Date: 2026-10-17 20:58:33.610274
+
+"""
+import logging
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3d8f1a6c925'
+down_revision: Union[str, None] = 'a9c4e2d7b813'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+log = logging.getLogger("alembic.runtime.migration")
+
+
+# Weighted document: name (A), address (B), amenities + highlights (C), description (D).
+# The 'simple' configuration (no stemming) suits names and addresses; the JSON
+# lists are indexed through their text form.
+SEARCH_VECTOR = """
+    setweight(to_tsvector('simple', coalesce(name, '')), 'A') ||
+    setweight(to_tsvector('simple', coalesce(address, '')), 'B') ||
+    setweight(to_tsvector('simple', coalesce(amenities::text, '') || ' ' || coalesce(highlights::text, '')), 'C') ||
+    setweight(to_tsvector('simple', coalesce(description, '')), 'D')
+"""
+
+TRIGRAM_INDEXES = [
+    ('ix_properties_name_trgm', 'name'),
+    ('ix_properties_address_trgm', 'address'),
+]
+
+
+def upgrade() -> None:
+    # The model has carried these columns without a migration; make sure they exist
+    # before the search column references them
+    for column in ('highlights', 'house_rules', 'nearby_places'):
+        op.execute(f"ALTER TABLE properties ADD COLUMN IF NOT EXISTS {column} JSON")
+
+    # A stored generated column is kept current by Postgres on every write. Adding it
+    # rewrites the table once, under an exclusive lock.
+    op.execute(f"ALTER TABLE properties ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ({SEARCH_VECTOR}) STORED")
+
+    trigram = op.get_bind().execute(
+        sa.text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+    ).scalar()
+    if trigram:
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    else:
+        log.warning("pg_trgm is not available on this server; search runs without typo tolerance")
+
+    with op.get_context().autocommit_block():
+        op.create_index('ix_properties_search_vector', 'properties', ['search_vector'], postgresql_using='gin',
+                        postgresql_concurrently=True, if_not_exists=True)
+        if trigram:
+            for name, column in TRIGRAM_INDEXES:
+                op.create_index(name, 'properties', [column], postgresql_using='gin',
+                                postgresql_ops={column: 'gin_trgm_ops'},
+                                postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, column in TRIGRAM_INDEXES:
+            op.drop_index(name, table_name='properties', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_properties_search_vector', table_name='properties', postgresql_concurrently=True, if_exists=True)
+    op.drop_column('properties', 'search_vector')
@@ -0,0 +1,41 @@
+"""add property lat band
+
+Revision ID: c5e8a2f91d47
+Revises: b3d8f1a6c925
+Create Date: 2026-10-17 22:14:05.381942
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e8a2f91d47'
+down_revision: Union[str, None] = 'b3d8f1a6c925'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Latitude rows of 1/100 degree (app.utils.geo.LAT_BANDS_PER_DEGREE); same expression
+# as the model's, whose CASE keeps SQLite's Python floor() away from NULLs
+LAT_BAND = "CASE WHEN location_lat IS NOT NULL THEN CAST(floor(location_lat * 100) AS INTEGER) END"
+
+
+def upgrade() -> None:
+    # Stored generated column: Postgres keeps it in step with location_lat on every
+    # write. Adding it rewrites the table once, under an exclusive lock.
+    op.add_column('properties', sa.Column('lat_band', sa.Integer(), sa.Computed(LAT_BAND, persisted=True), nullable=True))
+
+    # Nearby lookups probe each band for a longitude range: one index descent per band
+    with op.get_context().autocommit_block():
+        op.create_index('ix_properties_lat_band_location_lng', 'properties', ['lat_band', 'location_lng'],
+                        postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_properties_lat_band_location_lng', table_name='properties',
+                      postgresql_concurrently=True, if_exists=True)
+    op.drop_column('properties', 'lat_band')
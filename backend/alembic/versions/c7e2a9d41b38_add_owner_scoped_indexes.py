@@ -0,0 +1,53 @@
+"""add owner scoped indexes
+
+Revision ID: c7e2a9d41b38
+Revises: a1b2c3d4e5f6
+Create Date: 2026-10-17 09:12:44.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7e2a9d41b38'
+down_revision: Union[str, None] = 'a1b2c3d4e5f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (name, table, columns, extra kwargs)
+INDEXES = [
+    ('ix_properties_owner_id', 'properties', ['owner_id'], {}),
+    ('ix_units_property_id', 'units', ['property_id'], {}),
+    ('ix_units_property_id_status', 'units', ['property_id', 'status'], {}),
+    ('ix_tenancies_unit_id', 'tenancies', ['unit_id'], {}),
+    ('ix_tenancies_status', 'tenancies', ['status'], {}),
+    ('ix_tenancies_active_unit_id', 'tenancies', ['unit_id'], {'postgresql_where': sa.text("status = 'ACTIVE'")}),
+    ('ix_tenancies_tenant_id_status_start_date', 'tenancies', ['tenant_id', 'status', 'start_date'], {}),
+    ('ix_payments_tenancy_id', 'payments', ['tenancy_id'], {}),
+    ('ix_payments_unit_id', 'payments', ['unit_id'], {}),
+    ('ix_payments_payment_date', 'payments', ['payment_date'], {}),
+    ('ix_payments_tenancy_id_type_date', 'payments', ['tenancy_id', 'payment_type', 'payment_date'], {}),
+    ('ix_maintenance_requests_unit_id', 'maintenance_requests', ['unit_id'], {}),
+    ('ix_maintenance_requests_tenant_id', 'maintenance_requests', ['tenant_id'], {}),
+    ('ix_maintenance_requests_created_at', 'maintenance_requests', ['created_at'], {}),
+    ('ix_maintenance_comments_request_id_created_at', 'maintenance_comments', ['request_id', 'created_at'], {}),
+]
+
+
+def upgrade() -> None:
+    # CONCURRENTLY avoids locking the ledger tables for writes while the indexes
+    # build; it cannot run inside a transaction, hence the autocommit block.
+    with op.get_context().autocommit_block():
+        for name, table, columns, kwargs in INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True,
+                            if_not_exists=True, **kwargs)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns, kwargs in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
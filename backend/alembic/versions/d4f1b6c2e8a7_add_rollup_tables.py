@@ -0,0 +1,117 @@
+"""add rollup tables
+
+Revision ID: d4f1b6c2e8a7
+Revises: c7e2a9d41b38
+Create Date: 2026-10-17 14:03:27.551902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4f1b6c2e8a7'
+down_revision: Union[str, None] = 'c7e2a9d41b38'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Backfill queries, frozen as of this revision (the live versions are
+# app.utils.rollups.ROLLUP_SOURCES, which may change after this migration ships)
+BACKFILL = {
+    "property_rollups": """
+        SELECT p.id AS property_id, p.owner_id,
+               COUNT(u.id) AS units_total,
+               COUNT(u.id) FILTER (WHERE u.status = 'OCCUPIED') AS units_occupied,
+               COUNT(u.id) FILTER (WHERE u.status = 'VACANT') AS units_vacant,
+               COUNT(u.id) FILTER (WHERE u.status = 'UNDER_MAINTENANCE') AS units_under_maintenance,
+               COALESCE(MAX(t.active_tenancies), 0) AS active_tenancies,
+               COALESCE(MAX(t.projected_rent), 0) AS projected_rent
+        FROM properties p
+        LEFT JOIN units u ON u.property_id = p.id
+        LEFT JOIN (
+            SELECT u2.property_id, COUNT(*) AS active_tenancies, COALESCE(SUM(t2.rent_amount), 0) AS projected_rent
+            FROM tenancies t2 JOIN units u2 ON u2.id = t2.unit_id
+            WHERE t2.status = 'ACTIVE'
+            GROUP BY u2.property_id
+        ) t ON t.property_id = p.id
+        GROUP BY p.id, p.owner_id
+    """,
+    # Runs after property_rollups is filled
+    "owner_rollups": """
+        SELECT pr.owner_id,
+               COUNT(*) AS properties_count,
+               SUM(pr.units_total) AS units_total,
+               SUM(pr.units_occupied) AS units_occupied,
+               SUM(pr.units_vacant) AS units_vacant,
+               SUM(pr.units_under_maintenance) AS units_under_maintenance,
+               SUM(pr.active_tenancies) AS active_tenancies,
+               SUM(pr.projected_rent) AS projected_rent
+        FROM property_rollups pr
+        GROUP BY pr.owner_id
+    """,
+    "revenue_rollups": """
+        SELECT u.property_id,
+               CAST(date_trunc('month', pay.payment_date) AS DATE) AS month,
+               p.owner_id,
+               COALESCE(SUM(pay.amount) FILTER (WHERE pay.payment_type = 'RENT'), 0) AS rent_total,
+               COALESCE(SUM(pay.amount) FILTER (WHERE pay.payment_type <> 'RENT'), 0) AS other_total,
+               COUNT(*) AS payment_count
+        FROM payments pay
+        LEFT JOIN tenancies t ON t.id = pay.tenancy_id
+        JOIN units u ON u.id = COALESCE(t.unit_id, pay.unit_id)
+        JOIN properties p ON p.id = u.property_id
+        GROUP BY u.property_id, CAST(date_trunc('month', pay.payment_date) AS DATE), p.owner_id
+    """,
+}
+
+
+def _counters():
+    return [
+        sa.Column('units_total', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('units_occupied', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('units_vacant', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('units_under_maintenance', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('active_tenancies', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('projected_rent', sa.Float(), nullable=False, server_default='0'),
+    ]
+
+
+def upgrade() -> None:
+    op.create_table(
+        'property_rollups',
+        sa.Column('property_id', sa.Integer(), sa.ForeignKey('properties.id'), primary_key=True),
+        sa.Column('owner_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=False),
+        *_counters(),
+    )
+    op.create_index('ix_property_rollups_owner_id', 'property_rollups', ['owner_id'])
+    op.create_table(
+        'owner_rollups',
+        sa.Column('owner_id', sa.Integer(), sa.ForeignKey('users.id'), primary_key=True),
+        sa.Column('properties_count', sa.Integer(), nullable=False, server_default='0'),
+        *_counters(),
+    )
+    op.create_table(
+        'revenue_rollups',
+        sa.Column('property_id', sa.Integer(), sa.ForeignKey('properties.id'), primary_key=True),
+        sa.Column('month', sa.Date(), primary_key=True),
+        sa.Column('owner_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=False),
+        sa.Column('rent_total', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('other_total', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('payment_count', sa.Integer(), nullable=False, server_default='0'),
+    )
+    op.create_index('ix_revenue_rollups_owner_id_month', 'revenue_rollups', ['owner_id', 'month'])
+
+    # Backfill from the existing ledger
+    for table, source in BACKFILL.items():
+        op.execute(f"INSERT INTO {table} {source}")
+
+
+def downgrade() -> None:
+    op.drop_index('ix_revenue_rollups_owner_id_month', table_name='revenue_rollups')
+    op.drop_table('revenue_rollups')
+    op.drop_table('owner_rollups')
+    op.drop_index('ix_property_rollups_owner_id', table_name='property_rollups')
+    op.drop_table('property_rollups')
@@ -0,0 +1,81 @@
+"""jsonb filter columns
+
+Revision ID: d9a4f6b2c178
+Revises: c5e8a2f91d47
+Create Date: 2026-10-17 23:02:51.774310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9a4f6b2c178'
+down_revision: Union[str, None] = 'c5e8a2f91d47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+COLUMNS = [
+    ('properties', 'amenities'),
+    ('properties', 'highlights'),
+    ('properties', 'house_rules'),
+    ('units', 'specifications'),
+]
+
+INDEXES = [
+    ('ix_properties_amenities', 'properties', 'amenities'),
+    ('ix_properties_highlights', 'properties', 'highlights'),
+    ('ix_properties_house_rules', 'properties', 'house_rules'),
+    ('ix_units_specifications', 'units', 'specifications'),
+]
+
+# Unchanged from b3d8f1a6c925; jsonb::text tokenizes the same as json::text
+SEARCH_VECTOR = """
+    setweight(to_tsvector('simple', coalesce(name, '')), 'A') ||
+    setweight(to_tsvector('simple', coalesce(address, '')), 'B') ||
+    setweight(to_tsvector('simple', coalesce(amenities::text, '') || ' ' || coalesce(highlights::text, '')), 'C') ||
+    setweight(to_tsvector('simple', coalesce(description, '')), 'D')
+"""
+
+
+def convert(target: str) -> None:
+    # search_vector reads amenities and highlights, and Postgres refuses to change
+    # the type of a column a generated column depends on: drop it, convert, and
+    # re-add it, all in one ALTER TABLE so each table is rewritten once
+    actions = ["DROP COLUMN search_vector"]
+    actions += [f"ALTER COLUMN {column} TYPE {target} USING {column}::{target}"
+                for table, column in COLUMNS if table == 'properties']
+    actions.append(f"ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ({SEARCH_VECTOR}) STORED")
+    op.execute(f"ALTER TABLE properties {', '.join(actions)}")
+    for table, column in COLUMNS:
+        if table != 'properties':
+            op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE {target} USING {column}::{target}")
+
+
+def upgrade() -> None:
+    # Both tables are rewritten under an exclusive lock
+    convert('jsonb')
+
+    with op.get_context().autocommit_block():
+        # Dropped with the old search_vector column
+        op.create_index('ix_properties_search_vector', 'properties', ['search_vector'], postgresql_using='gin',
+                        postgresql_concurrently=True, if_not_exists=True)
+        for name, table, column in INDEXES:
+            op.create_index(name, table, [column], postgresql_using='gin',
+                            postgresql_ops={column: 'jsonb_path_ops'},
+                            postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, column in INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+
+    convert('json')
+
+    with op.get_context().autocommit_block():
+        op.create_index('ix_properties_search_vector', 'properties', ['search_vector'], postgresql_using='gin',
+                        postgresql_concurrently=True, if_not_exists=True)
@@ -0,0 +1,60 @@
+"""add payment monthly rollups
+
+Revision ID: e8a3c5f17d92
+Revises: d4f1b6c2e8a7
+Create Date: 2026-10-17 16:41:09.227315
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8a3c5f17d92'
+down_revision: Union[str, None] = 'd4f1b6c2e8a7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Backfill query, frozen as of this revision (the live version is
+# app.utils.rollups.ROLLUP_SOURCES["payment_monthly_rollups"])
+BACKFILL = """
+    SELECT u.id AS unit_id,
+           pay.payment_type,
+           CAST(date_trunc('month', pay.payment_date) AS DATE) AS month,
+           u.property_id,
+           p.owner_id,
+           SUM(pay.amount) AS total,
+           COUNT(*) AS count
+    FROM payments pay
+    LEFT JOIN tenancies t ON t.id = pay.tenancy_id
+    JOIN units u ON u.id = COALESCE(t.unit_id, pay.unit_id)
+    JOIN properties p ON p.id = u.property_id
+    GROUP BY u.id, pay.payment_type, CAST(date_trunc('month', pay.payment_date) AS DATE), u.property_id, p.owner_id
+"""
+
+
+def upgrade() -> None:
+    op.create_table(
+        'payment_monthly_rollups',
+        sa.Column('unit_id', sa.Integer(), sa.ForeignKey('units.id'), primary_key=True),
+        sa.Column('payment_type', sa.String(), primary_key=True),
+        sa.Column('month', sa.Date(), primary_key=True),
+        sa.Column('property_id', sa.Integer(), sa.ForeignKey('properties.id'), nullable=False),
+        sa.Column('owner_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=False),
+        sa.Column('total', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('count', sa.Integer(), nullable=False, server_default='0'),
+    )
+    op.create_index('ix_payment_monthly_rollups_property_id_month', 'payment_monthly_rollups', ['property_id', 'month'])
+    op.create_index('ix_payment_monthly_rollups_owner_id_month', 'payment_monthly_rollups', ['owner_id', 'month'])
+
+    # Backfill from the existing ledger
+    op.execute(f"INSERT INTO payment_monthly_rollups {BACKFILL}")
+
+
+def downgrade() -> None:
+    op.drop_index('ix_payment_monthly_rollups_owner_id_month', table_name='payment_monthly_rollups')
+    op.drop_index('ix_payment_monthly_rollups_property_id_month', table_name='payment_monthly_rollups')
+    op.drop_table('payment_monthly_rollups')
@@ -0,0 +1,32 @@
+"""add row versions
+
+Revision ID: f2b9d7a4c610
+Revises: e8a3c5f17d92
+Create Date: 2026-10-17 18:22:51.904417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b9d7a4c610'
+down_revision: Union[str, None] = 'e8a3c5f17d92'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TABLES = ['users', 'properties', 'units', 'tenancies']
+
+
+def upgrade() -> None:
+    # A constant default is a metadata-only change on Postgres 11+, no table rewrite
+    for table in TABLES:
+        op.add_column(table, sa.Column('version', sa.Integer(), nullable=False, server_default='1'))
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.drop_column(table, 'version')
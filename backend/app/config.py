@@ -3,6 +3,29 @@ from typing import Optional
 
 class Settings(BaseSettings):
     DATABASE_URL: str
+    # Optional read replica for read-only routes (see get_read_db)
+    READ_DATABASE_URL: Optional[str] = None
+    # Seconds a caller's reads stay on the primary after one of their writes
+    READ_AFTER_WRITE_STICKY_SECONDS: float = 5.0
+    # Engine profile: "dev", "prod" or "test" (see app/utils/db_pool.py).
+    # The DB_* overrides below take precedence over the profile defaults.
+    DB_PROFILE: str = "prod"
+    DB_POOL_SIZE: Optional[int] = None
+    DB_MAX_OVERFLOW: Optional[int] = None
+    DB_POOL_TIMEOUT: Optional[int] = None
+    DB_POOL_RECYCLE: Optional[int] = None
+    DB_POOL_PRE_PING: Optional[bool] = None
+    DB_STATEMENT_TIMEOUT_MS: Optional[int] = None
+    # Debug switch: log every SQL statement (as DEBUG records); no profile turns it on
+    DB_LOG_SQL: bool = False
+    # Per-request statement budget and N+1 detection (see app/utils/query_stats.py);
+    # 0 disables the check
+    DB_QUERY_BUDGET: int = 15
+    DB_REPEATED_STATEMENT_THRESHOLD: int = 5
+    # Slow-query log with sampled EXPLAIN (ANALYZE, BUFFERS) capture (see app/utils/slow_query.py)
+    SLOW_QUERY_THRESHOLD_MS: float = 500
+    SLOW_QUERY_EXPLAIN_SAMPLE_RATE: float = 0.1
+    SLOW_QUERY_LOG_SIZE: int = 200
     FIREBASE_CREDENTIALS_JSON: Optional[str] = None
     FIREBASE_STORAGE_BUCKET: Optional[str] = None
     OPENAI_API_KEY: Optional[str] = None
@@ -10,6 +33,48 @@ class Settings(BaseSettings):
     SECRET_KEY: str = "supersecret"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+
+    # Verified ID token cache (see app/utils/token_cache.py)
+    TOKEN_CACHE_MAX_SIZE: int = 10000
+    TOKEN_CACHE_TTL_SECONDS: int = 300
+    TOKEN_REVOCATION_RECHECK_SECONDS: int = 60
+    # Thread pool used for blocking Firebase verification calls
+    AUTH_VERIFY_MAX_WORKERS: int = 8
+    AUTH_VERIFY_MAX_CONCURRENCY: int = 32
+    AUTH_VERIFY_TIMEOUT_SECONDS: float = 5.0
+    # "firebase" calls the Admin SDK; "local" verifies signatures against a cached
+    # public key set and a periodically synced revocation list (app/utils/local_verifier.py)
+    AUTH_VERIFIER_MODE: str = "firebase"
+    FIREBASE_PROJECT_ID: Optional[str] = None
+    FIREBASE_PUBLIC_KEYS_URL: str = "https://www.googleapis.com/robot/v1/metadata/x509/securetoken@system.gserviceaccount.com"
+    AUTH_REVOCATION_SYNC_SECONDS: int = 300
+
+    # uid -> user snapshot cache behind get_current_user (see app/utils/identity_cache.py)
+    IDENTITY_CACHE_MAX_SIZE: int = 10000
+    IDENTITY_CACHE_TTL_SECONDS: int = 60
+
+    # Dashboard response cache (see app/utils/response_cache.py); 0 disables it.
+    # "memory" is per worker; "redis" shares entries and invalidations across workers.
+    RESPONSE_CACHE_TTL_SECONDS: float = 30
+    RESPONSE_CACHE_MAX_SIZE: int = 5000
+    RESPONSE_CACHE_BACKEND: str = "memory"
+    RESPONSE_CACHE_REDIS_URL: Optional[str] = None
+
+    # Keyset pagination for list endpoints (see app/utils/pagination.py). Requests
+    # without ?limit/?cursor get the legacy bare list, capped at PAGINATION_COMPAT_LIMIT
+    # rows (0 = unbounded, the pre-pagination behaviour; kept until the frontend
+    # sends ?limit= and follows X-Next-Cursor).
+    PAGE_SIZE_DEFAULT: int = 50
+    PAGE_SIZE_MAX: int = 200
+    PAGINATION_COMPAT_LIMIT: int = 0
+
+    # Rows fetched per round trip by streaming exports (server-side cursor batch size)
+    EXPORT_BATCH_SIZE: int = 1000
+
+    # GET /properties/nearby: radius when only a point is given, and the largest
+    # radius accepted (bounding boxes may be at most twice as tall)
+    NEARBY_DEFAULT_RADIUS_KM: float = 5
+    NEARBY_MAX_RADIUS_KM: float = 50
     
     class Config:
         env_file = ".env"
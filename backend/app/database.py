@@ -1,22 +1,115 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import NullPool
+from fastapi import Request
 from app.config import settings
+from app.utils.db_pool import (
+    ENGINE_PROFILES, PoolMetrics, instrumented_pool_class, instrument_pool, enable_sql_logging
+)
+from app.utils.read_routing import StickyWindow
+from app.utils.query_stats import RouteQueryMetrics, instrument_statements
+from app.utils.slow_query import SlowQueryLog
+
+def normalize_url(url: str) -> str:
+    if url.startswith("postgres://"):
+        return url.replace("postgres://", "postgresql+psycopg://", 1)
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+psycopg://", 1)
+    return url
+
+DATABASE_URL = normalize_url(settings.DATABASE_URL)
+READ_DATABASE_URL = normalize_url(settings.READ_DATABASE_URL) if settings.READ_DATABASE_URL else None
+
+def engine_config(profile: str = settings.DB_PROFILE) -> dict:
+    """Profile defaults with any explicit DB_* settings applied on top."""
+    if profile not in ENGINE_PROFILES:
+        raise ValueError(f"Unknown DB_PROFILE '{profile}', expected one of {list(ENGINE_PROFILES)}")
+    config = dict(ENGINE_PROFILES[profile])
+    overrides = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "statement_timeout_ms": settings.DB_STATEMENT_TIMEOUT_MS,
+    }
+    config.update({k: v for k, v in overrides.items() if v is not None})
+    return config
+
+def build_engine(url: str, config: dict, metrics: PoolMetrics):
+    kwargs = {"pool_pre_ping": config["pool_pre_ping"]}
+    if config["pool_size"] is None:
+        kwargs["poolclass"] = NullPool
+    else:
+        kwargs.update(
+            poolclass=instrumented_pool_class(metrics),
+            pool_size=config["pool_size"],
+            max_overflow=config["max_overflow"],
+            pool_timeout=config["pool_timeout"],
+            pool_recycle=config["pool_recycle"],
+        )
+    if url.startswith("postgresql") and config["statement_timeout_ms"]:
+        # Enforced server-side, so runaway queries are cancelled by Postgres itself
+        kwargs["connect_args"] = {"options": f"-c statement_timeout={config['statement_timeout_ms']}"}
+    new_engine = create_async_engine(url, **kwargs)
+    instrument_pool(new_engine.sync_engine, metrics)
+    instrument_statements(new_engine.sync_engine)
+    slow_query_log.instrument(new_engine)
+    return new_engine
+
+# Statements slower than SLOW_QUERY_THRESHOLD_MS on any engine, served on /admin/slow-queries
+slow_query_log = SlowQueryLog(
+    threshold_ms=settings.SLOW_QUERY_THRESHOLD_MS,
+    explain_sample_rate=settings.SLOW_QUERY_EXPLAIN_SAMPLE_RATE,
+    max_entries=settings.SLOW_QUERY_LOG_SIZE,
+)
 
-DATABASE_URL = settings.DATABASE_URL
+ENGINE_CONFIG = engine_config()
+if settings.DB_LOG_SQL:
+    enable_sql_logging()
 
-if DATABASE_URL.startswith("postgres://"):
-    DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql+psycopg://", 1)
-elif DATABASE_URL.startswith("postgresql://"):
-    DATABASE_URL = DATABASE_URL.replace("postgresql://", "postgresql+psycopg://", 1)
+# Per-engine pool metrics, reported on /admin/db-pool
+pool_metrics = {"primary": PoolMetrics()}
+engine = build_engine(DATABASE_URL, ENGINE_CONFIG, pool_metrics["primary"])
 
-engine = create_async_engine(DATABASE_URL, echo=True)
+# Falls back to the primary when no replica is configured
+read_engine = engine
+if READ_DATABASE_URL:
+    pool_metrics["replica"] = PoolMetrics()
+    read_engine = build_engine(READ_DATABASE_URL, ENGINE_CONFIG, pool_metrics["replica"])
+
+# Statements and DB time per route, fed by the count_queries middleware
+route_query_metrics = RouteQueryMetrics(
+    query_budget=settings.DB_QUERY_BUDGET,
+    repeat_threshold=settings.DB_REPEATED_STATEMENT_THRESHOLD,
+)
+
+def pool_stats() -> dict:
+    engines = {"primary": engine, "replica": read_engine}
+    return {name: metrics.stats(engines[name].sync_engine.pool) for name, metrics in pool_metrics.items()}
 
 AsyncSessionLocal = sessionmaker(
     engine, class_=AsyncSession, expire_on_commit=False
 )
+ReadSessionLocal = sessionmaker(
+    read_engine, class_=AsyncSession, expire_on_commit=False
+)
+
+sticky_writes = StickyWindow(seconds=settings.READ_AFTER_WRITE_STICKY_SECONDS)
 
 Base = declarative_base()
 
 async def get_db():
     async with AsyncSessionLocal() as session:
         yield session
+
+async def get_read_db(request: Request):
+    """
+    Session for read-only routes. Uses the replica unless the caller asked for the
+    primary (X-Read-Primary header) or wrote within the sticky window.
+    """
+    session_factory = ReadSessionLocal
+    if read_engine is not engine and sticky_writes.should_use_primary(request):
+        session_factory = AsyncSessionLocal
+    async with session_factory() as session:
+        yield session
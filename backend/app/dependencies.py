@@ -4,6 +4,54 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.database import get_db
 from app.models import User
+from app.config import settings
+from app.utils.token_cache import TokenCache, VerificationPool, firebase_verifier
+from app.utils.local_verifier import (
+    LocalTokenVerifier, PublicKeySet, RevokedUidSet, http_key_fetcher, firebase_revocation_source
+)
+from app.utils.identity_cache import IdentityCache, UserSnapshot
+from app.utils.response_cache import ResponseCache, MemoryBackend, RedisBackend
+import asyncio
+import json
+
+def _firebase_project_id():
+    if settings.FIREBASE_PROJECT_ID:
+        return settings.FIREBASE_PROJECT_ID
+    if settings.FIREBASE_CREDENTIALS_JSON:
+        return json.loads(settings.FIREBASE_CREDENTIALS_JSON).get("project_id")
+    return None
+
+local_verifier = None
+if settings.AUTH_VERIFIER_MODE == "local":
+    local_verifier = LocalTokenVerifier(
+        project_id=_firebase_project_id(),
+        keys=PublicKeySet(http_key_fetcher(settings.FIREBASE_PUBLIC_KEYS_URL)),
+        revoked=RevokedUidSet(firebase_revocation_source, sync_seconds=settings.AUTH_REVOCATION_SYNC_SECONDS),
+    )
+
+token_cache = TokenCache(
+    verifier=local_verifier or firebase_verifier,
+    max_size=settings.TOKEN_CACHE_MAX_SIZE,
+    ttl_seconds=settings.TOKEN_CACHE_TTL_SECONDS,
+    revocation_recheck_seconds=settings.TOKEN_REVOCATION_RECHECK_SECONDS,
+)
+identity_cache = IdentityCache(
+    max_size=settings.IDENTITY_CACHE_MAX_SIZE,
+    ttl_seconds=settings.IDENTITY_CACHE_TTL_SECONDS,
+)
+response_cache = ResponseCache(
+    backend=(
+        RedisBackend(settings.RESPONSE_CACHE_REDIS_URL)
+        if settings.RESPONSE_CACHE_BACKEND == "redis"
+        else MemoryBackend(max_size=settings.RESPONSE_CACHE_MAX_SIZE)
+    ),
+    ttl_seconds=settings.RESPONSE_CACHE_TTL_SECONDS,
+)
+verification_pool = VerificationPool(
+    max_workers=settings.AUTH_VERIFY_MAX_WORKERS,
+    max_concurrency=settings.AUTH_VERIFY_MAX_CONCURRENCY,
+    timeout_seconds=settings.AUTH_VERIFY_TIMEOUT_SECONDS,
+)
 
 async def get_current_user_uid(authorization: str = Header(...)):
     if not authorization.startswith("Bearer "):
@@ -14,9 +62,13 @@ async def get_current_user_uid(authorization: str = Header(...)):
     token = authorization.split("Bearer ")[1]
     try:
         # Verify the ID token while checking if the token is revoked by
-        # passing check_revoked=True.
+        # passing check_revoked=True. Verified tokens are cached so Firebase is
+        # only consulted on a miss or when revocation is due for a re-check,
+        # and then on a thread pool so the event loop keeps serving requests.
+        # Local verification is CPU-only and runs inline.
         # Note: This requires Firebase Admin to be initialized.
-        decoded_token = auth.verify_id_token(token, check_revoked=True)
+        pool = None if local_verifier else verification_pool
+        decoded_token = await token_cache.verify_async(token, pool)
         uid = decoded_token['uid']
         return uid
     except auth.InvalidIdTokenError:
@@ -34,6 +86,11 @@ async def get_current_user_uid(authorization: str = Header(...)):
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Revoked ID token",
         )
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication service timed out",
+        )
     except Exception as e:
         print(f"Auth error: {e}")
         raise HTTPException(
@@ -45,6 +102,13 @@ async def get_current_user(
     uid: str = Depends(get_current_user_uid),
     db: AsyncSession = Depends(get_db)
 ):
+    """
+    Returns a read-only UserSnapshot, served from the identity cache when possible.
+    Routers that need to modify the user must load the ORM row themselves.
+    """
+    snapshot = identity_cache.get(uid)
+    if snapshot:
+        return snapshot
     result = await db.execute(select(User).where(User.firebase_uid == uid))
     user = result.scalars().first()
     if not user:
@@ -53,13 +117,13 @@ async def get_current_user(
         # OR we can just return None and handle it in the router
         return None 
         # raise HTTPException(status_code=404, detail="User not found")
-    return user
+    return identity_cache.put(uid, UserSnapshot.model_validate(user))
 
 def require_role(role: str):
     """
     Factory to create a dependency that checks if the user has the required role.
     """
-    async def role_checker(user: User = Depends(get_current_user)):
+    async def role_checker(user: UserSnapshot = Depends(get_current_user)):
         if user.role != role and user.role != "ADMIN":
              # ADMIN overrides all role checks usually, or we can be strict.
              # Current app logic often allowed ADMIN fallback.
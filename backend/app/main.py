@@ -1,10 +1,15 @@
-from fastapi import FastAPI
-from app.database import engine, Base
+from fastapi import FastAPI, Request
+from fastapi.responses import ORJSONResponse
+from app.database import engine, read_engine, sticky_writes, route_query_metrics, Base
+from app.utils.read_routing import WRITE_METHODS, client_key
+from app.utils.query_stats import RequestQueryStats, current_request_stats
+from app.utils.db_pool import disable_sql_logging
 import firebase_admin
 from firebase_admin import credentials
 import json
 import os
 from app.config import settings
+from app.dependencies import verification_pool, local_verifier, response_cache
 
 from app.routers import auth, properties, tenancy, maintenance, finance, storage, admin, owner
 
@@ -12,6 +17,7 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from contextlib import asynccontextmanager
 from sqlalchemy import text
+from sqlalchemy.orm.exc import StaleDataError
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -24,13 +30,36 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         print(f"Startup: Database connection FAILED: {e}")
         raise e # Fail fast so we see the error in logs immediately
+
+    if local_verifier:
+        await local_verifier.start()
+        print("Startup: Local token verifier started")
     
     yield
     
     # Shutdown logic if needed
     print("Shutdown: Application stopping")
+    verification_pool.shutdown()
+    await response_cache.close()
+    if local_verifier:
+        await local_verifier.stop()
+    await engine.dispose()
+    if read_engine is not engine:
+        await read_engine.dispose()
+    disable_sql_logging()
+
+# Routes declare response models, so bodies reach the response class as plain JSON
+# types already validated by pydantic-core; orjson then encodes them
+app = FastAPI(title="Property Management Portal", lifespan=lifespan, default_response_class=ORJSONResponse)
 
-app = FastAPI(title="Property Management Portal", lifespan=lifespan)
+@app.exception_handler(StaleDataError)
+async def stale_data_handler(request: Request, exc: StaleDataError):
+    # The row's version changed since it was loaded (version_id_col): a concurrent
+    # update won, so the caller should re-read and retry rather than overwrite it
+    return ORJSONResponse(
+        status_code=409,
+        content={"detail": "The resource was modified by another request. Reload it and try again."},
+    )
 
 origins = [
     "http://localhost:3000",
@@ -59,8 +88,43 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Response headers browsers only show to scripts when listed here
+    expose_headers=["X-Next-Cursor", "X-DB-Queries", "X-DB-Time"],
 )
 
+@app.middleware("http")
+async def track_writes(request: Request, call_next):
+    response = await call_next(request)
+    # Keep this caller's reads on the primary briefly so they see their own write
+    if request.method in WRITE_METHODS and response.status_code < 400:
+        sticky_writes.mark(client_key(request))
+    return response
+
+@app.middleware("http")
+async def count_queries(request: Request, call_next):
+    stats = RequestQueryStats(request.scope)
+    token = current_request_stats.set(stats)
+    try:
+        response = await call_next(request)
+    finally:
+        current_request_stats.reset(token)
+    # A body without a known length (StreamingResponse) is produced after the headers
+    # are sent, and its queries with it: no headers then, and metrics once it ends
+    if "content-length" not in response.headers and response.status_code not in (204, 304):
+        response.body_iterator = observe_when_sent(response.body_iterator, stats)
+        return response
+    route_query_metrics.observe(stats.route_name, stats)
+    response.headers["X-DB-Queries"] = str(stats.count)
+    response.headers["X-DB-Time"] = f"{stats.total_seconds * 1000:.2f}"
+    return response
+
+async def observe_when_sent(body_iterator, stats: RequestQueryStats):
+    try:
+        async for chunk in body_iterator:
+            yield chunk
+    finally:
+        route_query_metrics.observe(stats.route_name, stats)
+
 # Initialize Firebase
 if settings.FIREBASE_CREDENTIALS_JSON:
     # Fail fast if credentials are invalid
@@ -3,3 +3,4 @@ from .properties import Property, Unit
 from .tenancy import Tenancy
 from .maintenance import MaintenanceRequest, RequestStatus, MaintenanceComment
 from .finance import Payment, PaymentType
+from .rollups import PropertyRollup, OwnerRollup, RevenueRollup, PaymentMonthlyRollup
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, Float, Date, String
+from sqlalchemy import Column, Integer, ForeignKey, Float, Date, String, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 import enum
@@ -17,15 +17,20 @@ class Payment(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     # Tenancy is optional now, because TAX/EB might not be linked to a tenancy but to a property/unit
-    tenancy_id = Column(Integer, ForeignKey("tenancies.id"), nullable=True)
+    tenancy_id = Column(Integer, ForeignKey("tenancies.id"), nullable=True, index=True)
     # New: Link payment to Unit explicitly if it's a generic expense like Tax/EB? 
     # For simplicity, Owner can link generic expenses to a Unit.
-    unit_id = Column(Integer, ForeignKey("units.id"), nullable=True)
+    unit_id = Column(Integer, ForeignKey("units.id"), nullable=True, index=True)
     
     amount = Column(Float, nullable=False)
     payment_type = Column(String, nullable=False)
-    payment_date = Column(Date, nullable=False)
+    payment_date = Column(Date, nullable=False, index=True)
     status = Column(String, default="PAID") # PENDING, PAID, FAILED
+
+    __table_args__ = (
+        # Revenue / spend windows per tenancy
+        Index("ix_payments_tenancy_id_type_date", "tenancy_id", "payment_type", "payment_date"),
+    )
     
     tenancy = relationship("Tenancy", back_populates="payments")
     unit = relationship("Unit", back_populates="payments")
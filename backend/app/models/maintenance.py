@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, JSON, DateTime
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, JSON, DateTime, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -14,8 +14,8 @@ class MaintenanceRequest(Base):
     __tablename__ = "maintenance_requests"
 
     id = Column(Integer, primary_key=True, index=True)
-    unit_id = Column(Integer, ForeignKey("units.id"), nullable=False)
-    tenant_id = Column(Integer, ForeignKey("users.id"), nullable=True) # Optional if raised by owner for empty unit
+    unit_id = Column(Integer, ForeignKey("units.id"), nullable=False, index=True)
+    tenant_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True) # Optional if raised by owner for empty unit
     reported_by_id = Column(Integer, ForeignKey("users.id"), nullable=False) # Who actually reported it (Owner or Tenant)
     
     title = Column(String, nullable=False)
@@ -23,7 +23,7 @@ class MaintenanceRequest(Base):
     images = Column(JSON, nullable=True)
     status = Column(String, default=RequestStatus.OPEN.value)
     
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     unit = relationship("Unit", back_populates="maintenance_requests")
@@ -31,6 +31,16 @@ class MaintenanceRequest(Base):
     reported_by = relationship("User", foreign_keys=[reported_by_id], back_populates="maintenance_requests_reported")
     comments = relationship("MaintenanceComment", back_populates="request", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # Owner lists reach requests through their unit ids; status filter, newest first
+        Index("ix_maintenance_requests_unit_id_status_created_at", "unit_id", "status", "created_at"),
+        # Tenant lists and the reporter filter, newest first
+        Index("ix_maintenance_requests_tenant_id_created_at", "tenant_id", "created_at"),
+        Index("ix_maintenance_requests_reported_by_id_created_at", "reported_by_id", "created_at"),
+        # Admin-wide status filter
+        Index("ix_maintenance_requests_status_created_at", "status", "created_at"),
+    )
+
 class MaintenanceComment(Base):
     __tablename__ = "maintenance_comments"
 
@@ -43,3 +53,8 @@ class MaintenanceComment(Base):
 
     request = relationship("MaintenanceRequest", back_populates="comments")
     user = relationship("User") # To know who commented
+
+    __table_args__ = (
+        # Comment thread per request, in display order (also serves request_id lookups)
+        Index("ix_maintenance_comments_request_id_created_at", "request_id", "created_at"),
+    )
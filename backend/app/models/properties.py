@@ -1,12 +1,22 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Text, JSON, Float, Date
+from sqlalchemy import Column, Integer, String, ForeignKey, Text, JSON, Float, Date, Index, Computed
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from app.database import Base
+from app.utils.geo import LAT_BANDS_PER_DEGREE
+
+# JSONB on Postgres, so filters can use GIN-indexed containment (see
+# app/utils/json_filters.py); plain JSON on other databases
+FilterableJSON = JSON().with_variant(JSONB(), "postgresql")
+
+def gin_index(name: str, column: str) -> Index:
+    # jsonb_path_ops: smaller and faster than the default opclass, but only for @>
+    return Index(name, column, postgresql_using="gin", postgresql_ops={column: "jsonb_path_ops"})
 
 class Property(Base):
     __tablename__ = "properties"
 
     id = Column(Integer, primary_key=True, index=True)
-    owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    owner_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     name = Column(String, nullable=False)
     address = Column(Text, nullable=False)
     description = Column(Text, nullable=True)
@@ -15,23 +25,40 @@ class Property(Base):
     location_lat = Column(Float, nullable=True)
     location_lng = Column(Float, nullable=True)
     location_lng = Column(Float, nullable=True)
-    amenities = Column(JSON, nullable=True) # List of strings: ["Gym", "Pool"]
-    highlights = Column(JSON, nullable=True) # List of strings: ["Peaceful", "City Center"]
-    house_rules = Column(JSON, nullable=True) # List of strings: ["No smoking", "Pets allowed"]
+    # Latitude grid row kept by the database; with location_lng it makes "near a
+    # point" a set of B-tree range scans (see GET /properties/nearby)
+    lat_band = Column(Integer, Computed(
+        f"CASE WHEN location_lat IS NOT NULL THEN CAST(floor(location_lat * {LAT_BANDS_PER_DEGREE}) AS INTEGER) END",
+        persisted=True,
+    ))
+    amenities = Column(FilterableJSON, nullable=True) # List of strings: ["Gym", "Pool"]
+    highlights = Column(FilterableJSON, nullable=True) # List of strings: ["Peaceful", "City Center"]
+    house_rules = Column(FilterableJSON, nullable=True) # List of strings: ["No smoking", "Pets allowed"]
     nearby_places = Column(JSON, nullable=True) # List of Dict: [{"name": "Park", "distance": "5m"}]
     images = Column(JSON, nullable=True) # List of image URLs
     documents = Column(JSON, nullable=True) # List of {"name": "doc", "url": "..."}
+    # Bumped by the ORM on every UPDATE; drives ETags (see app/utils/etag.py)
+    version = Column(Integer, nullable=False, server_default="1")
+
+    __mapper_args__ = {"version_id_col": version}
 
     owner = relationship("User", back_populates="properties")
     units = relationship("Unit", back_populates="property")
 
+    __table_args__ = (
+        Index("ix_properties_lat_band_location_lng", "lat_band", "location_lng"),
+        gin_index("ix_properties_amenities", "amenities"),
+        gin_index("ix_properties_highlights", "highlights"),
+        gin_index("ix_properties_house_rules", "house_rules"),
+    )
+
 class Unit(Base):
     __tablename__ = "units"
 
     id = Column(Integer, primary_key=True, index=True)
-    property_id = Column(Integer, ForeignKey("properties.id"), nullable=False)
+    property_id = Column(Integer, ForeignKey("properties.id"), nullable=False, index=True)
     unit_number = Column(String, nullable=False)
-    specifications = Column(JSON, nullable=True)  # e.g., {"bhk": 2, "sqft": 1000}
+    specifications = Column(FilterableJSON, nullable=True)  # e.g., {"bhk": 2, "sqft": 1000}
     images = Column(JSON, nullable=True) # List of image URLs
     status = Column(String, default="VACANT") # VACANT, OCCUPIED, UNDER_MAINTENANCE
     size_sqft = Column(Float, nullable=True)
@@ -45,3 +72,12 @@ class Unit(Base):
     maintenance_requests = relationship("MaintenanceRequest", back_populates="unit")
     payments = relationship("Payment", back_populates="unit")
     documents = Column(JSON, nullable=True) # List of {"name": "doc", "url": "..."}
+    version = Column(Integer, nullable=False, server_default="1")
+
+    __mapper_args__ = {"version_id_col": version}
+
+    __table_args__ = (
+        # Occupancy counts per property
+        Index("ix_units_property_id_status", "property_id", "status"),
+        gin_index("ix_units_specifications", "specifications"),
+    )
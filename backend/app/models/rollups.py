@@ -0,0 +1,62 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, Float, Date, Index
+from app.database import Base
+
+# Denormalized dashboard counters, maintained in the same transaction as the writes
+# in the properties/tenancy/finance routers (see app/utils/rollups.py).
+# `python rebuild_rollups.py` recomputes and verifies them from the raw tables.
+
+class PropertyRollup(Base):
+    __tablename__ = "property_rollups"
+
+    property_id = Column(Integer, ForeignKey("properties.id"), primary_key=True)
+    owner_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    units_total = Column(Integer, nullable=False, default=0)
+    units_occupied = Column(Integer, nullable=False, default=0)
+    units_vacant = Column(Integer, nullable=False, default=0)
+    units_under_maintenance = Column(Integer, nullable=False, default=0)
+    active_tenancies = Column(Integer, nullable=False, default=0)
+    projected_rent = Column(Float, nullable=False, default=0.0) # Sum of rent on ACTIVE tenancies
+
+class OwnerRollup(Base):
+    __tablename__ = "owner_rollups"
+
+    owner_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    properties_count = Column(Integer, nullable=False, default=0)
+    units_total = Column(Integer, nullable=False, default=0)
+    units_occupied = Column(Integer, nullable=False, default=0)
+    units_vacant = Column(Integer, nullable=False, default=0)
+    units_under_maintenance = Column(Integer, nullable=False, default=0)
+    active_tenancies = Column(Integer, nullable=False, default=0)
+    projected_rent = Column(Float, nullable=False, default=0.0)
+
+class RevenueRollup(Base):
+    """Monthly payment buckets per property; owner totals are a sum over the owner's rows."""
+    __tablename__ = "revenue_rollups"
+
+    property_id = Column(Integer, ForeignKey("properties.id"), primary_key=True)
+    month = Column(Date, primary_key=True) # First day of the month
+    owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    rent_total = Column(Float, nullable=False, default=0.0)
+    other_total = Column(Float, nullable=False, default=0.0) # Every non-RENT payment type
+    payment_count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index("ix_revenue_rollups_owner_id_month", "owner_id", "month"),
+    )
+
+class PaymentMonthlyRollup(Base):
+    """Per unit, payment type and month; backs the configurable revenue time series."""
+    __tablename__ = "payment_monthly_rollups"
+
+    unit_id = Column(Integer, ForeignKey("units.id"), primary_key=True)
+    payment_type = Column(String, primary_key=True)
+    month = Column(Date, primary_key=True) # First day of the month
+    property_id = Column(Integer, ForeignKey("properties.id"), nullable=False)
+    owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    total = Column(Float, nullable=False, default=0.0)
+    count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index("ix_payment_monthly_rollups_property_id_month", "property_id", "month"),
+        Index("ix_payment_monthly_rollups_owner_id_month", "owner_id", "month"),
+    )
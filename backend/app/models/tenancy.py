@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, Date, Boolean, String, Float, CheckConstraint
+from sqlalchemy import Column, Integer, ForeignKey, Date, Boolean, String, Float, CheckConstraint, Index, text
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -6,7 +6,7 @@ class Tenancy(Base):
     __tablename__ = "tenancies"
 
     id = Column(Integer, primary_key=True, index=True)
-    unit_id = Column(Integer, ForeignKey("units.id"), nullable=False)
+    unit_id = Column(Integer, ForeignKey("units.id"), nullable=False, index=True)
     tenant_id = Column(Integer, ForeignKey("users.id"), nullable=True) # Nullable for offline tenants
     
     # Payment Structure: "LEASE" (lump sum) or "RENT" (periodic)
@@ -26,11 +26,14 @@ class Tenancy(Base):
     start_date = Column(Date, nullable=False)
     end_date = Column(Date, nullable=True)
     is_active = Column(Boolean, default=True)
-    status = Column(String, default="ACTIVE") # ACTIVE, NOTICE, HISTORIC
+    status = Column(String, default="ACTIVE", index=True) # ACTIVE, NOTICE, HISTORIC
     vacation_notice_date = Column(Date, nullable=True)
 
     advance_amount = Column(Float, nullable=True)
     agreement_url = Column(String, nullable=True)
+    version = Column(Integer, nullable=False, server_default="1")
+
+    __mapper_args__ = {"version_id_col": version}
     
     # Check constraint for mutual exclusivity
     __table_args__ = (
@@ -39,6 +42,10 @@ class Tenancy(Base):
             "(payment_structure = 'RENT' AND rent_amount IS NOT NULL AND lease_amount IS NULL)",
             name="check_payment_structure_amounts"
         ),
+        # Active tenancy per unit (occupancy, projected rent, expiring leases)
+        Index("ix_tenancies_active_unit_id", "unit_id", postgresql_where=text("status = 'ACTIVE'")),
+        # Tenant's current lease lookup (/tenancy/me); also serves tenant_id joins
+        Index("ix_tenancies_tenant_id_status_start_date", "tenant_id", "status", "start_date"),
     )
     
     unit = relationship("Unit", back_populates="tenancies")
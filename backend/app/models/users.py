@@ -17,6 +17,10 @@ class User(Base):
     role = Column(String, nullable=False)  # Stored as string, validated as Enum in logic
     name = Column(String, nullable=True)
     documents = Column(JSON, nullable=True) # e.g. [{"type": "ID", "url": "..."}]
+    # Bumped by the ORM on every UPDATE; drives the ETag of /auth/me
+    version = Column(Integer, nullable=False, server_default="1")
+
+    __mapper_args__ = {"version_id_col": version}
     
     # Relationships
     properties = relationship("Property", back_populates="owner")
@@ -1,18 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
-from app.database import get_db
-from app.database import get_db
-from app.dependencies import get_current_user, require_role
+from app.database import get_db, get_read_db, ENGINE_CONFIG, READ_DATABASE_URL, pool_stats, route_query_metrics, slow_query_log
+from app.dependencies import get_current_user, require_role, token_cache, verification_pool, local_verifier, identity_cache, response_cache
+from app.utils.identity_cache import UserSnapshot
+from app.config import settings
+from app.utils.pagination import PageParams, paginate, paged
+from app.schemas import UserResponse, AdminStats
 from app.models import User, Property, Tenancy, Payment, MaintenanceRequest
+from typing import Any, Dict, Optional
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
 
-@router.get("/stats")
-@router.get("/stats")
+@router.get("/stats", response_model=AdminStats)
 async def get_admin_stats(
-    user: User = Depends(require_role("ADMIN")),
-    db: AsyncSession = Depends(get_db)
+    user: UserSnapshot = Depends(require_role("ADMIN")),
+    db: AsyncSession = Depends(get_read_db)
 ):
         
     # Aggregate counts
@@ -26,11 +29,54 @@ async def get_admin_stats(
         "active_tenancies": tenancy_count.scalar()
     }
 
-@router.get("/users")
-@router.get("/users")
+@router.get("/users", response_model=paged(UserResponse))
 async def get_all_users(
-    user: User = Depends(require_role("ADMIN")),
-    db: AsyncSession = Depends(get_db)
+    response: Response,
+    page: PageParams = Depends(),
+    user: UserSnapshot = Depends(require_role("ADMIN")),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    result = await db.execute(select(User))
-    return result.scalars().all()
+    return await paginate(db, select(User), [(User.id, False)], page, response)
+
+@router.get("/metrics", response_model=Dict[str, Any])
+async def get_metrics(
+    user: UserSnapshot = Depends(require_role("ADMIN"))
+):
+    return {
+        "token_cache": token_cache.stats(),
+        "token_verification": verification_pool.stats(),
+        "local_verifier": local_verifier.stats() if local_verifier else None,
+        "identity_cache": identity_cache.stats(),
+        "response_cache": response_cache.stats(),
+        "db_pool": pool_stats(),
+        "db_queries": route_query_metrics.stats(),
+        "slow_queries": slow_query_log.stats()
+    }
+
+@router.get("/db-pool", response_model=Dict[str, Any])
+async def get_db_pool_stats(
+    user: UserSnapshot = Depends(require_role("ADMIN"))
+):
+    return {
+        "profile": settings.DB_PROFILE,
+        "config": ENGINE_CONFIG,
+        "read_replica": bool(READ_DATABASE_URL),
+        "stats": pool_stats()
+    }
+
+@router.get("/slow-queries", response_model=Dict[str, Any])
+async def get_slow_queries(
+    limit: int = 50,
+    with_plans: Optional[bool] = None,
+    user: UserSnapshot = Depends(require_role("ADMIN"))
+):
+    return {
+        **slow_query_log.stats(),
+        "queries": slow_query_log.list(limit=limit, with_plans=with_plans)
+    }
+
+@router.delete("/slow-queries", status_code=204)
+async def clear_slow_queries(
+    user: UserSnapshot = Depends(require_role("ADMIN"))
+):
+    slow_query_log.clear()
@@ -1,7 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
-from app.dependencies import get_current_user_uid, get_current_user
+from app.dependencies import get_current_user_uid, get_current_user, identity_cache
+from app.utils.identity_cache import UserSnapshot
+from app.schemas import UserResponse
+from app.utils.etag import compute_etag, matches, not_modified, set_etag
 from app.models import User, UserRole
 from pydantic import BaseModel, EmailStr
 from sqlalchemy import select
@@ -13,7 +16,7 @@ class UserRegister(BaseModel):
     role: UserRole
     name: str | None = None
 
-@router.post("/register", status_code=status.HTTP_201_CREATED)
+@router.post("/register", status_code=status.HTTP_201_CREATED, response_model=UserResponse)
 async def register_user(
     user_data: UserRegister,
     uid: str = Depends(get_current_user_uid),
@@ -38,31 +41,56 @@ async def register_user(
     db.add(new_user)
     await db.commit()
     await db.refresh(new_user)
+    identity_cache.put(uid, UserSnapshot.model_validate(new_user))
     return new_user
 
-@router.get("/me")
+@router.get("/me", response_model=UserResponse)
 async def get_me(
+    request: Request,
+    response: Response,
     uid: str = Depends(get_current_user_uid),
     db: AsyncSession = Depends(get_db)
 ):
-    # Logic similar to get_current_user dependency but returning the model
-    # Doing it explicit here to show the flow
+    # Freshness is decided from the row's current version, never from the identity
+    # cache, whose snapshot may lag a change made on another worker. The probe reads
+    # two columns; the full row is only loaded when the client's copy is stale.
+    current = (await db.execute(select(User.id, User.version).where(User.firebase_uid == uid))).first()
+    if not current:
+        raise HTTPException(status_code=404, detail="User not found in database. Please register.")
+    etag = compute_etag("user", current.id, current.version)
+    if matches(request, etag):
+        snapshot = identity_cache.get(uid)
+        if snapshot and snapshot.version != current.version:
+            identity_cache.invalidate(uid)
+        return not_modified(etag)
+
+    # Logic similar to get_current_user dependency but returning the full model,
+    # and used to warm the identity cache for the requests that follow.
     result = await db.execute(select(User).where(User.firebase_uid == uid))
     user = result.scalars().first()
     if not user:
          raise HTTPException(status_code=404, detail="User not found in database. Please register.")
+    identity_cache.put(uid, UserSnapshot.model_validate(user))
+    etag = compute_etag("user", user.id, user.version)
+    set_etag(response, etag)
     return user
 
 class UserUpdate(BaseModel):
     name: str | None = None
     documents: list[dict] | None = None # e.g. [{"type": "ID", "url": "..."}]
 
-@router.patch("/me")
+@router.patch("/me", response_model=UserResponse)
 async def update_me(
     user_data: UserUpdate,
-    user: User = Depends(get_current_user), # Use the dependency that returns the User object
+    current_user: UserSnapshot = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
+    # get_current_user returns a cached snapshot; load the row to modify it
+    user = await db.get(User, current_user.id)
+    if not user:
+        # Deleted while the cached snapshot was still live
+        identity_cache.invalidate(current_user.firebase_uid)
+        raise HTTPException(status_code=404, detail="User not found in database. Please register.")
     if user_data.name:
         user.name = user_data.name
     if user_data.documents is not None:
@@ -70,5 +98,6 @@ async def update_me(
     
     await db.commit()
     await db.refresh(user)
+    identity_cache.put(user.firebase_uid, UserSnapshot.model_validate(user))
     return user
 
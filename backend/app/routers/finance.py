@@ -1,11 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from app.database import get_db
-from app.dependencies import get_current_user
-from app.models import Payment, PaymentType, User, Tenancy, Unit, Property
+from sqlalchemy import select, func
+from app.config import settings
+from app.database import get_db, get_read_db
+from app.dependencies import get_current_user, response_cache
+from app.utils.identity_cache import UserSnapshot
+from app.models import Payment, PaymentType, Tenancy, Unit, Property
+from app.utils import rollups
+from app.utils.response_cache import analytics_tags
+from app.utils.pagination import PageParams, paginate, paged
+from app.schemas import PaymentResponse
 from pydantic import BaseModel
 from datetime import date
+from typing import Literal, Optional
+import csv
+import io
+import json
 
 router = APIRouter(prefix="/finance", tags=["Finance"])
 
@@ -15,10 +26,10 @@ class PaymentCreate(BaseModel):
     payment_type: PaymentType
     payment_date: date
 
-@router.post("/payments", status_code=status.HTTP_201_CREATED)
+@router.post("/payments", status_code=status.HTTP_201_CREATED, response_model=PaymentResponse)
 async def record_payment(
     data: PaymentCreate,
-    user: User = Depends(get_current_user),
+    user: UserSnapshot = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     if user.role != "OWNER" and user.role != "ADMIN":
@@ -40,24 +51,115 @@ async def record_payment(
         status="PAID"
     )
     db.add(new_payment)
+    property_id, owner_id = await rollups.unit_location(db, tenancy.unit_id)
+    await rollups.on_payment_recorded(
+        db, property_id, owner_id, tenancy.unit_id, data.amount, new_payment.payment_type, data.payment_date
+    )
     await db.commit()
+    await response_cache.invalidate(*analytics_tags(property_id, owner_id))
     await db.refresh(new_payment)
     return new_payment
 
-@router.get("/payments")
+@router.get("/payments", response_model=paged(PaymentResponse))
 async def get_payments(
-    user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    response: Response,
+    page: PageParams = Depends(),
+    user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
 ):
     if user.role == "ADMIN":
-        result = await db.execute(select(Payment))
+        stmt = select(Payment)
     elif user.role == "OWNER":
         # Get payments linked to tenancies of units owned by this owner
         stmt = select(Payment).join(Tenancy).join(Unit).join(Property).where(Property.owner_id == user.id)
-        result = await db.execute(stmt)
     else:
         # Tenant view
-        result = await db.execute(
-            select(Payment).join(Tenancy).where(Tenancy.tenant_id == user.id)
+        stmt = select(Payment).join(Tenancy).where(Tenancy.tenant_id == user.id)
+    # Most recent first
+    order = [(Payment.payment_date, True), (Payment.id, True)]
+    return await paginate(db, stmt, order, page, response)
+
+# Column order of the export; unit_id/property_id are resolved through the tenancy when set
+EXPORT_COLUMNS = ["id", "payment_date", "payment_type", "amount", "status", "tenancy_id", "unit_id", "property_id"]
+
+def payments_export_query(
+    user: UserSnapshot,
+    start_date: Optional[date],
+    end_date: Optional[date],
+    property_id: Optional[int],
+    unit_id: Optional[int],
+    payment_type: Optional[PaymentType],
+):
+    """Plain column rows (no ORM identity map) for the ledger export, oldest first."""
+    payment_unit = func.coalesce(Tenancy.unit_id, Payment.unit_id)
+    stmt = (
+        select(
+            Payment.id, Payment.payment_date, Payment.payment_type, Payment.amount, Payment.status,
+            Payment.tenancy_id, payment_unit.label("unit_id"), Unit.property_id,
         )
-    return result.scalars().all()
+        .outerjoin(Tenancy, Payment.tenancy_id == Tenancy.id)
+        .join(Unit, Unit.id == payment_unit)
+    )
+    if user.role == "OWNER":
+        stmt = stmt.join(Property, Unit.property_id == Property.id).where(Property.owner_id == user.id)
+    elif user.role != "ADMIN":
+        stmt = stmt.where(Tenancy.tenant_id == user.id)
+
+    if start_date:
+        stmt = stmt.where(Payment.payment_date >= start_date)
+    if end_date:
+        stmt = stmt.where(Payment.payment_date <= end_date)
+    if property_id is not None:
+        stmt = stmt.where(Unit.property_id == property_id)
+    if unit_id is not None:
+        stmt = stmt.where(payment_unit == unit_id)
+    if payment_type is not None:
+        stmt = stmt.where(Payment.payment_type == payment_type.value)
+    return stmt.order_by(Payment.payment_date, Payment.id)
+
+@router.get("/payments/export")
+async def export_payments(
+    format: Literal["csv", "ndjson"] = "csv",
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    property_id: Optional[int] = None,
+    unit_id: Optional[int] = None,
+    payment_type: Optional[PaymentType] = Query(None),
+    user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    The whole ledger visible to the caller, filtered, as CSV or NDJSON. Rows are
+    read through a server-side cursor and written as they arrive, so memory use
+    does not grow with the size of the ledger.
+    """
+    if start_date and end_date and start_date > end_date:
+        raise HTTPException(status_code=400, detail="start_date must not be after end_date")
+    stmt = payments_export_query(user, start_date, end_date, property_id, unit_id, payment_type)
+    filename = f"payments-{date.today().isoformat()}.{format}"
+    return StreamingResponse(
+        stream_payments(db.bind, stmt, format),
+        media_type="text/csv" if format == "csv" else "application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+async def stream_payments(bind, stmt, format: str):
+    # The request's session is closed before the body is streamed, so use our own
+    async with AsyncSession(bind) as db:
+        result = await db.stream(stmt.execution_options(yield_per=settings.EXPORT_BATCH_SIZE))
+        if format == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(EXPORT_COLUMNS)
+            yield buffer.getvalue()
+        # One chunk per fetched batch keeps the number of writes down without buffering more
+        async for batch in result.partitions():
+            if format == "csv":
+                buffer.seek(0)
+                buffer.truncate()
+                writer.writerows(batch)
+                yield buffer.getvalue()
+            else:
+                yield "".join(
+                    json.dumps(dict(zip(EXPORT_COLUMNS, row)), default=str) + "\n" for row in batch
+                )
@@ -1,13 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, func
 from sqlalchemy.orm import selectinload
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.dependencies import get_current_user
-from app.models import MaintenanceRequest, MaintenanceComment, Tenancy, User, Unit, Property
+from app.utils.identity_cache import UserSnapshot
+from app.models import MaintenanceRequest, MaintenanceComment, RequestStatus, Tenancy, Unit, Property
+from app.utils.pagination import PageParams, paginate
+from app.schemas import MaintenanceRequestResponse, MaintenanceRequestWithUnit, MaintenanceCommentResponse, MaintenancePage
 from pydantic import BaseModel
-from datetime import datetime
-from typing import List, Optional
+from datetime import date, datetime, timedelta
+from typing import List, Literal, Optional, Union
 
 router = APIRouter(prefix="/maintenance", tags=["Maintenance"])
 
@@ -29,10 +32,10 @@ class CommentResponse(BaseModel):
     class Config:
         from_attributes = True
 
-@router.post("/", status_code=status.HTTP_201_CREATED)
+@router.post("/", status_code=status.HTTP_201_CREATED, response_model=MaintenanceRequestResponse)
 async def create_request(
     data: RequestCreate,
-    user: User = Depends(get_current_user),
+    user: UserSnapshot = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     # Verify unit exists
@@ -68,32 +71,85 @@ async def create_request(
     await db.refresh(new_req)
     return new_req
 
-@router.get("/")
-async def get_requests(
-    user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
-):
+# ?sort= options -> keyset order; each ends in the unique id
+SORTS = {
+    "-created_at": [(MaintenanceRequest.created_at, True), (MaintenanceRequest.id, True)],
+    "created_at": [(MaintenanceRequest.created_at, False), (MaintenanceRequest.id, False)],
+    "status": [(MaintenanceRequest.status, False), (MaintenanceRequest.created_at, True), (MaintenanceRequest.id, True)],
+}
+
+def maintenance_filters(
+    user: UserSnapshot,
+    property_id: Optional[int] = None,
+    unit_id: Optional[int] = None,
+    reported_by_id: Optional[int] = None,
+    created_from: Optional[date] = None,
+    created_to: Optional[date] = None,
+) -> list:
+    """
+    WHERE clauses on maintenance_requests alone (units are reached through IN
+    subqueries), so the same list serves the page and the per-status counts.
+    """
     if user.role == "ADMIN":
-        stmt = select(MaintenanceRequest).options(selectinload(MaintenanceRequest.unit))
+        conditions = []
     elif user.role == "OWNER":
         # Filter by owner's units
-        stmt = (
-            select(MaintenanceRequest)
-            .join(MaintenanceRequest.unit)
-            .join(Unit.property)
-            .where(Property.owner_id == user.id)
-            .options(selectinload(MaintenanceRequest.unit))
-        )
+        owner_units = select(Unit.id).join(Unit.property).where(Property.owner_id == user.id)
+        conditions = [MaintenanceRequest.unit_id.in_(owner_units)]
     else:
-        stmt = select(MaintenanceRequest).where(MaintenanceRequest.tenant_id == user.id).options(selectinload(MaintenanceRequest.unit))
-    
-    result = await db.execute(stmt.order_by(MaintenanceRequest.created_at.desc()))
-    return result.scalars().all()
+        conditions = [MaintenanceRequest.tenant_id == user.id]
+
+    if property_id is not None:
+        conditions.append(MaintenanceRequest.unit_id.in_(select(Unit.id).where(Unit.property_id == property_id)))
+    if unit_id is not None:
+        conditions.append(MaintenanceRequest.unit_id == unit_id)
+    if reported_by_id is not None:
+        conditions.append(MaintenanceRequest.reported_by_id == reported_by_id)
+    if created_from:
+        conditions.append(MaintenanceRequest.created_at >= created_from)
+    if created_to:
+        # Inclusive of the whole end day
+        conditions.append(MaintenanceRequest.created_at < created_to + timedelta(days=1))
+    return conditions
+
+@router.get("/", response_model=Union[MaintenancePage, List[MaintenanceRequestWithUnit]])
+async def get_requests(
+    response: Response,
+    page: PageParams = Depends(),
+    status: Optional[RequestStatus] = None,
+    property_id: Optional[int] = None,
+    unit_id: Optional[int] = None,
+    reported_by_id: Optional[int] = None,
+    created_from: Optional[date] = None,
+    created_to: Optional[date] = None,
+    sort: Literal["-created_at", "created_at", "status"] = "-created_at",
+    user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Maintenance requests visible to the caller, filtered and sorted in SQL. Paged
+    responses carry per-status counts over every filter except `status`, computed
+    in the same statement as the page.
+    """
+    if created_from and created_to and created_from > created_to:
+        raise HTTPException(status_code=400, detail="created_from must not be after created_to")
+    conditions = maintenance_filters(user, property_id, unit_id, reported_by_id, created_from, created_to)
+
+    stmt = select(MaintenanceRequest).where(*conditions).options(selectinload(MaintenanceRequest.unit))
+    if status is not None:
+        stmt = stmt.where(MaintenanceRequest.status == status.value)
+
+    counts = {
+        s.value.lower(): select(func.count()).select_from(MaintenanceRequest).where(*conditions, MaintenanceRequest.status == s.value)
+        for s in RequestStatus
+    }
+    counts["total"] = select(func.count()).select_from(MaintenanceRequest).where(*conditions)
+    return await paginate(db, stmt, SORTS[sort], page, response, summary=counts)
 
-@router.get("/{request_id}/comments")
+@router.get("/{request_id}/comments", response_model=List[CommentResponse])
 async def get_comments(
     request_id: int,
-    user: User = Depends(get_current_user),
+    user: UserSnapshot = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     # Verify access
@@ -124,11 +180,11 @@ async def get_comments(
         for c in comments
     ]
 
-@router.post("/{request_id}/comments")
+@router.post("/{request_id}/comments", response_model=MaintenanceCommentResponse)
 async def add_comment(
     request_id: int,
     data: CommentCreate,
-    user: User = Depends(get_current_user),
+    user: UserSnapshot = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     req_res = await db.execute(select(MaintenanceRequest).where(MaintenanceRequest.id == request_id))
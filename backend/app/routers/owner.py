@@ -1,91 +1,147 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, and_
-from app.database import get_db
-from app.dependencies import require_role
-from app.models import User, Property, Tenancy, Payment, Unit
+from app.database import get_read_db
+from app.dependencies import require_role, response_cache
+from app.utils.identity_cache import UserSnapshot
+from app.utils.response_cache import analytics_tags
+from app.models import Property, Tenancy, Payment, Unit, OwnerRollup
+from app.routers.properties import compute_analytics_batch
+from app.schemas_analytics import PortfolioAnalytics, PortfolioItem
+from app.schemas import OwnerStats
 from datetime import date, timedelta
+from typing import List, Optional
 
 router = APIRouter(prefix="/owner", tags=["Owner"])
 
-@router.get("/stats")
-async def get_owner_stats(
-    user: User = Depends(require_role("OWNER")),
-    db: AsyncSession = Depends(get_db)
-):
-    # 1. Total Properties
-    prop_count_res = await db.execute(
-        select(func.count(Property.id)).where(Property.owner_id == user.id)
-    )
-    total_properties = prop_count_res.scalar() or 0
+def owner_stats_query(owner_id: int, today: date = None):
+    """
+    Dashboard counters in one statement. Unit, property and tenancy counts come from
+    the owner's row in owner_rollups (maintained on every write, see app/utils/rollups.py);
+    only the rolling 30-day revenue still reads payments, through the date index.
+    """
+    thirty_days_ago = (today or date.today()) - timedelta(days=30)
 
-    # 2. Active Tenants (Tenancies in ACTIVE status linked to user's units)
-    # Join Tenancy -> Unit -> Property
-    active_tenants_res = await db.execute(
-        select(func.count(Tenancy.id))
-        .join(Unit, Tenancy.unit_id == Unit.id)
+    owner_units = (
+        select(Unit.id)
         .join(Property, Unit.property_id == Property.id)
-        .where(
-            and_(
-                Property.owner_id == user.id,
-                Tenancy.status == "ACTIVE"
-            )
-        )
+        .where(Property.owner_id == owner_id)
     )
-    active_tenants = active_tenants_res.scalar() or 0
-
-    # 3. Monthly Revenue (Last 30 days)
-    # Join Payment -> Tenancy -> Unit -> Property 
-    # OR Payment -> Unit -> Property (if payment linked to unit directly)
-    # Safest based on current schema usage (Payment -> Tenancy)
-    
-    thirty_days_ago = date.today() - timedelta(days=30)
-    
-    # We need to sum payments where the unit belongs to the owner
-    revenue_res = await db.execute(
+    # Payments are linked to the owner's units via their tenancy
+    monthly_revenue = (
         select(func.sum(Payment.amount))
         .join(Tenancy, Payment.tenancy_id == Tenancy.id)
-        .join(Unit, Tenancy.unit_id == Unit.id)
-        .join(Property, Unit.property_id == Property.id)
         .where(
             and_(
-                Property.owner_id == user.id,
+                Tenancy.unit_id.in_(owner_units),
                 Payment.payment_type == "RENT",
                 Payment.payment_date >= thirty_days_ago
             )
         )
+        .scalar_subquery()
     )
-    monthly_revenue = revenue_res.scalar() or 0.0
 
-    # Occupancy Rate (Active Tenants / Total Units)
-    # Get total units count first
-    units_count_res = await db.execute(
-        select(func.count(Unit.id))
-        .join(Property, Unit.property_id == Property.id)
-        .where(Property.owner_id == user.id)
+    return (
+        select(
+            OwnerRollup.properties_count.label("total_properties"),
+            OwnerRollup.active_tenancies.label("active_tenants"),
+            monthly_revenue.label("monthly_revenue"),
+            OwnerRollup.units_total.label("total_units"),
+            OwnerRollup.units_occupied.label("occupied_units"),
+        )
+        .where(OwnerRollup.owner_id == owner_id)
+    )
+
+@router.get("/stats", response_model=OwnerStats)
+async def get_owner_stats(
+    user: UserSnapshot = Depends(require_role("OWNER")),
+    db: AsyncSession = Depends(get_read_db)
+):
+    return await response_cache.get_or_compute(
+        ("owner_stats", user.id),
+        analytics_tags(owner_id=user.id),
+        lambda: compute_owner_stats(db, user.id),
     )
-    total_units = units_count_res.scalar() or 0
-    
+
+async def compute_owner_stats(db: AsyncSession, owner_id: int) -> dict:
+    row = (await db.execute(owner_stats_query(owner_id))).first()
+    if row is None:
+        # No rollup row until the owner creates a first property
+        return {"total_properties": 0, "active_tenants": 0, "monthly_revenue": 0.0, "occupancy_rate": 0}
+
+    total_units = row.total_units or 0
     occupancy_rate = 0
     if total_units > 0:
-        # Count occupied units specifically (Unit.status == OCCUPIED)
-        # This might differ from active tenancies count if data drift, but let's trust Unit status for simple occupancy rate
-        occupied_units_res = await db.execute(
-             select(func.count(Unit.id))
-            .join(Property, Unit.property_id == Property.id)
-            .where(
-                and_(
-                    Property.owner_id == user.id,
-                    Unit.status == "OCCUPIED"
-                )
-            )
-        )
-        occupied_units = occupied_units_res.scalar() or 0
-        occupancy_rate = int((occupied_units / total_units) * 100)
+        # Occupancy trusts Unit.status, which may differ from the active tenancy count if data drifts
+        occupancy_rate = int(((row.occupied_units or 0) / total_units) * 100)
 
     return {
-        "total_properties": total_properties,
-        "active_tenants": active_tenants,
-        "monthly_revenue": monthly_revenue,
+        "total_properties": row.total_properties or 0,
+        "active_tenants": row.active_tenants or 0,
+        "monthly_revenue": row.monthly_revenue or 0.0,
         "occupancy_rate": occupancy_rate
     }
+
+def portfolio_page_query(
+    owner_id: int, property_ids: Optional[List[int]], limit: int, offset: int, after_id: Optional[int] = None
+):
+    """One page of the owner's properties, with the matching total on every row."""
+    query = select(Property.id, Property.name, func.count().over().label("total")).where(Property.owner_id == owner_id)
+    if property_ids:
+        query = query.where(Property.id.in_(property_ids))
+    if after_id is not None:
+        query = query.where(Property.id > after_id)
+    return query.order_by(Property.id).limit(limit).offset(offset)
+
+async def portfolio_page(db: AsyncSession, owner_id: int, property_ids, limit: int, offset: int, after_id=None):
+    """(items, total) for one page: three statements however many properties it holds."""
+    page = (await db.execute(portfolio_page_query(owner_id, property_ids, limit, offset, after_id))).all()
+    if not page:
+        return [], 0
+    analytics = await compute_analytics_batch(db, [p.id for p in page])
+    items = [PortfolioItem(property_id=p.id, name=p.name, analytics=analytics[p.id]) for p in page]
+    return items, page[0].total
+
+@router.get("/portfolio-analytics", response_model=PortfolioAnalytics)
+async def get_portfolio_analytics(
+    property_ids: Optional[List[int]] = Query(None),
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    stream: bool = False,
+    user: UserSnapshot = Depends(require_role("OWNER")),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    PropertyAnalytics for the owner's properties (optionally only `property_ids`),
+    a page at a time. With `stream=true` every property from `offset` on is sent as
+    NDJSON, one line per property, computed in chunks of `limit`.
+    """
+    if stream:
+        return StreamingResponse(
+            stream_portfolio(db.bind, user.id, property_ids, limit, offset),
+            media_type="application/x-ndjson"
+        )
+
+    async def compute():
+        items, total = await portfolio_page(db, user.id, property_ids, limit, offset)
+        return PortfolioAnalytics(items=items, total=total, limit=limit, offset=offset)
+
+    return await response_cache.get_or_compute(
+        ("portfolio_analytics", user.id, tuple(sorted(property_ids or [])), limit, offset),
+        analytics_tags(owner_id=user.id),
+        compute,
+    )
+
+async def stream_portfolio(bind, owner_id: int, property_ids, chunk_size: int, offset: int):
+    # The request's session is closed before the body is streamed, so use our own
+    # After the first chunk, continue from the last id instead of re-skipping rows
+    after_id = None
+    async with AsyncSession(bind) as db:
+        while True:
+            items, _ = await portfolio_page(db, owner_id, property_ids, chunk_size, offset, after_id)
+            for item in items:
+                yield item.model_dump_json() + "\n"
+            if len(items) < chunk_size:
+                break
+            offset, after_id = 0, items[-1].property_id
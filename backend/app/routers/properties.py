@@ -1,16 +1,43 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from app.database import get_db
-from app.database import get_db
-from app.dependencies import get_current_user, require_role
-from app.models import Property, Unit, User
+from sqlalchemy import select, func, union_all, and_, or_, true, cast, column, literal, literal_column, Float
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import aliased, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+from app.database import get_db, get_read_db
+from app.dependencies import get_current_user, require_role, response_cache
+from app.utils.identity_cache import UserSnapshot
+from app.models import Property, Unit, User, PaymentType, PropertyRollup, RevenueRollup, PaymentMonthlyRollup, Tenancy, Payment
+from app.utils import rollups
+from app.utils.response_cache import analytics_tags
+from app.utils.pagination import Page, PageParams, paginate, paged, encode_cursor, decode_cursor
+from app.utils.search import tokenize, prefix_tsquery, has_extension, score_document
+from app.utils.geo import KM_PER_DEGREE, bounding_box, lat_bands, distance_km
+from app.utils.json_filters import json_contains
+from app.config import settings
+from app.utils.fieldsets import FieldSet
+from app.utils.etag import compute_etag, matches, not_modified, set_etag
+from app.schemas import (
+    PropertyResponse, UnitResponse, UnitDetail, UnitSummary, UnitTenancyPage, UnitPaymentPage,
+    PropertyListItem, PropertySearchItem, PropertyNearbyItem, PropertyDetail, UnitListItem,
+)
+from app.schemas_analytics import PropertyAnalytics, OccupancyStats, FinancialStats, MonthlyRevenue, AlertItem, RevenueSeries, RevenuePoint
 from pydantic import BaseModel
-from typing import List, Optional
-from datetime import date
+from typing import List, Optional, Literal
+from datetime import date, timedelta
 
 router = APIRouter(prefix="/properties", tags=["Properties"])
 
+# ?fields= for property and unit reads. List views default to the scalar columns;
+# the JSON blobs (images, documents, amenities, ...) are loaded only when asked for.
+PROPERTY_FIELDS = FieldSet(
+    Property,
+    PropertyDetail,
+    default=["owner_id", "name", "address", "description", "property_type", "units_count", "location_lat", "location_lng"],
+    relations=["units"],
+)
+UNIT_FIELDS = FieldSet(Unit, UnitListItem, default=[c.key for c in Unit.__table__.columns])
+
 class PropertyCreate(BaseModel):
     name: str
     address: str
@@ -34,10 +61,10 @@ class UnitCreate(BaseModel):
     construction_date: Optional[date] = None
     status: str = "VACANT"
 
-@router.post("/", status_code=status.HTTP_201_CREATED)
+@router.post("/", status_code=status.HTTP_201_CREATED, response_model=PropertyResponse)
 async def create_property(
     prop_data: PropertyCreate,
-    user: User = Depends(require_role("OWNER")),
+    user: UserSnapshot = Depends(require_role("OWNER")),
     db: AsyncSession = Depends(get_db)
 ):
     
@@ -58,36 +85,288 @@ async def create_property(
         documents=prop_data.documents
     )
     db.add(new_prop)
+    await db.flush()
+    await rollups.on_property_created(db, new_prop.id, user.id)
     await db.commit()
+    await response_cache.invalidate(*analytics_tags(owner_id=user.id))
     await db.refresh(new_prop)
     return new_prop
 
-@router.get("/")
+def property_filters(dialect: str, amenity: List[str], highlight: List[str], house_rule: List[str]) -> list:
+    """Containment filters on the JSONB list columns; each repeated value must be present."""
+    clauses = []
+    for column, values in ((Property.amenities, amenity), (Property.highlights, highlight), (Property.house_rules, house_rule)):
+        if values:
+            clauses.append(json_contains(column, values, dialect))
+    return clauses
+
+@router.get("/", response_model=paged(PropertyListItem), response_model_exclude_unset=True)
 async def get_my_properties(
-    user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    response: Response,
+    page: PageParams = Depends(),
+    fields: Optional[str] = Query(None, description="Comma-separated columns, or * for all"),
+    amenity: List[str] = Query([], description="Exact amenity, e.g. Gym; repeat to require several"),
+    highlight: List[str] = Query([]),
+    house_rule: List[str] = Query([]),
+    user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
 ):
+    names = [n for n in PROPERTY_FIELDS.parse(fields) if n != "units"]
+    stmt = select(Property).options(PROPERTY_FIELDS.load_only(names))
     # If admin, maybe return all?
-    if user.role == "ADMIN":
-        result = await db.execute(select(Property))
+    if user.role != "ADMIN":
+        stmt = stmt.where(Property.owner_id == user.id)
+    stmt = stmt.where(*property_filters(db.bind.dialect.name, amenity, highlight, house_rule))
+    return await paginate(
+        db, stmt, [(Property.id, False)], page, response,
+        serialize=lambda prop: PROPERTY_FIELDS.project(prop, names, PropertyListItem)
+    )
+
+@router.get("/units", response_model=Page[UnitListItem], response_model_exclude_unset=True)
+async def find_units(
+    response: Response,
+    page: PageParams = Depends(),
+    fields: Optional[str] = Query(None, description="Comma-separated columns, or * for all"),
+    property_id: Optional[int] = None,
+    status: Optional[Literal["VACANT", "OCCUPIED", "UNDER_MAINTENANCE"]] = None,
+    bhk: Optional[int] = Query(None, ge=0, description="specifications.bhk"),
+    amenity: List[str] = Query([], description="The unit's property has this amenity; repeatable"),
+    user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Units across the caller's properties (every property for admins), e.g. a
+    vacancy finder: ?status=VACANT&bhk=2&amenity=Gym. The bhk and amenity
+    filters are containment tests on the GIN-indexed JSONB columns.
+    """
+    dialect = db.bind.dialect.name
+    names = UNIT_FIELDS.parse(fields)
+    stmt = select(Unit).options(UNIT_FIELDS.load_only(names))
+    properties = [Property.owner_id == user.id] if user.role != "ADMIN" else []
+    properties += property_filters(dialect, amenity, [], [])
+    if property_id is not None:
+        stmt = stmt.where(Unit.property_id == property_id)
+    if properties:
+        stmt = stmt.where(Unit.property_id.in_(select(Property.id).where(*properties)))
+    if status:
+        stmt = stmt.where(Unit.status == status)
+    if bhk is not None:
+        stmt = stmt.where(json_contains(Unit.specifications, {"bhk": bhk}, dialect))
+    return await paginate(
+        db, stmt, [(Unit.id, False)], page, response,
+        serialize=lambda unit: UNIT_FIELDS.project(unit, names), compat=False
+    )
+
+# Postgres-only generated column (see migration b3d8f1a6c925); not mapped on the
+# model so other databases can still create the schema from metadata
+SEARCH_VECTOR = literal_column("properties.search_vector", type_=TSVECTOR)
+# Weight per field for the in-memory fallback, mirroring the tsvector's A-D weights
+SEARCH_WEIGHTS = {"name": 1.0, "address": 0.4, "amenities": 0.2, "highlights": 0.2, "description": 0.1}
+
+def property_search_query(q: str, tokens: List[str], trigram: bool):
+    """
+    (Property, rank) rows matching `q`: full-text over the weighted search_vector,
+    the last word as a prefix, plus trigram word similarity on name and address
+    for typos when pg_trgm is installed. Both sides are GIN-indexed.
+    """
+    tsquery = func.to_tsquery("simple", prefix_tsquery(tokens))
+    match = SEARCH_VECTOR.op("@@")(tsquery)
+    rank = func.ts_rank(SEARCH_VECTOR, tsquery)
+    if trigram:
+        # `q <% column`: q is similar to some word sequence in the column
+        match = or_(match, literal(q).op("<%")(Property.name), literal(q).op("<%")(Property.address))
+        rank = rank + func.greatest(func.word_similarity(q, Property.name), func.word_similarity(q, Property.address))
+    rank = cast(rank, Float).label("rank")
+    return select(Property, rank).where(match)
+
+@router.get("/search", response_model=Page[PropertySearchItem], response_model_exclude_unset=True)
+async def search_properties(
+    q: str = Query(..., min_length=1, max_length=200),
+    page: PageParams = Depends(),
+    fields: Optional[str] = Query(None, description="Comma-separated columns, or * for all"),
+    user: UserSnapshot = Depends(require_role("OWNER")),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Ranked search over name, address, description, amenities and highlights of
+    the caller's properties (every property for admins). Items are the ?fields=
+    projection plus `rank`; `next_cursor` continues after the last (rank, id).
+    """
+    tokens = tokenize(q)
+    if not tokens:
+        raise HTTPException(status_code=400, detail="Query has no searchable words")
+    names = [n for n in PROPERTY_FIELDS.parse(fields) if n != "units"]
+    limit = page.limit or settings.PAGE_SIZE_DEFAULT
+    after = decode_cursor(page.cursor, [column("rank", Float), Property.id]) if page.cursor else None
+
+    if db.bind.dialect.name != "postgresql":
+        return await search_properties_in_memory(db, user, tokens, names, limit, after)
+    return await search_properties_postgres(db, user, q, tokens, names, limit, after)
+
+async def search_properties_postgres(db: AsyncSession, user, q: str, tokens, names, limit: int, after):
+    stmt = property_search_query(q, tokens, await has_extension(db, "pg_trgm"))
+    stmt = stmt.options(PROPERTY_FIELDS.load_only(names))
+    if user.role != "ADMIN":
+        stmt = stmt.where(Property.owner_id == user.id)
+    ranked = stmt.subquery()
+    # Rank is computed once per match in the subquery, then paged by (rank desc, id)
+    entity = aliased(Property, ranked)
+    page_stmt = select(entity, ranked.c.rank).order_by(ranked.c.rank.desc(), ranked.c.id)
+    if after:
+        page_stmt = page_stmt.where(or_(ranked.c.rank < after[0], and_(ranked.c.rank == after[0], ranked.c.id > after[1])))
+    rows = (await db.execute(page_stmt.limit(limit + 1))).all()
+    return scored_page([(prop, rank) for prop, rank in rows], names, limit, PropertySearchItem, "rank")
+
+async def search_properties_in_memory(db: AsyncSession, user: UserSnapshot, tokens, names, limit: int, after):
+    """Non-Postgres fallback: score every visible property in Python."""
+    stmt = select(Property).options(PROPERTY_FIELDS.load_only(set(names) | set(SEARCH_WEIGHTS)))
+    if user.role != "ADMIN":
+        stmt = stmt.where(Property.owner_id == user.id)
+    scored = []
+    for prop in (await db.execute(stmt)).scalars():
+        fields = {}
+        for field, weight in SEARCH_WEIGHTS.items():
+            value = getattr(prop, field)
+            text_value = " ".join(map(str, value)) if isinstance(value, list) else value
+            fields[weight] = " ".join(filter(None, [fields.get(weight), text_value]))
+        rank = score_document(tokens, fields)
+        if rank > 0 and (not after or (rank, -prop.id) < (after[0], -after[1])):
+            scored.append((prop, rank))
+    scored.sort(key=lambda item: (-item[1], item[0].id))
+    return scored_page(scored[:limit + 1], names, limit, PropertySearchItem, "rank")
+
+def scored_page(rows, names, limit: int, schema, key: str) -> dict:
+    """Page of (property, score) rows: the projection plus `key` as `schema`, cursor on (score, id)."""
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([rows[-1][1], rows[-1][0].id])
+    items = [PROPERTY_FIELDS.project(prop, names, schema, **{key: score}) for prop, score in rows]
+    return {"items": items, "next_cursor": next_cursor}
+
+def nearby_query(lat: float, lng: float, box):
+    """
+    (Property, distance_km) rows located inside `box`, distance measured from
+    (lat, lng). The box becomes one longitude range per latitude band, each an
+    index range scan on (lat_band, location_lng).
+    """
+    min_lat, min_lng, max_lat, max_lng = box
+    distance = cast(distance_km(Property.location_lat, Property.location_lng, lat, lng), Float).label("distance_km")
+    return select(Property, distance).where(
+        Property.lat_band.in_(lat_bands(min_lat, max_lat)),
+        Property.location_lng.between(min_lng, max_lng),
+        Property.location_lat.between(min_lat, max_lat),
+    )
+
+@router.get("/nearby", response_model=Page[PropertyNearbyItem], response_model_exclude_unset=True)
+async def nearby_properties(
+    lat: Optional[float] = Query(None, ge=-90, le=90),
+    lng: Optional[float] = Query(None, ge=-180, le=180),
+    radius_km: Optional[float] = Query(None, gt=0, le=settings.NEARBY_MAX_RADIUS_KM),
+    min_lat: Optional[float] = Query(None, ge=-90, le=90),
+    min_lng: Optional[float] = Query(None, ge=-180, le=180),
+    max_lat: Optional[float] = Query(None, ge=-90, le=90),
+    max_lng: Optional[float] = Query(None, ge=-180, le=180),
+    page: PageParams = Depends(),
+    fields: Optional[str] = Query(None, description="Comma-separated columns, or * for all"),
+    user: UserSnapshot = Depends(require_role("OWNER")),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    The caller's properties (every property for admins) closest first: within
+    `radius_km` of (lat, lng), or inside the min/max lat/lng bounding box, then
+    ordered by distance from (lat, lng) or, without them, the box's centre.
+    Items are the ?fields= projection plus `distance_km`; `next_cursor`
+    continues after the last (distance, id).
+    """
+    if (lat is None) != (lng is None):
+        raise HTTPException(status_code=400, detail="lat and lng must be given together")
+    corners = [min_lat, min_lng, max_lat, max_lng]
+    if any(v is not None for v in corners):
+        if any(v is None for v in corners):
+            raise HTTPException(status_code=400, detail="A bounding box needs min_lat, min_lng, max_lat and max_lng")
+        if radius_km is not None:
+            raise HTTPException(status_code=400, detail="Give either radius_km or a bounding box, not both")
+        if min_lat > max_lat or min_lng > max_lng:
+            # A box across the antimeridian would need two longitude ranges
+            raise HTTPException(status_code=400, detail="Bounding box minimums must not exceed its maximums")
+        if (max_lat - min_lat) * KM_PER_DEGREE > 2 * settings.NEARBY_MAX_RADIUS_KM:
+            raise HTTPException(status_code=400, detail="Bounding box is too large")
+        box = corners
+        if lat is None:
+            lat, lng = (min_lat + max_lat) / 2, (min_lng + max_lng) / 2
+    elif lat is None:
+        raise HTTPException(status_code=400, detail="Give lat and lng, or a bounding box")
     else:
-        result = await db.execute(select(Property).where(Property.owner_id == user.id))
-    return result.scalars().all()
+        radius_km = radius_km or settings.NEARBY_DEFAULT_RADIUS_KM
+        box = bounding_box(lat, lng, radius_km)
+
+    names = [n for n in PROPERTY_FIELDS.parse(fields) if n != "units"]
+    limit = page.limit or settings.PAGE_SIZE_DEFAULT
+    stmt = nearby_query(lat, lng, box).options(PROPERTY_FIELDS.load_only(names))
+    if user.role != "ADMIN":
+        stmt = stmt.where(Property.owner_id == user.id)
+    located = stmt.subquery()
+    entity = aliased(Property, located)
+    page_stmt = select(entity, located.c.distance_km).order_by(located.c.distance_km, located.c.id)
+    if radius_km is not None:
+        # The box's corners lie outside the circle
+        page_stmt = page_stmt.where(located.c.distance_km <= radius_km)
+    if page.cursor:
+        after = decode_cursor(page.cursor, [column("distance_km", Float), Property.id])
+        page_stmt = page_stmt.where(or_(
+            located.c.distance_km > after[0], and_(located.c.distance_km == after[0], located.c.id > after[1])
+        ))
+    rows = (await db.execute(page_stmt.limit(limit + 1))).all()
+    return scored_page([(prop, distance) for prop, distance in rows], names, limit, PropertyNearbyItem, "distance_km")
+
+def property_version_query(property_id: int, with_units: bool):
+    """owner_id plus everything the property body's ETag depends on, in one row."""
+    columns = [Property.owner_id, Property.version]
+    if with_units:
+        # Unit versions change on update; count and max(id) catch inserts and deletes
+        columns += [
+            select(aggregate).where(Unit.property_id == Property.id).scalar_subquery().label(name)
+            for name, aggregate in (
+                ("units_count", func.count(Unit.id)),
+                ("units_version", func.coalesce(func.sum(Unit.version), 0)),
+                ("units_max_id", func.max(Unit.id)),
+            )
+        ]
+    return select(*columns).where(Property.id == property_id)
 
-@router.get("/{property_id}")
+@router.get("/{property_id}", response_model=PropertyDetail, response_model_exclude_unset=True)
 async def get_property(
     property_id: int,
-    user: User = Depends(get_current_user),
+    request: Request,
+    response: Response,
+    fields: Optional[str] = Query(None, description="Comma-separated columns and/or units; default is everything"),
+    unit_fields: Optional[str] = Query(None, description="Columns of each embedded unit"),
+    user: UserSnapshot = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
-    # Eager load units
-    from sqlalchemy.orm import selectinload
-    
+    names = PROPERTY_FIELDS.parse(fields or "*")
+    unit_names = UNIT_FIELDS.parse(unit_fields) if "units" in names else None
+
+    # Cheap version probe first: a revalidating client that is up to date gets a
+    # 304 without the property and its units being loaded or serialized
+    probe = (await db.execute(property_version_query(property_id, unit_names is not None))).first()
+    if not probe:
+        raise HTTPException(status_code=404, detail="Property not found")
+    if probe.owner_id != user.id and user.role != "ADMIN":
+        raise HTTPException(status_code=403, detail="Not authorized")
+    etag = compute_etag("property", property_id, names, unit_names, *probe[1:])
+    if matches(request, etag):
+        return not_modified(etag)
+
+    # owner_id is needed for the authorization check below
     query = (
         select(Property)
-        .options(selectinload(Property.units))
+        .options(PROPERTY_FIELDS.load_only(names + ["owner_id"]))
         .where(Property.id == property_id)
     )
+    if unit_names is not None:
+        query = query.options(selectinload(Property.units).options(UNIT_FIELDS.load_only(unit_names)))
     result = await db.execute(query)
     prop = result.scalars().first()
     
@@ -96,14 +375,19 @@ async def get_property(
         
     if prop.owner_id != user.id and user.role != "ADMIN":
         raise HTTPException(status_code=403, detail="Not authorized")
-        
-    return prop
 
-@router.patch("/{property_id}/documents")
+    units = {}
+    if unit_names is not None:
+        units["units"] = [UNIT_FIELDS.project(unit, unit_names) for unit in prop.units]
+    body = PROPERTY_FIELDS.project(prop, [n for n in names if n != "units"], **units)
+    set_etag(response, etag)
+    return body
+
+@router.patch("/{property_id}/documents", response_model=PropertyResponse)
 async def update_property_documents(
     property_id: int,
     documents: List[dict], # [{"name": "deed", "url": "..."}]
-    user: User = Depends(get_current_user),
+    user: UserSnapshot = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     result = await db.execute(select(Property).where(Property.id == property_id))
@@ -120,15 +404,17 @@ async def update_property_documents(
     await db.refresh(prop)
     return prop
 
-@router.post("/{property_id}/units")
+@router.post("/{property_id}/units", response_model=UnitResponse)
 async def create_unit(
     property_id: int,
     unit_data: UnitCreate,
-    user: User = Depends(get_current_user),
+    user: UserSnapshot = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     # Verify ownership
-    result = await db.execute(select(Property).where(Property.id == property_id))
+    result = await db.execute(
+        select(Property).options(PROPERTY_FIELDS.load_only(["id", "owner_id"])).where(Property.id == property_id)
+    )
     prop = result.scalars().first()
     if not prop:
         raise HTTPException(status_code=404, detail="Property not found")
@@ -146,176 +432,145 @@ async def create_unit(
         status=unit_data.status
     )
     db.add(new_unit)
+    await rollups.on_unit_created(db, property_id, prop.owner_id, new_unit.status)
     await db.commit()
+    await response_cache.invalidate(*analytics_tags(property_id, prop.owner_id))
     await db.refresh(new_unit)
     return new_unit
 
-@router.get("/{property_id}/analytics")
+@router.get("/{property_id}/analytics", response_model=PropertyAnalytics)
 async def get_property_analytics(
     property_id: int,
-    user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    from sqlalchemy import func, and_, desc, extract, case, literal_column
-    from datetime import datetime, timedelta
-    from app.models import Tenancy, Payment, MaintenanceRequest, Unit
-    from app.schemas_analytics import PropertyAnalytics, OccupancyStats, FinancialStats, MonthlyRevenue, AlertItem
-
     # 1. Verify Ownership
     # Using explicit check here as it's specific to property_id logic, 
     # but could be abstracted if we load property in dependency.
     # For now, keep it efficient:
-    result = await db.execute(select(Property).where(Property.id == property_id))
+    result = await db.execute(
+        select(Property).options(PROPERTY_FIELDS.load_only(["id", "owner_id"])).where(Property.id == property_id)
+    )
     prop = result.scalars().first()
     if not prop:
         raise HTTPException(status_code=404, detail="Property not found")
     if prop.owner_id != user.id and user.role != "ADMIN":
         raise HTTPException(status_code=403, detail="Not authorized")
 
-    # 2. Occupancy Stats (Aggregated)
-    # Count units by status
-    # SELECT count(id) FILTER (WHERE status='OCCUPIED'), ...
-    occupancy_query = (
+    return await response_cache.get_or_compute(
+        ("property_analytics", user.id, property_id),
+        analytics_tags(property_id=property_id),
+        lambda: compute_property_analytics(db, property_id),
+    )
+
+def property_analytics_query(property_ids: List[int], first_month: date, dialect: str):
+    """
+    Occupancy, projected rent and the six monthly revenue buckets in one statement:
+    one row per (property, month) (gaps filled by the month series), each carrying
+    the property's rollup counters.
+    """
+    months = rollups.month_series(first_month, 6, dialect)
+    return (
         select(
-            func.count(Unit.id).label("total"),
-            func.sum(case((Unit.status == "OCCUPIED", 1), else_=0)).label("occupied"),
-            func.sum(case((Unit.status == "VACANT", 1), else_=0)).label("vacant"),
-            func.sum(case((Unit.status == "UNDER_MAINTENANCE", 1), else_=0)).label("maintenance")
+            Property.id.label("property_id"),
+            months.c.month,
+            func.coalesce(RevenueRollup.rent_total, 0.0).label("rent_total"),
+            func.coalesce(RevenueRollup.other_total, 0.0).label("other_total"),
+            PropertyRollup.units_total,
+            PropertyRollup.units_occupied,
+            PropertyRollup.units_vacant,
+            PropertyRollup.units_under_maintenance,
+            PropertyRollup.projected_rent,
         )
-        .where(Unit.property_id == property_id)
-    )
-    occ_res = (await db.execute(occupancy_query)).first()
-    
-    occupancy_stats = OccupancyStats(
-        total_units=occ_res.total or 0,
-        occupied=occ_res.occupied or 0,
-        vacant=occ_res.vacant or 0,
-        under_maintenance=occ_res.maintenance or 0
+        .select_from(Property)
+        .join(months, true())
+        .outerjoin(RevenueRollup, and_(
+            RevenueRollup.property_id == Property.id,
+            RevenueRollup.month == months.c.month
+        ))
+        .outerjoin(PropertyRollup, PropertyRollup.property_id == Property.id)
+        .where(Property.id.in_(property_ids))
+        .order_by(Property.id, months.c.month)
     )
 
-    # 3. Financials
-    # Get Unit IDs subquery for filtering
-    unit_ids_sub = select(Unit.id).where(Unit.property_id == property_id)
-
-    # Projected Rent (Sum of rent from ACTIVE tenancies in these units)
-    proj_rent_query = (
-        select(func.sum(Tenancy.rent_amount))
+def expiring_leases_query(property_ids: List[int], today: date):
+    return (
+        select(Unit.property_id, Tenancy.end_date, Unit.unit_number)
+        .join(Unit, Tenancy.unit_id == Unit.id)
         .where(
             and_(
-                Tenancy.unit_id.in_(unit_ids_sub),
-                Tenancy.status == "ACTIVE"
+                Unit.property_id.in_(property_ids),
+                Tenancy.status == "ACTIVE",
+                Tenancy.end_date <= today + timedelta(days=90),
+                Tenancy.end_date >= today
             )
         )
     )
-    projected_rent = (await db.execute(proj_rent_query)).scalar() or 0.0
 
-    # 6 Month Window
+async def compute_analytics_batch(db: AsyncSession, property_ids: List[int]) -> dict:
+    """PropertyAnalytics for each of `property_ids`, in two statements regardless of count."""
+    # 6 Month Window: the current calendar month and the five before it
     today = date.today()
-    six_months_ago = today - timedelta(days=180)
+    first_month = rollups.add_months(today.replace(day=1), -5)
 
-    # Revenue Breakdown (Group by Month)
-    # We join Tenancy (to filter by unit) -> Payment
-    revenue_query = (
-        select(
-            extract('year', Payment.payment_date).label('year'),
-            extract('month', Payment.payment_date).label('month'),
-            func.sum(Payment.amount).label('total')
-        )
-        .join(Tenancy, Payment.tenancy_id == Tenancy.id)
-        .where(
-            and_(
-                Tenancy.unit_id.in_(unit_ids_sub),
-                Payment.payment_type == "RENT",
-                Payment.payment_date >= six_months_ago
-            )
-        )
-        .group_by(
-            extract('year', Payment.payment_date),
-            extract('month', Payment.payment_date)
-        )
-        .order_by(
-            extract('year', Payment.payment_date),
-            extract('month', Payment.payment_date)
-        )
-    )
-    rev_rows = (await db.execute(revenue_query)).all()
-    
-    # Fill missing months
-    first_day_current = today.replace(day=1)
-    monthly_map = {(int(r.year), int(r.month)): r.total for r in rev_rows}
-    monthly_revenue = []
-    total_revenue_6m = 0.0
-    
-    for i in range(5, -1, -1):
-        # Go back i months
-        # Logic: find date 30*i days ago roughly or strict month subtraction
-        # Strict month subtraction:
-        curr_m = first_day_current.month - i
-        curr_y = first_day_current.year
-        while curr_m <= 0:
-            curr_m += 12
-            curr_y -= 1
-            
-        amount = monthly_map.get((curr_y, curr_m), 0.0)
-        total_revenue_6m += amount
-        # Get Month Name
-        m_name = date(curr_y, curr_m, 1).strftime("%b")
-        monthly_revenue.append(MonthlyRevenue(
-            month=m_name,
-            year=curr_y,
-            amount=amount
-        ))
+    # Both statements run on the request's own connection, one after the other:
+    # a second pooled connection per request would halve the pool's capacity
+    # under load and can deadlock it when every request waits for its second one
+    analytics_rows = (await db.execute(property_analytics_query(property_ids, first_month, db.bind.dialect.name))).all()
+    expiring_rows = (await db.execute(expiring_leases_query(property_ids, today))).all()
 
-    # Maintenance Spend
-    expense_query = (
-        select(func.sum(Payment.amount))
-        .join(Tenancy, Payment.tenancy_id == Tenancy.id)
-        .where(
-            and_(
-                Tenancy.unit_id.in_(unit_ids_sub),
-                Payment.payment_type != "RENT",
-                Payment.payment_date >= six_months_ago
-            )
-        )
+    rows_by_property = {}
+    for r in analytics_rows:
+        rows_by_property.setdefault(r.property_id, []).append(r)
+    leases_by_property = {}
+    for r in expiring_rows:
+        leases_by_property.setdefault(r.property_id, []).append(r)
+
+    return {
+        property_id: build_property_analytics(rows, leases_by_property.get(property_id, []), today)
+        for property_id, rows in rows_by_property.items()
+    }
+
+async def compute_property_analytics(db: AsyncSession, property_id: int):
+    return (await compute_analytics_batch(db, [property_id]))[property_id]
+
+def build_property_analytics(rows, expiring_rows, today: date):
+    rollup = rows[0]
+
+    # 2. Occupancy Stats, from the incrementally maintained rollup row
+    occupancy_stats = OccupancyStats(
+        total_units=rollup.units_total or 0,
+        occupied=rollup.units_occupied or 0,
+        vacant=rollup.units_vacant or 0,
+        under_maintenance=rollup.units_under_maintenance or 0
     )
-    maintenance_spend = (await db.execute(expense_query)).scalar() or 0.0
+
+    # 3. Financials
+    monthly_revenue = [
+        MonthlyRevenue(month=r.month.strftime("%b"), year=r.month.year, amount=r.rent_total)
+        for r in rows
+    ]
 
     financial_stats = FinancialStats(
-        current_month_projected_rent=projected_rent,
+        current_month_projected_rent=rollup.projected_rent or 0.0,
         pending_rent=0.0, # Still placeholder
-        total_revenue_6_months=total_revenue_6m,
+        total_revenue_6_months=sum(r.rent_total for r in rows),
         monthly_breakdown=monthly_revenue,
-        maintenance_spend_6_months=maintenance_spend
+        maintenance_spend_6_months=sum(r.other_total for r in rows)
     )
 
     # 4. Alerts
     alerts = []
     
-    # Expiring Leases (SQL Check)
-    expiry_threshold = today + timedelta(days=90)
-    expiring_query = (
-        select(Tenancy, Unit.unit_number)
-        .join(Unit, Tenancy.unit_id == Unit.id)
-        .where(
-            and_(
-                Tenancy.unit_id.in_(unit_ids_sub),
-                Tenancy.status == "ACTIVE",
-                Tenancy.end_date <= expiry_threshold,
-                Tenancy.end_date >= today
-            )
-        )
-    )
-    expiring_rows = (await db.execute(expiring_query)).all()
-    # Row is (Tenancy, unit_number) tuple
-    
-    for ten, u_num in expiring_rows:
-        days_left = (ten.end_date - today).days
+    # Expiring Leases
+    for _, end_date, u_num in expiring_rows:
+        days_left = (end_date - today).days
         alerts.append(AlertItem(
             type="EXPIRING_LEASE",
             message=f"Lease ends in {days_left} days",
             severity="HIGH" if days_left < 30 else "MEDIUM",
             unit_number=u_num,
-            target_date=ten.end_date
+            target_date=end_date
         ))
 
     # Vacant Units (Already have count from step 2)
@@ -332,34 +587,240 @@ async def get_property_analytics(
         alerts=alerts
     )
 
-@router.get("/units/{unit_id}")
-async def get_unit_details(
-    unit_id: int,
-    user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+GRANULARITY_MONTHS = {"month": 1, "quarter": 3, "year": 12}
+
+def revenue_series_query(property_id: int, first: date, buckets: int, step_months: int, dialect: str):
+    """Bucketed payment totals per type, read only from payment_monthly_rollups."""
+    periods = rollups.month_series(first, buckets, dialect, step_months)
+    return (
+        select(
+            periods.c.month.label("start"),
+            PaymentMonthlyRollup.payment_type,
+            func.sum(PaymentMonthlyRollup.total).label("total"),
+            func.sum(PaymentMonthlyRollup.count).label("count"),
+        )
+        .select_from(periods)
+        .outerjoin(PaymentMonthlyRollup, and_(
+            PaymentMonthlyRollup.property_id == property_id,
+            PaymentMonthlyRollup.month >= periods.c.month,
+            PaymentMonthlyRollup.month < periods.c.next_month
+        ))
+        .group_by(periods.c.month, PaymentMonthlyRollup.payment_type)
+        .order_by(periods.c.month)
+    )
+
+def period_label(start: date, granularity: str) -> str:
+    if granularity == "year":
+        return str(start.year)
+    if granularity == "quarter":
+        return f"{start.year}-Q{(start.month - 1) // 3 + 1}"
+    return start.strftime("%Y-%m")
+
+@router.get("/{property_id}/analytics/revenue", response_model=RevenueSeries)
+async def get_property_revenue_series(
+    property_id: int,
+    months: int = Query(12, ge=1, le=120),
+    granularity: Literal["month", "quarter", "year"] = "month",
+    user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    from sqlalchemy.orm import selectinload
-    from app.models import Tenancy
-    
-    # Eager load Property, Current Tenancy, and History
-    query = (
-        select(Unit)
-        .options(
-            selectinload(Unit.property),
-            selectinload(Unit.tenancy).selectinload(Tenancy.tenant), # Current tenant user
-            selectinload(Unit.tenancies).selectinload(Tenancy.tenant), # History
-            selectinload(Unit.payments) # Ledger
+    """
+    Revenue for the last `months` months (e.g. 12, 24, 60), grouped by month, quarter
+    or year. Cost depends on the number of buckets, not on the size of the ledger.
+    """
+    result = await db.execute(select(Property.owner_id).where(Property.id == property_id))
+    owner_id = result.scalar()
+    if owner_id is None:
+        raise HTTPException(status_code=404, detail="Property not found")
+    if owner_id != user.id and user.role != "ADMIN":
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    return await response_cache.get_or_compute(
+        ("property_revenue", user.id, property_id, months, granularity),
+        analytics_tags(property_id=property_id),
+        lambda: compute_revenue_series(db, property_id, months, granularity),
+    )
+
+async def compute_revenue_series(db: AsyncSession, property_id: int, months: int, granularity: str):
+    step = GRANULARITY_MONTHS[granularity]
+    # Buckets are calendar-aligned; the last one contains today
+    buckets = -(-months // step)
+    first = rollups.add_months(rollups.bucket_start(date.today(), step), -(buckets - 1) * step)
+
+    rows = (await db.execute(
+        revenue_series_query(property_id, first, buckets, step, db.bind.dialect.name)
+    )).all()
+
+    points = {}
+    for r in rows:
+        point = points.setdefault(r.start, RevenuePoint(
+            period=period_label(r.start, granularity), start=r.start, total=0.0, count=0, by_type={}
+        ))
+        if r.payment_type is not None:
+            point.total += r.total
+            point.count += r.count
+            point.by_type[r.payment_type] = r.total
+
+    return RevenueSeries(
+        property_id=property_id,
+        granularity=granularity,
+        months=months,
+        points=list(points.values())
+    )
+
+def unit_payments_filter(unit_id):
+    """Payments belonging to a unit: through their tenancy when set, else their own unit_id."""
+    # A UNION of two index lookups; an OR of the two conditions makes Postgres scan payments
+    via_tenancy = select(Payment.id).join(Tenancy, Payment.tenancy_id == Tenancy.id).where(Tenancy.unit_id == unit_id)
+    direct = select(Payment.id).where(Payment.tenancy_id.is_(None), Payment.unit_id == unit_id)
+    return Payment.id.in_(union_all(via_tenancy, direct).subquery().select())
+
+def unit_core_query(unit_id: int):
+    """
+    owner_id, the versions behind the unit detail (for its ETag) and the summary
+    counts shown in place of the full history and ledger, in one row.
+    """
+    def correlated(name, aggregate, *joins):
+        stmt = select(aggregate).select_from(Tenancy)
+        for target, on in joins:
+            stmt = stmt.join(target, on)
+        return stmt.where(Tenancy.unit_id == Unit.id).scalar_subquery().label(name)
+
+    def ledger(name, aggregate):
+        return select(aggregate).where(unit_payments_filter(unit_id)).scalar_subquery().label(name)
+
+    return (
+        select(
+            Property.owner_id,
+            Unit.version,
+            Property.version.label("property_version"),
+            correlated("tenancies_version", func.coalesce(func.sum(Tenancy.version), 0)),
+            correlated("tenants_version", func.coalesce(func.sum(User.version), 0), (User, Tenancy.tenant_id == User.id)),
+            # Payments are append-only, so count and max(id) identify the ledger's state
+            ledger("payments_max_id", func.max(Payment.id)),
+            correlated("tenancies_count", func.count(Tenancy.id)),
+            ledger("payments_count", func.count(Payment.id)),
+            ledger("payments_total", func.coalesce(func.sum(Payment.amount), 0)),
+            ledger("last_payment_date", func.max(Payment.payment_date)),
         )
+        .join(Property, Unit.property_id == Property.id)
         .where(Unit.id == unit_id)
     )
+
+async def authorize_unit(db: AsyncSession, unit_id: int, user: UserSnapshot) -> None:
+    owner_id = (await db.execute(
+        select(Property.owner_id).join(Unit, Unit.property_id == Property.id).where(Unit.id == unit_id)
+    )).scalar()
+    if owner_id is None:
+        raise HTTPException(status_code=404, detail="Unit not found")
+    # Verify Ownership via Property
+    if owner_id != user.id and user.role != "ADMIN":
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+@router.get("/units/{unit_id}", response_model=UnitDetail)
+async def get_unit_details(
+    unit_id: int,
+    request: Request,
+    response: Response,
+    user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    The unit, its property and current tenancy, with summary counts. Tenancy history
+    and the ledger are paged separately (/units/{id}/tenancies, /units/{id}/payments).
+    """
+    core = (await db.execute(unit_core_query(unit_id))).first()
+    if not core:
+        raise HTTPException(status_code=404, detail="Unit not found")
+    # Verify Ownership via Property
+    if core.owner_id != user.id and user.role != "ADMIN":
+        raise HTTPException(status_code=403, detail="Not authorized")
+    etag = compute_etag("unit", unit_id, *core[1:])
+    if matches(request, etag):
+        return not_modified(etag)
+
+    # Eager load Property
+    query = select(Unit).options(selectinload(Unit.property)).where(Unit.id == unit_id)
     result = await db.execute(query)
     unit = result.scalars().first()
     
     if not unit:
         raise HTTPException(status_code=404, detail="Unit not found")
-        
-    # Verify Ownership via Property
-    if unit.property.owner_id != user.id and user.role != "ADMIN":
-        raise HTTPException(status_code=403, detail="Not authorized")
-        
-    return unit
+
+    # Current tenancy (and tenant user). Unit.tenancy matches every tenancy of the
+    # unit, so pick the live one explicitly instead of eager-loading the relationship.
+    current = (await db.execute(
+        select(Tenancy)
+        .options(selectinload(Tenancy.tenant))
+        .where(Tenancy.unit_id == unit_id, Tenancy.status.in_(["ACTIVE", "NOTICE"]))
+        .order_by(Tenancy.start_date.desc(), Tenancy.id.desc())
+        .limit(1)
+    )).scalars().first()
+    set_committed_value(unit, "tenancy", current)
+
+    set_etag(response, etag)
+    return UnitDetail.model_validate(unit).model_copy(update={"summary": UnitSummary(
+        tenancies_count=core.tenancies_count,
+        payments_count=core.payments_count,
+        payments_total=core.payments_total,
+        last_payment_date=core.last_payment_date,
+    )})
+
+@router.get("/units/{unit_id}/tenancies", response_model=UnitTenancyPage)
+async def get_unit_tenancies(
+    unit_id: int,
+    response: Response,
+    page: PageParams = Depends(),
+    status: Optional[Literal["ACTIVE", "NOTICE", "HISTORIC"]] = None,
+    user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Tenancy history, newest first, with per-status counts over the unit's whole history."""
+    await authorize_unit(db, unit_id, user)
+    stmt = select(Tenancy).where(Tenancy.unit_id == unit_id).options(selectinload(Tenancy.tenant))
+    if status:
+        stmt = stmt.where(Tenancy.status == status)
+    order = [(Tenancy.start_date, True), (Tenancy.id, True)]
+    result = await paginate(db, stmt, order, page, response, compat=False)
+
+    counts = (await db.execute(
+        select(
+            func.count(Tenancy.id).label("total"),
+            *[func.count(Tenancy.id).filter(Tenancy.status == s).label(s.lower()) for s in ("ACTIVE", "NOTICE", "HISTORIC")],
+        ).where(Tenancy.unit_id == unit_id)
+    )).one()
+    return {**result, "summary": counts._asdict()}
+
+@router.get("/units/{unit_id}/payments", response_model=UnitPaymentPage)
+async def get_unit_payments(
+    unit_id: int,
+    response: Response,
+    page: PageParams = Depends(),
+    payment_type: Optional[PaymentType] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """The unit's ledger, most recent first, with totals over the same filters."""
+    await authorize_unit(db, unit_id, user)
+    conditions = [unit_payments_filter(unit_id)]
+    if payment_type is not None:
+        conditions.append(Payment.payment_type == payment_type.value)
+    if start_date:
+        conditions.append(Payment.payment_date >= start_date)
+    if end_date:
+        conditions.append(Payment.payment_date <= end_date)
+
+    order = [(Payment.payment_date, True), (Payment.id, True)]
+    result = await paginate(db, select(Payment).where(*conditions), order, page, response, compat=False)
+
+    summary = (await db.execute(
+        select(
+            func.count(Payment.id).label("count"),
+            func.coalesce(func.sum(Payment.amount), 0).label("total"),
+            func.min(Payment.payment_date).label("first_payment_date"),
+            func.max(Payment.payment_date).label("last_payment_date"),
+        ).where(*conditions)
+    )).one()
+    return {**result, "summary": summary._asdict()}
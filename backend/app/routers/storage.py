@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
 from app.dependencies import get_current_user
-from app.models import User
+from app.utils.identity_cache import UserSnapshot
+from typing import Dict
 import os
 
 router = APIRouter(prefix="/storage", tags=["Storage"])
@@ -10,10 +11,10 @@ router = APIRouter(prefix="/storage", tags=["Storage"])
 # or just returning a token for client-side.
 # For this mock implementation without the Vercel token present in env yet:
 
-@router.post("/upload")
+@router.post("/upload", response_model=Dict[str, str])
 async def upload_file(
     file: UploadFile = File(...),
-    user: User = Depends(get_current_user)
+    user: UserSnapshot = Depends(get_current_user)
 ):
     # In a real Vercel Blob setup:
     # from vercel_blob import put
@@ -30,8 +31,8 @@ async def upload_file(
     # If token exists but we haven't implemented `vercel_blob` package yet:
     raise HTTPException(status_code=501, detail="Blob Storage implementation incomplete.")
 
-@router.get("/token")
-async def get_upload_token(user: User = Depends(get_current_user)):
+@router.get("/token", response_model=Dict[str, str])
+async def get_upload_token(user: UserSnapshot = Depends(get_current_user)):
     if not os.getenv("BLOB_READ_WRITE_TOKEN"):
         raise HTTPException(
             status_code=501, 
@@ -1,9 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, BackgroundTasks
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.database import get_db
-from app.dependencies import get_current_user, require_role
+from app.dependencies import get_current_user, require_role, response_cache
+from app.utils.identity_cache import UserSnapshot
 from app.models import Tenancy, Unit, User, Payment
+from app.utils import rollups
+from app.utils.response_cache import analytics_tags
+from app.schemas import TenancyResponse
+from app.utils.etag import compute_etag, matches, not_modified, set_etag
 from pydantic import BaseModel, model_validator
 from datetime import date
 from typing import Optional, Literal
@@ -38,11 +43,11 @@ class TenancyCreate(BaseModel):
                 raise ValueError("lease_amount should not be set for RENT payment structure")
         return self
 
-@router.post("/", status_code=status.HTTP_201_CREATED)
+@router.post("/", status_code=status.HTTP_201_CREATED, response_model=TenancyResponse)
 async def create_tenancy(
     data: TenancyCreate,
     background_tasks: BackgroundTasks,
-    user: User = Depends(require_role("OWNER")),
+    user: UserSnapshot = Depends(require_role("OWNER")),
     db: AsyncSession = Depends(get_db)
 ):
     # Check unit ownership
@@ -80,6 +85,9 @@ async def create_tenancy(
     db.add(new_tenancy)
     
     # Update unit status
+    owner_id = await rollups.property_owner(db, unit.property_id)
+    await rollups.on_unit_status_changed(db, unit.property_id, owner_id, unit.status, "OCCUPIED")
+    await rollups.on_tenancy_activated(db, unit.property_id, owner_id, data.rent_amount)
     unit.status = "OCCUPIED"
     
     await db.commit()
@@ -96,7 +104,11 @@ async def create_tenancy(
             status="PAID"
         )
         db.add(lease_payment)
+        await rollups.on_payment_recorded(
+            db, unit.property_id, owner_id, unit.id, data.lease_amount, "LEASE", lease_payment.payment_date
+        )
         await db.commit()
+    await response_cache.invalidate(*analytics_tags(unit.property_id, owner_id))
     
     # Send Invite Email in Background
     if data.tenant_email:
@@ -115,11 +127,11 @@ async def create_tenancy(
 class VacationNotice(BaseModel):
     notice_date: date
 
-@router.post("/{tenancy_id}/vacate")
+@router.post("/{tenancy_id}/vacate", response_model=TenancyResponse)
 async def give_vacation_notice(
     tenancy_id: int,
     notice: VacationNotice,
-    user: User = Depends(get_current_user),
+    user: UserSnapshot = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     result = await db.execute(select(Tenancy).where(Tenancy.id == tenancy_id))
@@ -135,16 +147,20 @@ async def give_vacation_notice(
         # Assuming Tenant triggers it mostly.
         raise HTTPException(status_code=403, detail="Not authorized")
 
+    property_id, owner_id = await rollups.unit_location(db, tenancy.unit_id)
+    if tenancy.status == "ACTIVE":
+        await rollups.on_tenancy_deactivated(db, property_id, owner_id, tenancy.rent_amount)
     tenancy.status = "NOTICE"
     tenancy.vacation_notice_date = notice.notice_date
     
     await db.commit()
+    await response_cache.invalidate(*analytics_tags(property_id, owner_id))
     await db.refresh(tenancy)
     return tenancy
 
 @router.get("/report")
 async def get_owner_report(
-    user: User = Depends(get_current_user),
+    user: UserSnapshot = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     if user.role != "OWNER":
@@ -180,9 +196,11 @@ async def get_owner_report(
     # Let's stick to basic "My Payments" endpoint in finance router and filter there.
     pass
 
-@router.get("/me")
+@router.get("/me", response_model=TenancyResponse)
 async def get_my_tenancy(
-    user: User = Depends(get_current_user),
+    request: Request,
+    response: Response,
+    user: UserSnapshot = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     if user.role != "TENANT":
@@ -202,5 +220,10 @@ async def get_my_tenancy(
         # Return 204 or 404? 404 implies error, 204 or empty object implies no data.
         # Let's return 404 for simplicity in frontend handling for "No lease found"
         raise HTTPException(status_code=404, detail="No active lease found")
-        
+
+    # A single row, so it is loaded anyway; a match still skips serialization
+    etag = compute_etag("tenancy", tenancy.id, tenancy.version)
+    if matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
     return tenancy
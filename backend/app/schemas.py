@@ -0,0 +1,215 @@
+from pydantic import BaseModel
+from typing import Any, List, Optional
+from app.utils.pagination import Page
+from datetime import date, datetime
+
+# Response models for the ORM-backed endpoints. They list exactly the columns that
+# were previously serialized from the loaded instances, and name relationships only
+# where the endpoint eager-loads them, so serialization never triggers a lazy load.
+
+class UserResponse(BaseModel):
+    id: int
+    firebase_uid: str
+    email: str
+    role: str
+    name: Optional[str] = None
+    documents: Optional[Any] = None
+    version: int
+
+    class Config:
+        from_attributes = True
+
+class PropertyResponse(BaseModel):
+    id: int
+    owner_id: int
+    name: str
+    address: str
+    description: Optional[str] = None
+    property_type: Optional[str] = None
+    units_count: Optional[int] = None
+    location_lat: Optional[float] = None
+    location_lng: Optional[float] = None
+    amenities: Optional[Any] = None
+    highlights: Optional[Any] = None
+    house_rules: Optional[Any] = None
+    nearby_places: Optional[Any] = None
+    images: Optional[Any] = None
+    documents: Optional[Any] = None
+    version: int
+
+    class Config:
+        from_attributes = True
+
+class UnitResponse(BaseModel):
+    id: int
+    property_id: int
+    unit_number: str
+    specifications: Optional[Any] = None
+    images: Optional[Any] = None
+    status: Optional[str] = None
+    size_sqft: Optional[float] = None
+    facing: Optional[str] = None
+    construction_date: Optional[date] = None
+    documents: Optional[Any] = None
+    version: int
+
+    class Config:
+        from_attributes = True
+
+# ?fields= reads (app/utils/fieldsets.py): every column is optional and only the
+# selected ones are set, so these routes serialize with response_model_exclude_unset.
+class UnitListItem(BaseModel):
+    id: Optional[int] = None
+    property_id: Optional[int] = None
+    unit_number: Optional[str] = None
+    specifications: Optional[Any] = None
+    images: Optional[Any] = None
+    status: Optional[str] = None
+    size_sqft: Optional[float] = None
+    facing: Optional[str] = None
+    construction_date: Optional[date] = None
+    documents: Optional[Any] = None
+    version: Optional[int] = None
+
+class PropertyListItem(BaseModel):
+    id: Optional[int] = None
+    owner_id: Optional[int] = None
+    name: Optional[str] = None
+    address: Optional[str] = None
+    description: Optional[str] = None
+    property_type: Optional[str] = None
+    units_count: Optional[int] = None
+    location_lat: Optional[float] = None
+    location_lng: Optional[float] = None
+    lat_band: Optional[int] = None
+    amenities: Optional[Any] = None
+    highlights: Optional[Any] = None
+    house_rules: Optional[Any] = None
+    nearby_places: Optional[Any] = None
+    images: Optional[Any] = None
+    documents: Optional[Any] = None
+    version: Optional[int] = None
+
+class PropertySearchItem(PropertyListItem):
+    rank: float
+
+class PropertyNearbyItem(PropertyListItem):
+    distance_km: float
+
+class PropertyDetail(PropertyListItem):
+    units: Optional[List[UnitListItem]] = None
+
+class TenancyResponse(BaseModel):
+    id: int
+    unit_id: int
+    tenant_id: Optional[int] = None
+    payment_structure: str
+    lease_amount: Optional[float] = None
+    rent_amount: Optional[float] = None
+    tenant_name: Optional[str] = None
+    tenant_email: Optional[str] = None
+    tenant_phone: Optional[str] = None
+    start_date: date
+    end_date: Optional[date] = None
+    is_active: Optional[bool] = None
+    status: Optional[str] = None
+    vacation_notice_date: Optional[date] = None
+    advance_amount: Optional[float] = None
+    agreement_url: Optional[str] = None
+    version: int
+
+    class Config:
+        from_attributes = True
+
+class TenancyWithTenant(TenancyResponse):
+    tenant: Optional[UserResponse] = None
+
+class PaymentResponse(BaseModel):
+    id: int
+    tenancy_id: Optional[int] = None
+    unit_id: Optional[int] = None
+    amount: float
+    payment_type: str
+    payment_date: date
+    status: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+class UnitSummary(BaseModel):
+    tenancies_count: int
+    payments_count: int
+    payments_total: float
+    last_payment_date: Optional[date] = None
+
+class UnitDetail(UnitResponse):
+    property: PropertyResponse
+    tenancy: Optional[TenancyWithTenant] = None
+    summary: Optional[UnitSummary] = None
+
+class TenancySummary(BaseModel):
+    total: int
+    active: int
+    notice: int
+    historic: int
+
+class UnitTenancyPage(Page[TenancyWithTenant]):
+    summary: TenancySummary
+
+class PaymentSummary(BaseModel):
+    count: int
+    total: float
+    first_payment_date: Optional[date] = None
+    last_payment_date: Optional[date] = None
+
+class UnitPaymentPage(Page[PaymentResponse]):
+    summary: PaymentSummary
+
+class MaintenanceRequestResponse(BaseModel):
+    id: int
+    unit_id: int
+    tenant_id: Optional[int] = None
+    reported_by_id: int
+    title: str
+    description: str
+    images: Optional[Any] = None
+    status: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class MaintenanceRequestWithUnit(MaintenanceRequestResponse):
+    unit: UnitResponse
+
+class MaintenanceSummary(BaseModel):
+    open: int
+    in_progress: int
+    resolved: int
+    closed: int
+    total: int
+
+class MaintenancePage(Page[MaintenanceRequestWithUnit]):
+    summary: MaintenanceSummary
+
+class MaintenanceCommentResponse(BaseModel):
+    id: int
+    request_id: int
+    user_id: int
+    content: str
+    created_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class OwnerStats(BaseModel):
+    total_properties: int
+    active_tenants: int
+    monthly_revenue: float
+    occupancy_rate: int
+
+class AdminStats(BaseModel):
+    users: int
+    properties: int
+    active_tenancies: int
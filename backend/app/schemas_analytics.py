@@ -31,3 +31,27 @@ class PropertyAnalytics(BaseModel):
     occupancy: OccupancyStats
     financials: FinancialStats
     alerts: List[AlertItem]
+
+class RevenuePoint(BaseModel):
+    period: str # "2026-10", "2026-Q4" or "2026"
+    start: date
+    total: float
+    count: int
+    by_type: Dict[str, float] # payment_type -> amount
+
+class RevenueSeries(BaseModel):
+    property_id: int
+    granularity: str
+    months: int
+    points: List[RevenuePoint]
+
+class PortfolioItem(BaseModel):
+    property_id: int
+    name: str
+    analytics: PropertyAnalytics
+
+class PortfolioAnalytics(BaseModel):
+    items: List[PortfolioItem]
+    total: int
+    limit: int
+    offset: int
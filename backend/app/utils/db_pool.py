@@ -0,0 +1,157 @@
+import logging
+import queue
+import sys
+import time
+from collections import deque
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+# Engine defaults per DB_PROFILE. Any DB_* setting left unset falls back to these.
+ENGINE_PROFILES = {
+    "dev": {
+        "pool_size": 5,
+        "max_overflow": 10,
+        "pool_timeout": 30,
+        "pool_recycle": 1800,
+        "pool_pre_ping": True,
+        "statement_timeout_ms": 0,
+    },
+    "prod": {
+        "pool_size": 10,
+        "max_overflow": 20,
+        "pool_timeout": 10,
+        "pool_recycle": 1800,
+        "pool_pre_ping": True,
+        "statement_timeout_ms": 15000,
+    },
+    "test": {
+        # NullPool: no connections are shared across event loops in test runs
+        "pool_size": None,
+        "max_overflow": None,
+        "pool_timeout": None,
+        "pool_recycle": None,
+        "pool_pre_ping": False,
+        "statement_timeout_ms": 5000,
+    },
+}
+
+
+class PoolMetrics:
+    def __init__(self):
+        self.checkouts = 0
+        self.checkins = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self._waits: deque = deque(maxlen=1000)
+
+    def record_wait(self, seconds: float) -> None:
+        self.total_wait += seconds
+        self.max_wait = max(self.max_wait, seconds)
+        self._waits.append(seconds)
+
+    def stats(self, pool) -> dict:
+        waits = sorted(self._waits)
+        acquired = len(waits)
+        result = {
+            "pool_class": type(pool).__name__,
+            "checkouts": self.checkouts,
+            "checkins": self.checkins,
+            "checkout_timeouts": self.timeouts,
+            "avg_wait_ms": round(self.total_wait / acquired * 1000, 3) if acquired else 0.0,
+            "p95_wait_ms": round(waits[int(0.95 * (acquired - 1))] * 1000, 3) if acquired else 0.0,
+            "max_wait_ms": round(self.max_wait * 1000, 3),
+        }
+        if isinstance(pool, AsyncAdaptedQueuePool):
+            result.update({
+                "size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                # Negative while the pool is still below pool_size
+                "overflow": pool.overflow(),
+                "max_overflow": pool._max_overflow,
+            })
+        return result
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records how long each checkout waited for a connection."""
+
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.timeouts += 1
+            raise
+        finally:
+            self.metrics.record_wait(time.perf_counter() - started)
+
+
+def instrumented_pool_class(metrics: PoolMetrics) -> type:
+    # A subclass per engine, so the metrics survive pool.recreate() on dispose
+    return type("InstrumentedQueuePool", (InstrumentedQueuePool,), {"metrics": metrics})
+
+
+def instrument_pool(sync_engine, metrics: PoolMetrics) -> None:
+    @event.listens_for(sync_engine, "checkout")
+    def _on_checkout(dbapi_conn, conn_record, conn_proxy):
+        metrics.checkouts += 1
+
+    @event.listens_for(sync_engine, "checkin")
+    def _on_checkin(dbapi_conn, conn_record):
+        metrics.checkins += 1
+
+
+SQL_LOGGER = "sqlalchemy.engine.Engine"
+
+_sql_log_listener: Optional[QueueListener] = None
+_sql_log_handler: Optional[QueueHandler] = None
+
+
+def _as_debug(record: logging.LogRecord) -> bool:
+    # SQLAlchemy emits statements at INFO; they are debug output here
+    record.levelno, record.levelname = logging.DEBUG, "DEBUG"
+    return True
+
+
+def enable_sql_logging() -> None:
+    """
+    Log SQL statements (DB_LOG_SQL) as DEBUG records through a QueueHandler, so
+    formatting and stdout writes happen on a listener thread instead of the event
+    loop (echo=True writes synchronously).
+    """
+    global _sql_log_listener, _sql_log_handler
+    if _sql_log_listener:
+        return
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s %(message)s"))
+    _sql_log_listener = QueueListener(log_queue, stream)
+    _sql_log_listener.start()
+
+    _sql_log_handler = QueueHandler(log_queue)
+    _sql_log_handler.addFilter(_as_debug)
+    logger = logging.getLogger(SQL_LOGGER)
+    logger.addHandler(_sql_log_handler)
+    # INFO is the level at which SQLAlchemy starts emitting statements at all
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+def disable_sql_logging() -> None:
+    global _sql_log_listener, _sql_log_handler
+    if _sql_log_listener:
+        logger = logging.getLogger(SQL_LOGGER)
+        logger.removeHandler(_sql_log_handler)
+        logger.setLevel(logging.NOTSET)
+        logger.propagate = True
+        _sql_log_listener.stop()
+        _sql_log_listener = None
+        _sql_log_handler = None
@@ -0,0 +1,57 @@
+from typing import Iterable, List, Optional, Sequence, Type
+
+from fastapi import HTTPException
+from pydantic import BaseModel
+from sqlalchemy import inspect
+from sqlalchemy.orm import load_only
+
+
+class FieldSet:
+    """
+    `?fields=a,b,c` sparse fieldsets for one model. The chosen columns become a
+    `load_only` option, so unrequested (often large JSON) columns are neither read
+    from the database nor serialized. `fields=*` selects every column.
+
+    `schema` is the response model, with every field optional: a projection sets
+    only the chosen fields, and routes declare response_model_exclude_unset=True.
+    """
+
+    def __init__(
+        self,
+        model,
+        schema: Type[BaseModel],
+        default: Sequence[str],
+        always: Sequence[str] = ("id",),
+        relations: Sequence[str] = (),
+    ):
+        self.model = model
+        self.schema = schema
+        self.columns = [attr.key for attr in inspect(model).column_attrs]
+        self.default = list(default)
+        self.always = list(always)
+        self.relations = list(relations)
+
+    def parse(self, fields: Optional[str]) -> List[str]:
+        if not fields:
+            requested = self.default
+        elif fields.strip() == "*":
+            requested = self.columns + self.relations
+        else:
+            requested = [f.strip() for f in fields.split(",") if f.strip()]
+            unknown = sorted(set(requested) - set(self.columns) - set(self.relations))
+            if unknown:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Unknown fields: {', '.join(unknown)}. "
+                           f"Allowed: {', '.join(self.columns + self.relations)}",
+                )
+        # Keep the model's column order, then relations, with required keys first
+        names = self.always + [c for c in self.columns if c in requested and c not in self.always]
+        return names + [r for r in self.relations if r in requested]
+
+    def load_only(self, names: Iterable[str]):
+        return load_only(*[getattr(self.model, n) for n in names if n in self.columns])
+
+    def project(self, obj, names: Iterable[str], schema: Optional[Type[BaseModel]] = None, **extra) -> BaseModel:
+        """`obj`'s chosen columns (plus `extra`) as `schema`, defaulting to the FieldSet's."""
+        return (schema or self.schema)(**{n: getattr(obj, n) for n in names}, **extra)
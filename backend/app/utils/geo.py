@@ -0,0 +1,45 @@
+import math
+from typing import List, Tuple
+
+from sqlalchemy import case, func
+
+# Mean Earth radius (IUGG), and the length of one degree of latitude
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+# properties.lat_band is floor(location_lat * LAT_BANDS_PER_DEGREE): rows of ~1.1 km.
+# Changing it needs a migration that rewrites the generated column.
+LAT_BANDS_PER_DEGREE = 100
+
+
+def bounding_box(lat: float, lng: float, radius_km: float) -> Tuple[float, float, float, float]:
+    """(min_lat, min_lng, max_lat, max_lng) enclosing the circle around (lat, lng)."""
+    dlat = radius_km / KM_PER_DEGREE
+    min_lat, max_lat = max(lat - dlat, -90.0), min(lat + dlat, 90.0)
+    # Degrees of longitude shrink towards the poles; size the box for its widest edge
+    cos_lat = math.cos(math.radians(max(abs(min_lat), abs(max_lat))))
+    dlng = radius_km / (KM_PER_DEGREE * cos_lat) if cos_lat > 1e-9 else 180.0
+    if dlng >= 180.0 or lng - dlng < -180.0 or lng + dlng > 180.0:
+        # Around a pole or across the antimeridian: every longitude, still correct
+        return min_lat, -180.0, max_lat, 180.0
+    return min_lat, lng - dlng, max_lat, lng + dlng
+
+
+def lat_bands(min_lat: float, max_lat: float) -> List[int]:
+    """Every lat_band value a point between min_lat and max_lat can have."""
+    first = math.floor(min_lat * LAT_BANDS_PER_DEGREE)
+    last = math.floor(max_lat * LAT_BANDS_PER_DEGREE)
+    return list(range(first, last + 1))
+
+
+def distance_km(lat_column, lng_column, lat: float, lng: float):
+    """SQL great-circle (haversine) distance in km from (lat, lng) to the given columns."""
+    dlat = func.radians(lat_column - lat) / 2
+    dlng = func.radians(lng_column - lng) / 2
+    a = func.power(func.sin(dlat), 2) + (
+        math.cos(math.radians(lat)) * func.cos(func.radians(lat_column)) * func.power(func.sin(dlng), 2)
+    )
+    # Rounding can push a just past 1 for near-antipodal points, outside asin's domain;
+    # a CASE rather than least() because SQLite has no least()
+    a = case((a > 1.0, 1.0), else_=a)
+    return 2 * EARTH_RADIUS_KM * func.asin(func.sqrt(a))
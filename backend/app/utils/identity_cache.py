@@ -0,0 +1,76 @@
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from pydantic import BaseModel
+
+
+class UserSnapshot(BaseModel):
+    """Compact, read-only view of a User row used for auth and role checks."""
+    id: int
+    firebase_uid: str
+    role: str
+    name: Optional[str] = None
+    email: str
+    version: int = 1
+
+    class Config:
+        from_attributes = True
+        frozen = True
+
+
+class IdentityCache:
+    """
+    In-process LRU cache of firebase_uid -> UserSnapshot.
+
+    Writes that change a user (auth.register_user, auth.update_me) must call `put`
+    or `invalidate` so the cache never serves a stale role. The TTL bounds staleness
+    across workers, since each worker holds its own cache.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl_seconds: int = 60, clock: Callable[[], float] = time.time):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self._entries: "OrderedDict[str, tuple[UserSnapshot, float]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, uid: str) -> Optional[UserSnapshot]:
+        entry = self._entries.get(uid)
+        if entry is not None and self.clock() < entry[1]:
+            self._entries.move_to_end(uid)
+            self.hits += 1
+            return entry[0]
+        if entry is not None:
+            del self._entries[uid]
+        self.misses += 1
+        return None
+
+    def put(self, uid: str, snapshot: UserSnapshot) -> UserSnapshot:
+        if self.max_size <= 0:
+            return snapshot
+        self._entries[uid] = (snapshot, self.clock() + self.ttl_seconds)
+        self._entries.move_to_end(uid)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        return snapshot
+
+    def invalidate(self, uid: str) -> None:
+        self._entries.pop(uid, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            # Each authenticated request does at most one lookup, so the hit rate is
+            # also the average number of user queries saved per request.
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "db_queries_saved": self.hits,
+        }
@@ -0,0 +1,22 @@
+from typing import Any, Dict, List, Union
+
+from sqlalchemy import and_, func, select, type_coerce
+from sqlalchemy.dialects.postgresql import JSONB
+
+
+def json_contains(column, value: Union[List[Any], Dict[str, Any]], dialect: str):
+    """
+    `column @> value`: the column's array holds every element of a list `value`,
+    or its object has every key/value pair of a dict `value`. On Postgres this is
+    JSONB containment, answered from the column's GIN index. Other databases
+    (SQLite in local tests) check each element with json_each / json_extract.
+    """
+    if dialect == "postgresql":
+        return type_coerce(column, JSONB).contains(value)
+    if isinstance(value, dict):
+        return and_(*[func.json_extract(column, f"$.{key}") == item for key, item in value.items()])
+    clauses = []
+    for item in value:
+        elements = func.json_each(column).table_valued("value")
+        clauses.append(select(elements.c.value).where(elements.c.value == item).exists())
+    return and_(*clauses)
@@ -0,0 +1,203 @@
+import asyncio
+import json
+import re
+import time
+import urllib.request
+from typing import Callable, Dict, Optional, Tuple
+
+import jwt
+from cryptography.hazmat.primitives.serialization import load_pem_public_key
+from cryptography.x509 import load_pem_x509_certificate
+from firebase_admin import auth
+
+FIREBASE_PUBLIC_KEYS_URL = (
+    "https://www.googleapis.com/robot/v1/metadata/x509/securetoken@system.gserviceaccount.com"
+)
+
+# A key fetcher returns ({kid: PEM certificate or public key}, max_age_seconds)
+KeyFetcher = Callable[[], Tuple[Dict[str, str], int]]
+# A revocation source returns {uid: tokens_valid_after (epoch seconds)};
+# disabled accounts map to float("inf").
+RevocationSource = Callable[[], Dict[str, float]]
+
+
+def _load_public_key(pem: str):
+    if "BEGIN CERTIFICATE" in pem:
+        return load_pem_x509_certificate(pem.encode()).public_key()
+    return load_pem_public_key(pem.encode())
+
+
+def http_key_fetcher(url: str = FIREBASE_PUBLIC_KEYS_URL) -> KeyFetcher:
+    def fetch() -> Tuple[Dict[str, str], int]:
+        with urllib.request.urlopen(url, timeout=10) as resp:
+            keys = json.loads(resp.read())
+            cache_control = resp.headers.get("Cache-Control", "")
+        match = re.search(r"max-age=(\d+)", cache_control)
+        return keys, int(match.group(1)) if match else 3600
+    return fetch
+
+
+def firebase_revocation_source() -> Dict[str, float]:
+    revoked = {}
+    for user in auth.list_users().iterate_all():
+        if user.disabled:
+            revoked[user.uid] = float("inf")
+        elif user.tokens_valid_after_timestamp:
+            revoked[user.uid] = user.tokens_valid_after_timestamp / 1000
+    return revoked
+
+
+class PublicKeySet:
+    """
+    Firebase token signing keys, refreshed in the background according to the
+    Cache-Control max-age of the key endpoint.
+    """
+
+    def __init__(self, fetcher: KeyFetcher, min_refresh_seconds: int = 60, retry_seconds: int = 30):
+        self.fetcher = fetcher
+        self.min_refresh_seconds = min_refresh_seconds
+        self.retry_seconds = retry_seconds
+        self.keys: Dict[str, object] = {}
+        self.expires_at = 0.0
+        self.refreshed_at: Optional[float] = None
+        self._next_refresh = 0
+
+    async def refresh(self) -> int:
+        """Fetch the key set and return the number of seconds until the next refresh."""
+        raw, max_age = await asyncio.to_thread(self.fetcher)
+        self.keys = {kid: _load_public_key(pem) for kid, pem in raw.items()}
+        self.refreshed_at = time.time()
+        self.expires_at = self.refreshed_at + max_age
+        # Refresh a little before the keys expire
+        self._next_refresh = max(self.min_refresh_seconds, int(max_age * 0.9))
+        return self._next_refresh
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(self._next_refresh)
+            try:
+                await self.refresh()
+            except Exception as e:
+                print(f"Public key refresh failed: {e}")
+                self._next_refresh = self.retry_seconds
+
+    def get(self, kid: str):
+        return self.keys.get(kid)
+
+
+class RevokedUidSet:
+    """
+    Periodically synced map of uid -> tokens_valid_after, replacing the per-request
+    revocation call. A token is treated as revoked if it was issued before that time.
+    """
+
+    def __init__(self, source: RevocationSource, sync_seconds: int = 300):
+        self.source = source
+        self.sync_seconds = sync_seconds
+        self.valid_after: Dict[str, float] = {}
+        self.synced_at: Optional[float] = None
+
+    async def sync(self) -> None:
+        self.valid_after = await asyncio.to_thread(self.source)
+        self.synced_at = time.time()
+
+    async def run(self) -> None:
+        while True:
+            if self.synced_at is not None:
+                await asyncio.sleep(self.sync_seconds)
+            try:
+                await self.sync()
+            except Exception as e:
+                print(f"Revocation sync failed: {e}")
+                await asyncio.sleep(self.sync_seconds)
+
+    def is_revoked(self, uid: str, issued_at: float) -> bool:
+        valid_after = self.valid_after.get(uid)
+        return valid_after is not None and issued_at < valid_after
+
+
+class LocalTokenVerifier:
+    """
+    Verifies Firebase ID tokens offline: RS256 signature against the cached public
+    key set plus the standard Firebase claim checks. Raises the same
+    firebase_admin.auth errors as auth.verify_id_token so callers need not care
+    which mode is active.
+    """
+
+    def __init__(self, project_id: str, keys: PublicKeySet, revoked: RevokedUidSet, leeway: int = 0):
+        if not project_id:
+            # Without it the audience/issuer checks would reject every token
+            raise ValueError(
+                "Local token verification needs a Firebase project id "
+                "(FIREBASE_PROJECT_ID or project_id in FIREBASE_CREDENTIALS_JSON)"
+            )
+        self.project_id = project_id
+        self.keys = keys
+        self.revoked = revoked
+        self.leeway = leeway
+        self._tasks: list = []
+
+    def __call__(self, token: str, check_revoked: bool) -> dict:
+        try:
+            header = jwt.get_unverified_header(token)
+        except jwt.PyJWTError as e:
+            raise auth.InvalidIdTokenError(f"Malformed ID token: {e}")
+        if header.get("alg") != "RS256":
+            raise auth.InvalidIdTokenError("ID token has incorrect algorithm")
+        key = self.keys.get(header.get("kid"))
+        if key is None:
+            raise auth.InvalidIdTokenError("ID token has unknown key ID")
+
+        try:
+            claims = jwt.decode(
+                token,
+                key,
+                algorithms=["RS256"],
+                audience=self.project_id,
+                issuer=f"https://securetoken.google.com/{self.project_id}",
+                leeway=self.leeway,
+                options={"require": ["exp", "iat", "sub", "aud", "iss"]},
+            )
+        except jwt.ExpiredSignatureError as e:
+            raise auth.ExpiredIdTokenError("ID token has expired", e)
+        except jwt.PyJWTError as e:
+            raise auth.InvalidIdTokenError(f"Invalid ID token: {e}")
+
+        uid = claims.get("sub")
+        if not isinstance(uid, str) or not uid or len(uid) > 128:
+            raise auth.InvalidIdTokenError("ID token has invalid subject")
+        if claims.get("auth_time", 0) > time.time() + self.leeway:
+            raise auth.InvalidIdTokenError("ID token has future auth_time")
+        if check_revoked and self.revoked.is_revoked(uid, claims["iat"]):
+            raise auth.RevokedIdTokenError("ID token has been revoked")
+
+        claims["uid"] = uid
+        return claims
+
+    async def start(self) -> None:
+        # Load keys and revocations before serving so the first request can verify
+        for initial in (self.keys.refresh, self.revoked.sync):
+            try:
+                await initial()
+            except Exception as e:
+                print(f"Local verifier warm-up failed: {e}")
+        self._tasks = [
+            asyncio.create_task(self.keys.run()),
+            asyncio.create_task(self.revoked.run()),
+        ]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def stats(self) -> dict:
+        return {
+            "project_id": self.project_id,
+            "keys": len(self.keys.keys),
+            "keys_refreshed_at": self.keys.refreshed_at,
+            "keys_expire_at": self.keys.expires_at,
+            "revoked_uids": len(self.revoked.valid_after),
+            "revocations_synced_at": self.revoked.synced_at,
+        }
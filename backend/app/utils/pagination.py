@@ -0,0 +1,147 @@
+import base64
+import json
+from datetime import date, datetime
+from typing import Callable, Generic, List, Optional, Tuple, TypeVar, Union
+
+from fastapi import HTTPException, Query, Response
+from pydantic import BaseModel
+from sqlalchemy import and_, or_, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+
+# Set on compatibility-mode responses that were cut off, so legacy clients can notice
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None
+
+
+def paged(item):
+    """response_model for a paginate() endpoint: a Page, or the legacy bare list."""
+    return Union[Page[item], List[item]]
+
+
+class PageParams:
+    """
+    `?limit=&cursor=` query parameters. A request with neither gets the legacy
+    response shape (a bare list) for clients written before pagination existed.
+    """
+
+    def __init__(
+        self,
+        cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+        limit: Optional[int] = Query(None, ge=1, le=settings.PAGE_SIZE_MAX),
+    ):
+        self.cursor = cursor
+        self.limit = limit
+
+    @property
+    def legacy(self) -> bool:
+        return self.cursor is None and self.limit is None
+
+
+def encode_cursor(values: list) -> str:
+    raw = json.dumps([v.isoformat() if isinstance(v, (date, datetime)) else v for v in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: list) -> list:
+    try:
+        raw = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(raw, list) or len(raw) != len(columns):
+            raise ValueError("wrong shape")
+        values = []
+        for value, column in zip(raw, columns):
+            python_type = column.type.python_type
+            if python_type in (date, datetime) and value is not None:
+                value = python_type.fromisoformat(value)
+            values.append(value)
+        return values
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _after(order: List[Tuple[object, bool]], values: list):
+    """Rows strictly after `values` in the given (column, descending) ordering."""
+    directions = {descending for _, descending in order}
+    if len(directions) == 1:
+        # A single row comparison lets Postgres seek straight into the index
+        columns = tuple_(*[column for column, _ in order])
+        return columns < tuple_(*values) if directions.pop() else columns > tuple_(*values)
+    clauses = []
+    for i, (column, descending) in enumerate(order):
+        step = column < values[i] if descending else column > values[i]
+        clauses.append(and_(*[c == v for (c, _), v in zip(order[:i], values[:i])], step))
+    return or_(*clauses)
+
+
+async def paginate(
+    db: AsyncSession,
+    stmt,
+    order: List[Tuple[object, bool]],
+    params: PageParams,
+    response: Response,
+    serialize: Optional[Callable] = None,
+    compat: bool = True,
+    summary: Optional[dict] = None,
+):
+    """
+    Keyset-paginate an ORM `stmt` by `order`, a list of (column, descending) pairs
+    that must end in a unique column. Returns {"items", "next_cursor"}, or a bare
+    list in compatibility mode (capped at PAGINATION_COMPAT_LIMIT rows, if set).
+    `serialize`, if given, is applied to each item. Endpoints without pre-pagination
+    clients pass compat=False to always get the page shape.
+
+    `summary` maps names to single-value SELECTs (e.g. counts over the unpaged
+    filters). They ride along as uncorrelated scalar subqueries on the page query,
+    so Postgres evaluates each once and the page costs a single round trip; the
+    values are returned under "summary". Not available in compatibility mode.
+    """
+    legacy = compat and params.legacy
+    columns = [column for column, _ in order]
+    if params.cursor:
+        stmt = stmt.where(_after(order, decode_cursor(params.cursor, columns)))
+    stmt = stmt.order_by(*[column.desc() if descending else column.asc() for column, descending in order])
+
+    limit = params.limit or settings.PAGE_SIZE_DEFAULT
+    if legacy:
+        limit = settings.PAGINATION_COMPAT_LIMIT or None
+    if limit is not None:
+        # One extra row tells us whether there is a next page
+        stmt = stmt.limit(limit + 1)
+
+    summary = None if legacy else summary
+    if summary:
+        stmt = stmt.add_columns(*[
+            value.correlate(None).scalar_subquery().label(name) for name, value in summary.items()
+        ])
+    rows = (await db.execute(stmt)).all()
+    items = [row[0] for row in rows]
+    if summary:
+        if not rows:
+            # Nothing to ride along on; ask for the summary alone
+            rows = [(None, *(await db.execute(select(*[
+                value.scalar_subquery().label(name) for name, value in summary.items()
+            ]))).one())]
+        summary = dict(zip(summary, rows[0][1:]))
+    next_cursor = None
+    if limit is not None and len(items) > limit:
+        items = items[:limit]
+        next_cursor = encode_cursor([getattr(items[-1], column.key) for column in columns])
+
+    if serialize is not None:
+        items = [serialize(item) for item in items]
+
+    if legacy:
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
+        return items
+    page = {"items": items, "next_cursor": next_cursor}
+    if summary is not None:
+        page["summary"] = summary
+    return page
@@ -0,0 +1,138 @@
+import hashlib
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from sqlalchemy import event
+
+logger = logging.getLogger("app.db")
+
+_PARAM = re.compile(r"%\(\w+\)s|%s|\$\d+|\?|:\w+")
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACE = re.compile(r"\s+")
+_CAST = re.compile(r"::\w+")
+
+
+def normalize_sql(statement: str) -> str:
+    """Statement shape with literals, bind params and IN-lists collapsed to `?`."""
+    sql = _CAST.sub("", _SPACE.sub(" ", statement).strip())
+    sql = _LITERAL.sub("?", sql)
+    sql = _PARAM.sub("?", sql)
+    return _IN_LIST.sub("(?)", sql)
+
+
+def fingerprint(statement: str) -> str:
+    return hashlib.sha1(normalize_sql(statement).encode()).hexdigest()[:12]
+
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class RequestQueryStats:
+    """Statements issued while handling one request."""
+
+    def __init__(self, scope: Optional[dict] = None):
+        self.scope = scope or {}
+        self.count = 0
+        self.total_seconds = 0.0
+        self.shapes: Counter = Counter()
+        self.samples: Dict[str, str] = {}
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.total_seconds += seconds
+        fp = fingerprint(statement)
+        self.shapes[fp] += 1
+        self.samples.setdefault(fp, normalize_sql(statement)[:200])
+
+    @property
+    def route_name(self) -> str:
+        # The router stores the matched route in the (shared) ASGI scope. Requests
+        # that matched nothing (404s, scanners) share one key, so raw paths cannot
+        # grow the metrics without bound.
+        route = self.scope.get("route")
+        path = route.path if route else UNMATCHED_ROUTE
+        return f"{self.scope.get('method', '')} {path}".strip()
+
+
+current_request_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar("current_request_stats", default=None)
+
+
+class RouteQueryMetrics:
+    """Per-route aggregates of statements and DB time, plus budget checks."""
+
+    def __init__(self, query_budget: int = 15, repeat_threshold: int = 5):
+        self.query_budget = query_budget
+        self.repeat_threshold = repeat_threshold
+        self.routes: Dict[str, dict] = {}
+
+    def observe(self, route: str, stats: RequestQueryStats) -> None:
+        entry = self.routes.setdefault(route, {
+            "requests": 0, "queries": 0, "db_seconds": 0.0, "max_queries": 0,
+            "budget_exceeded": 0, "repeated_shapes": 0,
+        })
+        entry["requests"] += 1
+        entry["queries"] += stats.count
+        entry["db_seconds"] += stats.total_seconds
+        entry["max_queries"] = max(entry["max_queries"], stats.count)
+
+        if self.query_budget and stats.count > self.query_budget:
+            entry["budget_exceeded"] += 1
+            logger.warning(
+                "%s issued %d statements (budget %d): %s",
+                route, stats.count, self.query_budget, self._describe(stats, stats.shapes.most_common(5)),
+            )
+        repeated = [(fp, n) for fp, n in stats.shapes.items() if n >= self.repeat_threshold]
+        if self.repeat_threshold and repeated:
+            entry["repeated_shapes"] += 1
+            logger.warning(
+                "%s repeated the same statement shape (possible N+1): %s",
+                route, self._describe(stats, repeated),
+            )
+
+    @staticmethod
+    def _describe(stats: RequestQueryStats, shapes) -> str:
+        return "; ".join(f"[{fp} x{n}] {stats.samples[fp]}" for fp, n in shapes)
+
+    def stats(self) -> dict:
+        return {
+            "query_budget": self.query_budget,
+            "repeat_threshold": self.repeat_threshold,
+            "routes": {
+                route: {
+                    "requests": e["requests"],
+                    "avg_queries": round(e["queries"] / e["requests"], 2),
+                    "max_queries": e["max_queries"],
+                    "avg_db_ms": round(e["db_seconds"] / e["requests"] * 1000, 2),
+                    "budget_exceeded": e["budget_exceeded"],
+                    "repeated_shapes": e["repeated_shapes"],
+                }
+                for route, e in sorted(self.routes.items())
+            },
+        }
+
+
+def instrument_statements(sync_engine) -> None:
+    """Attribute every statement's count and duration to the current request, if any."""
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        stats = current_request_stats.get()
+        if stats is not None:
+            stats.record(statement, elapsed)
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _on_error(exception_context):
+        # after_cursor_execute never fires for a failed statement
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_start"):
+            conn.info["query_start"].pop()
@@ -0,0 +1,51 @@
+import hashlib
+import time
+from typing import Callable, Dict
+
+from fastapi import Request
+
+# Clients can force a read from the primary, e.g. right after a write made elsewhere
+READ_PRIMARY_HEADER = "X-Read-Primary"
+
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+
+def client_key(request: Request) -> str:
+    """Identifies the caller by a hash of their bearer token (no DB lookup needed)."""
+    authorization = request.headers.get("authorization", "")
+    return hashlib.sha256(authorization.encode()).hexdigest()
+
+
+class StickyWindow:
+    """
+    Remembers callers that recently wrote, so their reads go to the primary until
+    the replica has had time to catch up (read-your-writes).
+    """
+
+    def __init__(self, seconds: float = 5.0, max_size: int = 10000, clock: Callable[[], float] = time.time):
+        self.seconds = seconds
+        self.max_size = max_size
+        self.clock = clock
+        self._until: Dict[str, float] = {}
+
+    def mark(self, key: str) -> None:
+        if self.seconds <= 0:
+            return
+        now = self.clock()
+        if len(self._until) >= self.max_size:
+            self._until = {k: t for k, t in self._until.items() if t > now}
+        self._until[key] = now + self.seconds
+
+    def is_sticky(self, key: str) -> bool:
+        until = self._until.get(key)
+        if until is None:
+            return False
+        if until <= self.clock():
+            del self._until[key]
+            return False
+        return True
+
+    def should_use_primary(self, request: Request) -> bool:
+        if request.headers.get(READ_PRIMARY_HEADER, "").lower() in ("1", "true", "yes"):
+            return True
+        return self.is_sticky(client_key(request))
@@ -0,0 +1,188 @@
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+
+from fastapi.encoders import jsonable_encoder
+
+
+class MemoryBackend:
+    """In-process TTL LRU store. Each worker holds its own copy."""
+
+    def __init__(self, max_size: int = 5000, clock: Callable[[], float] = time.time):
+        self.max_size = max_size
+        self.clock = clock
+        self._entries: "OrderedDict[str, tuple[Any, float]]" = OrderedDict()
+        self._counters: Dict[str, int] = {}
+
+    async def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[1] <= self.clock():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    async def set(self, key: str, value: Any, ttl_seconds: float) -> None:
+        if self.max_size <= 0:
+            return
+        self._entries[key] = (value, self.clock() + ttl_seconds)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def get_counters(self, names: Iterable[str]) -> list:
+        return [self._counters.get(name, 0) for name in names]
+
+    async def incr(self, name: str) -> None:
+        self._counters[name] = self._counters.get(name, 0) + 1
+
+    async def clear(self) -> None:
+        self._entries.clear()
+        self._counters.clear()
+
+    async def close(self) -> None:
+        pass
+
+    def size(self) -> int:
+        return len(self._entries)
+
+
+class RedisBackend:
+    """
+    Shared store for multi-worker deployments, so an invalidation in one worker is
+    seen by all of them. Needs the optional `redis` package (redis>=4.2).
+    """
+
+    def __init__(self, url: str, prefix: str = "koko:rc:"):
+        try:
+            from redis import asyncio as aioredis
+        except ImportError:
+            raise RuntimeError("RESPONSE_CACHE_BACKEND=redis requires the 'redis' package")
+        self.prefix = prefix
+        self._redis = aioredis.from_url(url)
+
+    async def get(self, key: str) -> Optional[Any]:
+        raw = await self._redis.get(self.prefix + key)
+        return json.loads(raw) if raw is not None else None
+
+    async def set(self, key: str, value: Any, ttl_seconds: float) -> None:
+        await self._redis.set(self.prefix + key, json.dumps(value), px=int(ttl_seconds * 1000))
+
+    async def get_counters(self, names: Iterable[str]) -> list:
+        names = list(names)
+        values = await self._redis.mget([self.prefix + "v:" + name for name in names]) if names else []
+        return [int(v) if v is not None else 0 for v in values]
+
+    async def incr(self, name: str) -> None:
+        await self._redis.incr(self.prefix + "v:" + name)
+
+    async def clear(self) -> None:
+        async for key in self._redis.scan_iter(match=self.prefix + "*"):
+            await self._redis.delete(key)
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+    def size(self) -> Optional[int]:
+        return None
+
+
+class ResponseCache:
+    """
+    TTL cache for read-heavy endpoint responses, keyed by (endpoint, user, ...).
+
+    Every entry is tagged (e.g. "property:12", "owner:3"). Invalidating a tag bumps
+    its version counter; the versions of an entry's tags are part of its storage key,
+    so older entries simply stop being addressed and age out. This works the same on
+    a shared backend without scanning for keys.
+
+    Concurrent misses for the same key share one computation (single-flight), per
+    process.
+    """
+
+    def __init__(self, backend, ttl_seconds: float = 30):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.invalidations = 0
+
+    async def _storage_key(self, key: tuple, tags: list) -> str:
+        versions = await self.backend.get_counters(tags)
+        tagged = ",".join(f"{tag}@{version}" for tag, version in zip(tags, versions))
+        return ":".join(str(part) for part in key) + "|" + tagged
+
+    async def get_or_compute(self, key: tuple, tags: list, compute: Callable[[], Awaitable[Any]]) -> Any:
+        if self.ttl_seconds <= 0:
+            return jsonable_encoder(await compute())
+
+        storage_key = await self._storage_key(key, tags)
+        cached = await self.backend.get(storage_key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        inflight = self._inflight.get(storage_key)
+        if inflight is not None:
+            self.coalesced += 1
+            return await asyncio.shield(inflight)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[storage_key] = future
+        try:
+            # Stored as plain JSON types so every backend returns the same shape
+            value = jsonable_encoder(await compute())
+            await self.backend.set(storage_key, value, self.ttl_seconds)
+            future.set_result(value)
+            return value
+        except Exception as e:
+            future.set_exception(e)
+            # Waiters re-raise it; mark it retrieved so an unshared failure isn't logged
+            future.exception()
+            raise
+        except BaseException:
+            future.cancel()
+            raise
+        finally:
+            del self._inflight[storage_key]
+
+    async def invalidate(self, *tags: str) -> None:
+        for tag in tags:
+            await self.backend.incr(tag)
+        self.invalidations += len(tags)
+
+    async def clear(self) -> None:
+        await self.backend.clear()
+
+    async def close(self) -> None:
+        await self.backend.close()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "backend": type(self.backend).__name__,
+            "ttl_seconds": self.ttl_seconds,
+            "size": self.backend.size(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "invalidations": self.invalidations,
+            "hit_rate": round((self.hits + self.coalesced) / lookups, 4) if lookups else 0.0,
+        }
+
+
+def analytics_tags(property_id: Optional[int] = None, owner_id: Optional[int] = None) -> list:
+    """Tags used by the dashboard endpoints; writes invalidate the same tags."""
+    tags = []
+    if property_id is not None:
+        tags.append(f"property:{property_id}")
+    if owner_id is not None:
+        tags.append(f"owner:{owner_id}")
+    return tags
@@ -0,0 +1,265 @@
+from datetime import date
+from typing import Optional
+
+from sqlalchemy import select, update, text, func, cast, literal, literal_column, union_all, Date
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Property, Unit
+from app.models.rollups import PropertyRollup, OwnerRollup, RevenueRollup, PaymentMonthlyRollup
+
+# Unit.status -> rollup counter column
+STATUS_COLUMNS = {
+    "OCCUPIED": "units_occupied",
+    "VACANT": "units_vacant",
+    "UNDER_MAINTENANCE": "units_under_maintenance",
+}
+
+
+def _insert(db: AsyncSession, table):
+    # ON CONFLICT support lives in the dialect-specific insert constructs
+    dialect = db.get_bind().dialect.name
+    return (postgresql if dialect == "postgresql" else sqlite).insert(table)
+
+
+async def _bump(db: AsyncSession, property_id: int, owner_id: int, **deltas) -> None:
+    """Atomically add `deltas` to the property's and the owner's counters."""
+    deltas = {k: v for k, v in deltas.items() if v}
+    if not deltas:
+        return
+    for model, key, value in (
+        (PropertyRollup, PropertyRollup.property_id, property_id),
+        (OwnerRollup, OwnerRollup.owner_id, owner_id),
+    ):
+        await db.execute(
+            update(model)
+            .where(key == value)
+            .values({col: getattr(model, col) + delta for col, delta in deltas.items()})
+        )
+
+
+def add_months(month: date, n: int) -> date:
+    index = month.year * 12 + month.month - 1 + n
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def bucket_start(day: date, step_months: int) -> date:
+    """First month of the `step_months`-wide bucket (month, quarter, year) containing `day`."""
+    return date(day.year, (day.month - 1) // step_months * step_months + 1, 1)
+
+
+def month_series(first: date, count: int, dialect: str, step_months: int = 1):
+    """
+    CTE with one row per bucket (`month` = first day, `next_month` = first day of the
+    next bucket), so joins against the rollups fill empty buckets server-side.
+    generate_series on Postgres; a VALUES-style union elsewhere.
+    """
+    if dialect == "postgresql":
+        step = literal_column(f"interval '{step_months} month'")
+        series = func.generate_series(first, add_months(first, (count - 1) * step_months), step).column_valued("month")
+        return select(
+            cast(series, Date).label("month"),
+            cast(series + step, Date).label("next_month"),
+        ).cte("months")
+    return union_all(*[
+        select(
+            literal(add_months(first, i * step_months), Date).label("month"),
+            literal(add_months(first, (i + 1) * step_months), Date).label("next_month"),
+        )
+        for i in range(count)
+    ]).cte("months")
+
+
+async def property_owner(db: AsyncSession, property_id: int) -> int:
+    return (await db.execute(select(Property.owner_id).where(Property.id == property_id))).scalar_one()
+
+
+async def unit_location(db: AsyncSession, unit_id: int) -> tuple:
+    """(property_id, owner_id) of a unit."""
+    row = (await db.execute(
+        select(Unit.property_id, Property.owner_id)
+        .join(Property, Unit.property_id == Property.id)
+        .where(Unit.id == unit_id)
+    )).one()
+    return row.property_id, row.owner_id
+
+
+async def on_property_created(db: AsyncSession, property_id: int, owner_id: int) -> None:
+    await db.execute(
+        _insert(db, OwnerRollup.__table__)
+        .values(owner_id=owner_id, properties_count=0, units_total=0, units_occupied=0, units_vacant=0,
+                units_under_maintenance=0, active_tenancies=0, projected_rent=0.0)
+        .on_conflict_do_nothing(index_elements=["owner_id"])
+    )
+    await db.execute(
+        _insert(db, PropertyRollup.__table__)
+        .values(property_id=property_id, owner_id=owner_id, units_total=0, units_occupied=0, units_vacant=0,
+                units_under_maintenance=0, active_tenancies=0, projected_rent=0.0)
+    )
+    await db.execute(
+        update(OwnerRollup)
+        .where(OwnerRollup.owner_id == owner_id)
+        .values(properties_count=OwnerRollup.properties_count + 1)
+    )
+
+
+async def on_unit_created(db: AsyncSession, property_id: int, owner_id: int, status: str) -> None:
+    deltas = {"units_total": 1}
+    if status in STATUS_COLUMNS:
+        deltas[STATUS_COLUMNS[status]] = 1
+    await _bump(db, property_id, owner_id, **deltas)
+
+
+async def on_unit_status_changed(db: AsyncSession, property_id: int, owner_id: int, old: Optional[str], new: str) -> None:
+    if old == new:
+        return
+    deltas = {}
+    if old in STATUS_COLUMNS:
+        deltas[STATUS_COLUMNS[old]] = -1
+    if new in STATUS_COLUMNS:
+        deltas[STATUS_COLUMNS[new]] = 1
+    await _bump(db, property_id, owner_id, **deltas)
+
+
+async def on_tenancy_activated(db: AsyncSession, property_id: int, owner_id: int, rent_amount: Optional[float]) -> None:
+    await _bump(db, property_id, owner_id, active_tenancies=1, projected_rent=rent_amount or 0.0)
+
+
+async def on_tenancy_deactivated(db: AsyncSession, property_id: int, owner_id: int, rent_amount: Optional[float]) -> None:
+    await _bump(db, property_id, owner_id, active_tenancies=-1, projected_rent=-(rent_amount or 0.0))
+
+
+async def on_payment_recorded(
+    db: AsyncSession, property_id: int, owner_id: int, unit_id: int, amount: float, payment_type: str, payment_date: date
+) -> None:
+    month = payment_date.replace(day=1)
+    is_rent = payment_type == "RENT"
+    stmt = _insert(db, RevenueRollup.__table__).values(
+        property_id=property_id, month=month, owner_id=owner_id,
+        rent_total=amount if is_rent else 0.0,
+        other_total=0.0 if is_rent else amount,
+        payment_count=1,
+    )
+    await db.execute(stmt.on_conflict_do_update(
+        index_elements=["property_id", "month"],
+        set_={
+            "rent_total": RevenueRollup.__table__.c.rent_total + stmt.excluded.rent_total,
+            "other_total": RevenueRollup.__table__.c.other_total + stmt.excluded.other_total,
+            "payment_count": RevenueRollup.__table__.c.payment_count + 1,
+        },
+    ))
+    detail = _insert(db, PaymentMonthlyRollup.__table__).values(
+        unit_id=unit_id, payment_type=payment_type, month=month,
+        property_id=property_id, owner_id=owner_id, total=amount, count=1,
+    )
+    await db.execute(detail.on_conflict_do_update(
+        index_elements=["unit_id", "payment_type", "month"],
+        set_={
+            "total": PaymentMonthlyRollup.__table__.c.total + detail.excluded.total,
+            "count": PaymentMonthlyRollup.__table__.c.count + 1,
+        },
+    ))
+
+
+# Full recomputation from the raw tables. Each SELECT yields rows in the rollup's
+# column order, so the same statements serve both rebuild and verify.
+ROLLUP_SOURCES = {
+    "property_rollups": """
+        SELECT p.id AS property_id, p.owner_id,
+               COUNT(u.id) AS units_total,
+               COUNT(u.id) FILTER (WHERE u.status = 'OCCUPIED') AS units_occupied,
+               COUNT(u.id) FILTER (WHERE u.status = 'VACANT') AS units_vacant,
+               COUNT(u.id) FILTER (WHERE u.status = 'UNDER_MAINTENANCE') AS units_under_maintenance,
+               COALESCE(MAX(t.active_tenancies), 0) AS active_tenancies,
+               COALESCE(MAX(t.projected_rent), 0) AS projected_rent
+        FROM properties p
+        LEFT JOIN units u ON u.property_id = p.id
+        LEFT JOIN (
+            SELECT u2.property_id, COUNT(*) AS active_tenancies, COALESCE(SUM(t2.rent_amount), 0) AS projected_rent
+            FROM tenancies t2 JOIN units u2 ON u2.id = t2.unit_id
+            WHERE t2.status = 'ACTIVE'
+            GROUP BY u2.property_id
+        ) t ON t.property_id = p.id
+        GROUP BY p.id, p.owner_id
+    """,
+    "owner_rollups": """
+        SELECT pr.owner_id,
+               COUNT(*) AS properties_count,
+               SUM(pr.units_total) AS units_total,
+               SUM(pr.units_occupied) AS units_occupied,
+               SUM(pr.units_vacant) AS units_vacant,
+               SUM(pr.units_under_maintenance) AS units_under_maintenance,
+               SUM(pr.active_tenancies) AS active_tenancies,
+               SUM(pr.projected_rent) AS projected_rent
+        FROM ({property_rollups}) pr
+        GROUP BY pr.owner_id
+    """,
+    "revenue_rollups": """
+        SELECT u.property_id,
+               CAST(date_trunc('month', pay.payment_date) AS DATE) AS month,
+               p.owner_id,
+               COALESCE(SUM(pay.amount) FILTER (WHERE pay.payment_type = 'RENT'), 0) AS rent_total,
+               COALESCE(SUM(pay.amount) FILTER (WHERE pay.payment_type <> 'RENT'), 0) AS other_total,
+               COUNT(*) AS payment_count
+        FROM payments pay
+        LEFT JOIN tenancies t ON t.id = pay.tenancy_id
+        JOIN units u ON u.id = COALESCE(t.unit_id, pay.unit_id)
+        JOIN properties p ON p.id = u.property_id
+        GROUP BY u.property_id, CAST(date_trunc('month', pay.payment_date) AS DATE), p.owner_id
+    """,
+    "payment_monthly_rollups": """
+        SELECT u.id AS unit_id,
+               pay.payment_type,
+               CAST(date_trunc('month', pay.payment_date) AS DATE) AS month,
+               u.property_id,
+               p.owner_id,
+               SUM(pay.amount) AS total,
+               COUNT(*) AS count
+        FROM payments pay
+        LEFT JOIN tenancies t ON t.id = pay.tenancy_id
+        JOIN units u ON u.id = COALESCE(t.unit_id, pay.unit_id)
+        JOIN properties p ON p.id = u.property_id
+        GROUP BY u.id, pay.payment_type, CAST(date_trunc('month', pay.payment_date) AS DATE), u.property_id, p.owner_id
+    """,
+}
+ROLLUP_SOURCES["owner_rollups"] = ROLLUP_SOURCES["owner_rollups"].format(
+    property_rollups=ROLLUP_SOURCES["property_rollups"]
+)
+ROLLUP_KEYS = {
+    "property_rollups": ("property_id",),
+    "owner_rollups": ("owner_id",),
+    "revenue_rollups": ("property_id", "month"),
+    "payment_monthly_rollups": ("unit_id", "payment_type", "month"),
+}
+
+
+async def rebuild_rollups(conn) -> dict:
+    """Replace every rollup row with values recomputed from the raw tables (Postgres)."""
+    counts = {}
+    for table, source in ROLLUP_SOURCES.items():
+        await conn.execute(text(f"DELETE FROM {table}"))
+        result = await conn.execute(text(f"INSERT INTO {table} {source}"))
+        counts[table] = result.rowcount
+    return counts
+
+
+async def verify_rollups(conn, tolerance: float = 0.01) -> list:
+    """Return a list of human-readable mismatches between stored and recomputed rollups."""
+    problems = []
+    for table, source in ROLLUP_SOURCES.items():
+        keys = ROLLUP_KEYS[table]
+        expected = {tuple(r[k] for k in keys): r for r in (await conn.execute(text(source))).mappings()}
+        stored = {tuple(r[k] for k in keys): r for r in (await conn.execute(text(f"SELECT * FROM {table}"))).mappings()}
+        for key in expected.keys() - stored.keys():
+            problems.append(f"{table} {key}: missing")
+        for key in stored.keys() - expected.keys():
+            problems.append(f"{table} {key}: unexpected row")
+        for key in expected.keys() & stored.keys():
+            for column, value in expected[key].items():
+                actual = stored[key][column]
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    if abs((actual or 0) - (value or 0)) > tolerance:
+                        problems.append(f"{table} {key}: {column} is {actual}, expected {value}")
+                elif actual != value:
+                    problems.append(f"{table} {key}: {column} is {actual}, expected {value}")
+    return problems
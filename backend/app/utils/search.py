@@ -0,0 +1,62 @@
+import difflib
+import re
+from typing import Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Query words; everything else (punctuation, tsquery operators) is dropped
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# Fallback scoring: minimum difflib ratio for a word to count as a typo match
+FUZZY_MIN_RATIO = 0.75
+
+_extensions: Dict[str, bool] = {}
+
+
+def tokenize(q: str) -> List[str]:
+    return [t.lower() for t in TOKEN_RE.findall(q or "")]
+
+
+def prefix_tsquery(tokens: List[str]) -> str:
+    """to_tsquery text matching every token, the last one as a prefix (type-ahead)."""
+    terms = [f"{t}:*" if i == len(tokens) - 1 else t for i, t in enumerate(tokens)]
+    return " & ".join(terms)
+
+
+async def has_extension(db: AsyncSession, name: str) -> bool:
+    """Whether a Postgres extension is installed, looked up once per database."""
+    key = f"{db.bind.url.render_as_string(hide_password=True)}:{name}"
+    if key not in _extensions:
+        _extensions[key] = bool((await db.execute(
+            text("SELECT 1 FROM pg_extension WHERE extname = :name"), {"name": name}
+        )).scalar())
+    return _extensions[key]
+
+
+def _word_score(token: str, words: List[str]) -> float:
+    best = 0.0
+    for word in words:
+        if word.startswith(token):
+            return 1.0
+        ratio = difflib.SequenceMatcher(None, token, word).ratio()
+        if ratio >= FUZZY_MIN_RATIO:
+            # Typo matches rank below exact and prefix ones
+            best = max(best, ratio * 0.8)
+    return best
+
+
+def score_document(tokens: List[str], fields: Dict[float, Optional[str]]) -> float:
+    """
+    In-memory stand-in for the Postgres ranking, used on other databases (local
+    tests). `fields` maps a weight to the text it applies to. Every token must match
+    some field, exactly, as a prefix or within FUZZY_MIN_RATIO; 0.0 means no match.
+    """
+    words = {weight: tokenize(value) for weight, value in fields.items() if value}
+    score = 0.0
+    for token in tokens:
+        token_score = max((weight * _word_score(token, w) for weight, w in words.items()), default=0.0)
+        if token_score == 0.0:
+            return 0.0
+        score += token_score
+    return score
@@ -0,0 +1,166 @@
+import asyncio
+import itertools
+import json
+import logging
+import random
+import re
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.utils.query_stats import current_request_stats, fingerprint, normalize_sql
+
+logger = logging.getLogger("app.db")
+
+# Statements EXPLAIN accepts (DDL and utility commands have no plan)
+EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE", "MERGE", "VALUES")
+
+# Row-locking clauses: EXPLAIN ANALYZE of such a SELECT would take the locks
+_LOCKING_CLAUSE = re.compile(r"\bFOR\s+(NO\s+KEY\s+UPDATE|UPDATE|KEY\s+SHARE|SHARE)\b", re.IGNORECASE)
+
+
+def can_analyze(statement: str) -> bool:
+    """
+    Whether EXPLAIN ANALYZE, which executes the statement, is safe: only plain
+    SELECTs without locking clauses. A WITH may hide a data-modifying CTE.
+    """
+    return statement.lstrip().upper().startswith("SELECT") and not _LOCKING_CLAUSE.search(statement)
+
+
+def parameter_types(parameters) -> object:
+    # Only types are kept; values may contain personal data
+    if isinstance(parameters, dict):
+        return {k: type(v).__name__ for k, v in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(v).__name__ for v in parameters]
+    return None
+
+
+class SlowQueryLog:
+    """
+    Bounded ring buffer of statements slower than `threshold_ms`. For a sample of
+    slow statements a plan is captured in the background on a separate connection
+    and attached to the entry: EXPLAIN (ANALYZE, BUFFERS) for plain SELECTs, a plain
+    EXPLAIN (never executed) for everything else.
+    """
+
+    def __init__(
+        self,
+        threshold_ms: float = 500,
+        explain_sample_rate: float = 0.1,
+        max_entries: int = 200,
+        explain_cooldown_seconds: float = 300,
+        max_concurrent_explains: int = 2,
+        max_tracked_shapes: int = 1000,
+    ):
+        self.threshold_ms = threshold_ms
+        self.explain_sample_rate = explain_sample_rate
+        self.explain_cooldown_seconds = explain_cooldown_seconds
+        self.max_concurrent_explains = max_concurrent_explains
+        self.max_tracked_shapes = max_tracked_shapes
+        self.entries: deque = deque(maxlen=max_entries)
+        self._ids = itertools.count(1)
+        # fingerprint -> last EXPLAIN time, oldest first; pruned in _mark_explained
+        self._explained_at: Dict[str, float] = {}
+        self._explains_running = 0
+        # The loop only holds tasks weakly; keep pending EXPLAINs alive until done
+        self._tasks: set = set()
+
+    def instrument(self, async_engine: AsyncEngine) -> None:
+        can_explain = async_engine.dialect.name == "postgresql"
+
+        @event.listens_for(async_engine.sync_engine, "before_cursor_execute")
+        def _before(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault("slow_query_start", []).append(time.perf_counter())
+
+        @event.listens_for(async_engine.sync_engine, "after_cursor_execute")
+        def _after(conn, cursor, statement, parameters, context, executemany):
+            elapsed_ms = (time.perf_counter() - conn.info["slow_query_start"].pop()) * 1000
+            if elapsed_ms < self.threshold_ms or statement.lstrip().upper().startswith("EXPLAIN"):
+                return
+            entry = self.record(statement, parameters, elapsed_ms)
+            explainable = statement.lstrip().upper().startswith(EXPLAINABLE)
+            if can_explain and explainable and not executemany and self._should_explain(entry["fingerprint"]):
+                task = asyncio.get_running_loop().create_task(self._explain(async_engine, entry, statement, parameters))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+
+        @event.listens_for(async_engine.sync_engine, "handle_error")
+        def _on_error(exception_context):
+            conn = exception_context.connection
+            if conn is not None and conn.info.get("slow_query_start"):
+                conn.info["slow_query_start"].pop()
+
+    def record(self, statement: str, parameters, elapsed_ms: float) -> dict:
+        stats = current_request_stats.get()
+        entry = {
+            "id": next(self._ids),
+            "recorded_at": datetime.now(timezone.utc).isoformat(),
+            "route": stats.route_name if stats else None,
+            "duration_ms": round(elapsed_ms, 2),
+            "fingerprint": fingerprint(statement),
+            "sql": normalize_sql(statement),
+            "parameter_types": parameter_types(parameters),
+            "plan": None,
+        }
+        self.entries.append(entry)
+        logger.warning("Slow query (%.0f ms) on %s: %s", elapsed_ms, entry["route"], entry["sql"][:300])
+        return entry
+
+    def _should_explain(self, fp: str) -> bool:
+        if self._explains_running >= self.max_concurrent_explains:
+            return False
+        if time.time() - self._explained_at.get(fp, 0) < self.explain_cooldown_seconds:
+            return False
+        return random.random() < self.explain_sample_rate
+
+    def _mark_explained(self, fp: str) -> None:
+        now = time.time()
+        self._explained_at.pop(fp, None)
+        self._explained_at[fp] = now
+        # Entries past the cooldown no longer matter; also cap distinct shapes
+        for old_fp, at in list(self._explained_at.items()):
+            if now - at < self.explain_cooldown_seconds and len(self._explained_at) <= self.max_tracked_shapes:
+                break
+            del self._explained_at[old_fp]
+
+    async def _explain(self, async_engine: AsyncEngine, entry: dict, statement: str, parameters) -> None:
+        # Not part of the request that triggered it
+        current_request_stats.set(None)
+        self._explains_running += 1
+        self._mark_explained(entry["fingerprint"])
+        analyze = can_analyze(statement)
+        options = "ANALYZE, BUFFERS, FORMAT JSON" if analyze else "FORMAT JSON"
+        try:
+            async with async_engine.connect() as conn:
+                result = await conn.exec_driver_sql(f"EXPLAIN ({options}) " + statement, parameters)
+                plan = result.scalar()
+                await conn.rollback()
+            entry["plan"] = json.loads(plan) if isinstance(plan, str) else plan
+            entry["plan_analyzed"] = analyze
+        except Exception as e:
+            entry["plan"] = {"error": str(e)}
+        finally:
+            self._explains_running -= 1
+
+    def list(self, limit: int = 50, with_plans: Optional[bool] = None) -> list:
+        entries = list(reversed(self.entries))
+        if with_plans is not None:
+            entries = [e for e in entries if (e["plan"] is not None) == with_plans]
+        return entries[:limit]
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            "threshold_ms": self.threshold_ms,
+            "explain_sample_rate": self.explain_sample_rate,
+            "tracked_shapes": len(self._explained_at),
+            "entries": len(self.entries),
+            "max_entries": self.entries.maxlen,
+        }
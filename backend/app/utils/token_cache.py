@@ -0,0 +1,216 @@
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+from firebase_admin import auth
+
+# A verifier takes (token, check_revoked) and returns the decoded claims,
+# raising the firebase_admin.auth errors on failure.
+TokenVerifier = Callable[[str, bool], dict]
+
+
+def firebase_verifier(token: str, check_revoked: bool) -> dict:
+    return auth.verify_id_token(token, check_revoked=check_revoked)
+
+
+class TokenCache:
+    """
+    Bounded LRU cache of verified Firebase ID tokens.
+
+    Entries are keyed by a SHA-256 of the raw token (the token itself is never stored)
+    and never outlive the token's own `exp` claim. Revocation is re-checked against the
+    backend once an entry is older than `revocation_recheck_seconds`.
+    """
+
+    def __init__(
+        self,
+        verifier: TokenVerifier = firebase_verifier,
+        max_size: int = 10000,
+        ttl_seconds: int = 300,
+        revocation_recheck_seconds: int = 60,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.verifier = verifier
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.revocation_recheck_seconds = revocation_recheck_seconds
+        self.clock = clock
+        # key -> (claims, expires_at, checked_at)
+        self._entries: "OrderedDict[str, tuple[dict, float, float]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.rechecks = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token: str) -> Optional[dict]:
+        """Return cached claims if still fresh, otherwise None."""
+        key = self._key(token)
+        entry = self._entries.get(key)
+        now = self.clock()
+        if entry is None:
+            return None
+        claims, expires_at, checked_at = entry
+        if now >= expires_at:
+            del self._entries[key]
+            return None
+        if now - checked_at >= self.revocation_recheck_seconds:
+            # Stale revocation status; force a round trip to the backend
+            return None
+        self._entries.move_to_end(key)
+        return claims
+
+    def put(self, token: str, claims: dict) -> None:
+        now = self.clock()
+        expires_at = now + self.ttl_seconds
+        exp = claims.get("exp")
+        if exp is not None:
+            expires_at = min(expires_at, float(exp))
+        if expires_at <= now or self.max_size <= 0:
+            return
+        key = self._key(token)
+        self._entries[key] = (claims, expires_at, now)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, token: str) -> None:
+        self._entries.pop(self._key(token), None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def _lookup(self, token: str) -> Optional[dict]:
+        claims = self.get(token)
+        if claims is not None:
+            self.hits += 1
+        elif self._key(token) in self._entries:
+            self.rechecks += 1
+        else:
+            self.misses += 1
+        return claims
+
+    def verify(self, token: str) -> dict:
+        """
+        Return verified claims for `token`, consulting the backend only on a miss
+        or when the entry is due for a revocation re-check.
+        """
+        claims = self._lookup(token)
+        if claims is not None:
+            return claims
+        try:
+            claims = self.verifier(token, True)
+        except Exception:
+            self.invalidate(token)
+            raise
+        self.put(token, claims)
+        return claims
+
+    async def verify_async(self, token: str, pool: Optional["VerificationPool"]) -> dict:
+        """
+        Same as `verify`, but backend calls run on `pool` instead of the event loop.
+        Pass pool=None for verifiers that do not block (e.g. local signature checks).
+        """
+        claims = self._lookup(token)
+        if claims is not None:
+            return claims
+        try:
+            if pool is None:
+                claims = self.verifier(token, True)
+            else:
+                claims = await pool.run(self.verifier, token, True)
+        except Exception:
+            self.invalidate(token)
+            raise
+        self.put(token, claims)
+        return claims
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses + self.rechecks
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "revocation_rechecks": self.rechecks,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class VerificationPool:
+    """
+    Runs blocking verifier calls on a dedicated thread pool so a slow Firebase
+    round trip never stalls the event loop. Concurrency is capped separately from
+    the worker count so queued requests wait on the loop rather than in the pool.
+    """
+
+    def __init__(self, max_workers: int = 8, max_concurrency: int = 32, timeout_seconds: float = 5.0):
+        self.max_workers = max_workers
+        self.max_concurrency = max_concurrency
+        self.timeout_seconds = timeout_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="token-verify")
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._latencies: deque = deque(maxlen=1000)
+        self.calls = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    async def run(self, fn: Callable, *args):
+        loop = asyncio.get_running_loop()
+        async with self._semaphore:
+            self.in_flight += 1
+            started = time.perf_counter()
+            try:
+                return await asyncio.wait_for(
+                    loop.run_in_executor(self._executor, fn, *args),
+                    timeout=self.timeout_seconds,
+                )
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                raise
+            except Exception:
+                self.errors += 1
+                raise
+            finally:
+                elapsed = time.perf_counter() - started
+                self.in_flight -= 1
+                self.calls += 1
+                self.total_seconds += elapsed
+                self.max_seconds = max(self.max_seconds, elapsed)
+                self._latencies.append(elapsed)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict:
+        samples = sorted(self._latencies)
+
+        def percentile(p: float) -> float:
+            if not samples:
+                return 0.0
+            return round(samples[min(len(samples) - 1, int(p * len(samples)))] * 1000, 2)
+
+        return {
+            "max_workers": self.max_workers,
+            "max_concurrency": self.max_concurrency,
+            "timeout_seconds": self.timeout_seconds,
+            "calls": self.calls,
+            "in_flight": self.in_flight,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "avg_ms": round(self.total_seconds / self.calls * 1000, 2) if self.calls else 0.0,
+            "p50_ms": percentile(0.50),
+            "p95_ms": percentile(0.95),
+            "max_ms": round(self.max_seconds * 1000, 2),
+        }
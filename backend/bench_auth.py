@@ -0,0 +1,74 @@
+"""
+Event-loop lag benchmark for ID token verification.
+
+Runs a burst of concurrent verifications against a slow stub verifier, once by
+calling it directly on the loop (the old behaviour) and once through the
+VerificationPool, while a ticker coroutine measures how late the loop wakes up.
+
+    python bench_auth.py [--requests 50] [--delay 0.05]
+"""
+import argparse
+import asyncio
+import time
+
+from app.utils.token_cache import TokenCache, VerificationPool
+
+
+def make_slow_verifier(delay: float):
+    def verifier(token: str, check_revoked: bool) -> dict:
+        time.sleep(delay)  # Simulates the blocking Firebase round trip
+        return {"uid": token, "exp": time.time() + 3600}
+    return verifier
+
+
+async def measure_lag(stop: asyncio.Event, interval: float = 0.005) -> list:
+    lags = []
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - started - interval)
+    return lags
+
+
+async def run(label: str, verify, requests: int):
+    stop = asyncio.Event()
+    ticker = asyncio.create_task(measure_lag(stop))
+    await asyncio.sleep(0)
+    started = time.perf_counter()
+    await asyncio.gather(*(verify(f"token-{i}") for i in range(requests)))
+    wall = time.perf_counter() - started
+    stop.set()
+    lags = sorted(await ticker) or [0.0]
+    print(
+        f"{label:<12} wall={wall * 1000:8.1f}ms  "
+        f"loop lag p50={lags[len(lags) // 2] * 1000:7.1f}ms  max={lags[-1] * 1000:7.1f}ms"
+    )
+
+
+async def main(requests: int, delay: float):
+    verifier = make_slow_verifier(delay)
+
+    # max_size=0 disables caching so every call reaches the stub
+    blocking_cache = TokenCache(verifier=verifier, max_size=0)
+
+    async def blocking(token):
+        return blocking_cache.verify(token)
+
+    pool = VerificationPool(max_workers=16, max_concurrency=64)
+    pooled_cache = TokenCache(verifier=verifier, max_size=0)
+
+    async def pooled(token):
+        return await pooled_cache.verify_async(token, pool)
+
+    await run("on-loop", blocking, requests)
+    await run("thread-pool", pooled, requests)
+    print(f"pool stats: {pool.stats()}")
+    pool.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--delay", type=float, default=0.05)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.delay))
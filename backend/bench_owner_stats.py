@@ -0,0 +1,137 @@
+"""
+Latency benchmark for GET /owner/stats: the previous five sequential aggregates
+versus the single rollup-backed statement in app/routers/owner.py.
+
+Seeds one large owner into a *throwaway* Postgres database (TRUNCATEs every table),
+then times both versions against it.
+
+    DATABASE_URL=postgresql://localhost/koko_bench alembic upgrade head
+    DATABASE_URL=postgresql://localhost/koko_bench python bench_owner_stats.py --yes [--units 5000] [--months 60]
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import os
+import time
+from datetime import date, timedelta
+
+sys.path.append(os.getcwd())
+
+from sqlalchemy import select, func, and_, text
+
+from app.database import engine
+from app.models import Property, Tenancy, Payment, Unit
+from app.routers.owner import owner_stats_query
+from app.utils.rollups import rebuild_rollups
+
+SEED_SQL = """
+TRUNCATE maintenance_comments, maintenance_requests, payments, tenancies, units, properties, users RESTART IDENTITY CASCADE;
+INSERT INTO users (firebase_uid, email, role, name) VALUES ('owner-bench', 'bench@example.com', 'OWNER', 'Bench Owner');
+-- A second owner with the same volume, so the benchmarked owner is not the whole table
+INSERT INTO users (firebase_uid, email, role, name) VALUES ('owner-other', 'other@example.com', 'OWNER', 'Other Owner');
+INSERT INTO properties (owner_id, name, address, units_count)
+SELECT 1 + (g % 2), 'Property ' || g, g || ' Main Street', 50 FROM generate_series(1, :units * 2 / 50) g;
+INSERT INTO units (property_id, unit_number, status)
+SELECT p.id, 'U-' || u, CASE WHEN u % 10 = 0 THEN 'VACANT' ELSE 'OCCUPIED' END
+FROM properties p, generate_series(1, 50) u;
+INSERT INTO tenancies (unit_id, payment_structure, rent_amount, tenant_name, start_date, status, is_active)
+SELECT id, 'RENT', 1000 + (id % 500), 'Tenant ' || id, CURRENT_DATE - (:months * 30), 'ACTIVE', true
+FROM units WHERE status = 'OCCUPIED';
+INSERT INTO payments (tenancy_id, unit_id, amount, payment_type, payment_date, status)
+SELECT t.id, t.unit_id, t.rent_amount, 'RENT', CURRENT_DATE - (m * 30), 'PAID'
+FROM tenancies t, generate_series(0, :months - 1) m;
+"""
+
+
+async def legacy_owner_stats(conn, owner_id: int) -> dict:
+    """The pre-CTE implementation: five round trips."""
+    total_properties = (await conn.execute(
+        select(func.count(Property.id)).where(Property.owner_id == owner_id)
+    )).scalar() or 0
+    active_tenants = (await conn.execute(
+        select(func.count(Tenancy.id))
+        .join(Unit, Tenancy.unit_id == Unit.id)
+        .join(Property, Unit.property_id == Property.id)
+        .where(and_(Property.owner_id == owner_id, Tenancy.status == "ACTIVE"))
+    )).scalar() or 0
+    monthly_revenue = (await conn.execute(
+        select(func.sum(Payment.amount))
+        .join(Tenancy, Payment.tenancy_id == Tenancy.id)
+        .join(Unit, Tenancy.unit_id == Unit.id)
+        .join(Property, Unit.property_id == Property.id)
+        .where(and_(
+            Property.owner_id == owner_id,
+            Payment.payment_type == "RENT",
+            Payment.payment_date >= date.today() - timedelta(days=30)
+        ))
+    )).scalar() or 0.0
+    total_units = (await conn.execute(
+        select(func.count(Unit.id)).join(Property, Unit.property_id == Property.id).where(Property.owner_id == owner_id)
+    )).scalar() or 0
+    occupied_units = (await conn.execute(
+        select(func.count(Unit.id))
+        .join(Property, Unit.property_id == Property.id)
+        .where(and_(Property.owner_id == owner_id, Unit.status == "OCCUPIED"))
+    )).scalar() or 0
+    return {
+        "total_properties": total_properties,
+        "active_tenants": active_tenants,
+        "monthly_revenue": monthly_revenue,
+        "occupancy_rate": int(occupied_units / total_units * 100) if total_units else 0,
+    }
+
+
+async def rollup_owner_stats(conn, owner_id: int) -> dict:
+    row = (await conn.execute(owner_stats_query(owner_id))).one()
+    return {
+        "total_properties": row.total_properties or 0,
+        "active_tenants": row.active_tenants or 0,
+        "monthly_revenue": row.monthly_revenue or 0.0,
+        "occupancy_rate": int(row.occupied_units / row.total_units * 100) if row.total_units else 0,
+    }
+
+
+async def timed(label: str, fn, iterations: int) -> dict:
+    samples = []
+    result = None
+    async with engine.connect() as conn:
+        await fn(conn, 1)  # warm-up
+        for _ in range(iterations):
+            started = time.perf_counter()
+            result = await fn(conn, 1)
+            samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    print(
+        f"{label:<8} p50={statistics.median(samples):8.2f}ms  "
+        f"p95={samples[int(0.95 * (len(samples) - 1))]:8.2f}ms  max={samples[-1]:8.2f}ms"
+    )
+    return result
+
+
+async def main(units: int, months: int, iterations: int) -> None:
+    async with engine.begin() as conn:
+        print(f"Seeding {units} units / ~{int(units * 0.9 * months)} payments for the benchmarked owner ...")
+        for statement in SEED_SQL.split(";\n"):
+            if statement.strip():
+                await conn.execute(text(statement), {"units": units, "months": months})
+        await rebuild_rollups(conn)
+        await conn.execute(text("ANALYZE"))
+
+    legacy = await timed("legacy", legacy_owner_stats, iterations)
+    rollup = await timed("rollup", rollup_owner_stats, iterations)
+    print(f"results match: {legacy == rollup}  {rollup}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--units", type=int, default=5000)
+    parser.add_argument("--months", type=int, default=60)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--yes", action="store_true", help="confirm the target database may be wiped")
+    args = parser.parse_args()
+    if not args.yes:
+        print("Refusing to run: this TRUNCATEs every table in DATABASE_URL. Pass --yes on a throwaway database.")
+        sys.exit(2)
+    asyncio.run(main(args.units, args.months, args.iterations))
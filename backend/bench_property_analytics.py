@@ -0,0 +1,148 @@
+"""
+Latency benchmark for GET /properties/{id}/analytics: the previous six sequential
+queries over raw units/tenancies/payments versus compute_property_analytics in
+app/routers/properties.py (one rollup/month-series statement plus the lease check,
+run one after the other on the request's session).
+
+Seeds one large property into a *throwaway* Postgres database (TRUNCATEs every
+table), then times both versions against it.
+
+    DATABASE_URL=postgresql://localhost/koko_bench alembic upgrade head
+    DATABASE_URL=postgresql://localhost/koko_bench python bench_property_analytics.py --yes [--units 5000] [--months 60]
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import os
+import time
+from datetime import date, timedelta
+
+sys.path.append(os.getcwd())
+
+from sqlalchemy import select, func, and_, case, extract, text
+
+from app.database import engine, AsyncSessionLocal
+from app.models import Tenancy, Payment, Unit
+from app.routers.properties import compute_property_analytics
+from app.utils.rollups import rebuild_rollups
+
+SEED_SQL = """
+TRUNCATE maintenance_comments, maintenance_requests, payments, tenancies, units, properties, users RESTART IDENTITY CASCADE;
+INSERT INTO users (firebase_uid, email, role, name) VALUES ('owner-bench', 'bench@example.com', 'OWNER', 'Bench Owner');
+INSERT INTO properties (owner_id, name, address, units_count) VALUES (1, 'Big Property', '1 Main Street', :units);
+-- Neighbouring properties with the same volume, so the benchmarked one is not the whole table
+INSERT INTO properties (owner_id, name, address, units_count)
+SELECT 1, 'Property ' || g, g || ' Main Street', :units FROM generate_series(2, 4) g;
+INSERT INTO units (property_id, unit_number, status)
+SELECT p.id, 'U-' || u, CASE WHEN u % 10 = 0 THEN 'VACANT' ELSE 'OCCUPIED' END
+FROM properties p, generate_series(1, :units) u;
+INSERT INTO tenancies (unit_id, payment_structure, rent_amount, tenant_name, start_date, end_date, status, is_active)
+SELECT id, 'RENT', 1000 + (id % 500), 'Tenant ' || id, CURRENT_DATE - (:months * 30), CURRENT_DATE + (id % 400), 'ACTIVE', true
+FROM units WHERE status = 'OCCUPIED';
+INSERT INTO payments (tenancy_id, unit_id, amount, payment_type, payment_date, status)
+SELECT t.id, t.unit_id, t.rent_amount, CASE WHEN m % 6 = 0 THEN 'MAINTENANCE' ELSE 'RENT' END, CURRENT_DATE - (m * 30), 'PAID'
+FROM tenancies t, generate_series(0, :months - 1) m;
+"""
+
+
+async def legacy_property_analytics(db, property_id: int) -> dict:
+    """The pre-rollup implementation: six sequential queries, each re-deriving the unit ids."""
+    occ = (await db.execute(
+        select(
+            func.count(Unit.id).label("total"),
+            func.sum(case((Unit.status == "OCCUPIED", 1), else_=0)).label("occupied"),
+            func.sum(case((Unit.status == "VACANT", 1), else_=0)).label("vacant"),
+            func.sum(case((Unit.status == "UNDER_MAINTENANCE", 1), else_=0)).label("maintenance")
+        ).where(Unit.property_id == property_id)
+    )).first()
+    unit_ids_sub = select(Unit.id).where(Unit.property_id == property_id)
+    projected_rent = (await db.execute(
+        select(func.sum(Tenancy.rent_amount))
+        .where(and_(Tenancy.unit_id.in_(unit_ids_sub), Tenancy.status == "ACTIVE"))
+    )).scalar() or 0.0
+    today = date.today()
+    six_months_ago = today - timedelta(days=180)
+    month_year = (extract("year", Payment.payment_date), extract("month", Payment.payment_date))
+    rev_rows = (await db.execute(
+        select(*month_year, func.sum(Payment.amount))
+        .join(Tenancy, Payment.tenancy_id == Tenancy.id)
+        .where(and_(
+            Tenancy.unit_id.in_(unit_ids_sub),
+            Payment.payment_type == "RENT",
+            Payment.payment_date >= six_months_ago
+        ))
+        .group_by(*month_year)
+    )).all()
+    maintenance_spend = (await db.execute(
+        select(func.sum(Payment.amount))
+        .join(Tenancy, Payment.tenancy_id == Tenancy.id)
+        .where(and_(
+            Tenancy.unit_id.in_(unit_ids_sub),
+            Payment.payment_type != "RENT",
+            Payment.payment_date >= six_months_ago
+        ))
+    )).scalar() or 0.0
+    expiring = (await db.execute(
+        select(Tenancy, Unit.unit_number)
+        .join(Unit, Tenancy.unit_id == Unit.id)
+        .where(and_(
+            Tenancy.unit_id.in_(unit_ids_sub),
+            Tenancy.status == "ACTIVE",
+            Tenancy.end_date <= today + timedelta(days=90),
+            Tenancy.end_date >= today
+        ))
+    )).all()
+    return {"units": occ.total, "projected_rent": projected_rent, "months": len(rev_rows),
+            "maintenance_spend": maintenance_spend, "expiring": len(expiring)}
+
+
+async def current_property_analytics(db, property_id: int) -> dict:
+    result = await compute_property_analytics(db, property_id)
+    return {"units": result.occupancy.total_units, "projected_rent": result.financials.current_month_projected_rent,
+            "maintenance_spend": result.financials.maintenance_spend_6_months,
+            "expiring": sum(1 for a in result.alerts if a.type == "EXPIRING_LEASE")}
+
+
+async def timed(label: str, fn, iterations: int) -> dict:
+    samples = []
+    result = None
+    async with AsyncSessionLocal() as db:
+        await fn(db, 1)  # warm-up
+        for _ in range(iterations):
+            started = time.perf_counter()
+            result = await fn(db, 1)
+            samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    print(
+        f"{label:<8} p50={statistics.median(samples):8.2f}ms  "
+        f"p95={samples[int(0.95 * (len(samples) - 1))]:8.2f}ms  max={samples[-1]:8.2f}ms"
+    )
+    return result
+
+
+async def main(units: int, months: int, iterations: int) -> None:
+    async with engine.begin() as conn:
+        print(f"Seeding 4 properties x {units} units / ~{int(units * 0.9 * months)} payments each ...")
+        for statement in SEED_SQL.split(";\n"):
+            if statement.strip():
+                await conn.execute(text(statement), {"units": units, "months": months})
+        await rebuild_rollups(conn)
+        await conn.execute(text("ANALYZE"))
+
+    print(await timed("legacy", legacy_property_analytics, iterations))
+    print(await timed("current", current_property_analytics, iterations))
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--units", type=int, default=5000)
+    parser.add_argument("--months", type=int, default=60)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--yes", action="store_true", help="confirm the target database may be wiped")
+    args = parser.parse_args()
+    if not args.yes:
+        print("Refusing to run: this TRUNCATEs every table in DATABASE_URL. Pass --yes on a throwaway database.")
+        sys.exit(2)
+    asyncio.run(main(args.units, args.months, args.iterations))
@@ -0,0 +1,126 @@
+"""
+Latency benchmark for GET /properties/nearby on 100k located properties: the
+lat_band + location_lng index query in app/routers/properties.py versus loading
+every located property and filtering and sorting with haversine in Python.
+
+Seeds a *throwaway* Postgres database (TRUNCATEs every table), then times both.
+
+    DATABASE_URL=postgresql://localhost/koko_bench alembic upgrade head
+    DATABASE_URL=postgresql://localhost/koko_bench python bench_property_nearby.py --yes [--properties 100000]
+"""
+import argparse
+import asyncio
+import math
+import statistics
+import sys
+import os
+import time
+
+sys.path.append(os.getcwd())
+
+from sqlalchemy import select, text
+
+from app.database import engine, AsyncSessionLocal
+from app.models import Property
+from app.routers.properties import nearby_query
+from app.utils.geo import EARTH_RADIUS_KM, bounding_box
+
+# Properties cluster around these cities, spread over roughly +-0.3 degrees
+CITIES = {
+    "Bengaluru": (12.9716, 77.5946),
+    "Mumbai": (19.0760, 72.8777),
+    "Delhi": (28.6139, 77.2090),
+    "Chennai": (13.0827, 80.2707),
+    "Hyderabad": (17.3850, 78.4867),
+    "Pune": (18.5204, 73.8567),
+    "Kochi": (9.9312, 76.2673),
+}
+
+SEED_SQL = """
+TRUNCATE maintenance_comments, maintenance_requests, payments, tenancies, units, properties, users RESTART IDENTITY CASCADE;
+INSERT INTO users (firebase_uid, email, role, name)
+SELECT 'owner-' || g, 'owner' || g || '@example.com', 'OWNER', 'Owner ' || g FROM generate_series(1, :owners) g;
+INSERT INTO properties (owner_id, name, address, units_count, location_lat, location_lng)
+SELECT 1 + (g / 100) % :owners, 'Property ' || g, g || ' Main Street', 1 + g % 40,
+       (ARRAY[{lats}])[1 + g % {cities}] + (random() - 0.5) * 0.6,
+       (ARRAY[{lngs}])[1 + g % {cities}] + (random() - 0.5) * 0.6
+FROM generate_series(1, :properties) g;
+ANALYZE properties;
+""".format(
+    lats=", ".join(str(lat) for lat, _ in CITIES.values()),
+    lngs=", ".join(str(lng) for _, lng in CITIES.values()),
+    cities=len(CITIES),
+)
+
+RADII_KM = [1, 5, 20, 50]
+
+
+def haversine_km(lat1, lng1, lat2, lng2) -> float:
+    dlat, dlng = math.radians(lat2 - lat1), math.radians(lng2 - lng1)
+    a = math.sin(dlat / 2) ** 2 + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlng / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+async def indexed(db, lat, lng, radius_km):
+    located = nearby_query(lat, lng, bounding_box(lat, lng, radius_km)).subquery()
+    stmt = (
+        select(located.c.id, located.c.distance_km)
+        .where(located.c.distance_km <= radius_km)
+        .order_by(located.c.distance_km, located.c.id)
+        .limit(51)
+    )
+    return (await db.execute(stmt)).all()
+
+
+async def baseline(db, lat, lng, radius_km):
+    """Before: no spatial index, every located row distance-checked in Python."""
+    rows = (await db.execute(
+        select(Property.id, Property.location_lat, Property.location_lng).where(Property.location_lat.isnot(None))
+    )).all()
+    hits = [(haversine_km(lat, lng, r.location_lat, r.location_lng), r.id) for r in rows]
+    return sorted(hit for hit in hits if hit[0] <= radius_km)[:51]
+
+
+async def timed(fn, rounds: int) -> list:
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        await fn()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def fmt(samples: list) -> str:
+    p95 = sorted(samples)[max(0, int(len(samples) * 0.95) - 1)]
+    return f"p50 {statistics.median(samples) * 1000:8.2f} ms  p95 {p95 * 1000:8.2f} ms"
+
+
+async def main(properties: int, owners: int, rounds: int):
+    print(f"Seeding {properties} properties around {len(CITIES)} cities ...")
+    async with engine.begin() as conn:
+        for statement in SEED_SQL.split(";\n"):
+            if statement.strip():
+                await conn.execute(text(statement), {"properties": properties, "owners": owners})
+
+    lat, lng = CITIES["Bengaluru"]
+    async with AsyncSessionLocal() as db:
+        for radius_km in RADII_KM:
+            rows = await indexed(db, lat, lng, radius_km)
+            expected = await baseline(db, lat, lng, radius_km)
+            assert [r.id for r in rows] == [hit[1] for hit in expected], "indexed and baseline results differ"
+            fast = await timed(lambda: indexed(db, lat, lng, radius_km), rounds)
+            slow = await timed(lambda: baseline(db, lat, lng, radius_km), max(3, rounds // 10))
+            print(f"radius {radius_km:>3} km  {len(rows):>3} on page   nearby {fmt(fast)}   python {fmt(slow)}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--properties", type=int, default=100000)
+    parser.add_argument("--owners", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=30)
+    parser.add_argument("--yes", action="store_true", help="confirm that the database may be wiped")
+    args = parser.parse_args()
+    if not args.yes:
+        sys.exit("Refusing to TRUNCATE without --yes (point DATABASE_URL at a throwaway database)")
+    asyncio.run(main(args.properties, args.owners, args.rounds))
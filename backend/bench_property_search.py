@@ -0,0 +1,110 @@
+"""
+Latency benchmark for GET /properties/search on 100k properties: the ranked
+full-text (+ trigram, when pg_trgm is installed) query in app/routers/properties.py
+versus a plain ILIKE scan over the same columns.
+
+Seeds a *throwaway* Postgres database (TRUNCATEs every table), then times both.
+
+    DATABASE_URL=postgresql://localhost/koko_bench alembic upgrade head
+    DATABASE_URL=postgresql://localhost/koko_bench python bench_property_search.py --yes [--properties 100000]
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import os
+import time
+from types import SimpleNamespace
+
+sys.path.append(os.getcwd())
+
+from sqlalchemy import select, or_, cast, String, text
+
+from app.database import engine, AsyncSessionLocal
+from app.models import Property
+from app.routers.properties import PROPERTY_FIELDS, search_properties_postgres
+from app.utils.search import tokenize, has_extension
+
+SEED_SQL = """
+TRUNCATE maintenance_comments, maintenance_requests, payments, tenancies, units, properties, users RESTART IDENTITY CASCADE;
+INSERT INTO users (firebase_uid, email, role, name)
+SELECT 'owner-' || g, 'owner' || g || '@example.com', 'OWNER', 'Owner ' || g FROM generate_series(1, :owners) g;
+INSERT INTO properties (owner_id, name, address, description, property_type, units_count, amenities, highlights)
+SELECT 1 + (g / 100) % :owners,
+       (ARRAY['Sunrise','Lakeview','Green','Harbour','Silver','Royal','Palm','Maple','Cedar','Golden'])[1 + g % 10]
+         || ' ' || (ARRAY['Towers','Residency','Meadows','Point','Heights','Enclave','Gardens','Court'])[1 + (g / 10) % 8]
+         || ' ' || g,
+       g || ' ' || (ARRAY['MG Road','Lake Road','Park Street','Station Road','Beach Road','Hill View'])[1 + g % 6]
+         || ', ' || (ARRAY['Bengaluru','Pune','Chennai','Mumbai','Hyderabad','Kochi','Delhi'])[1 + (g / 7) % 7],
+       'Well kept ' || (ARRAY['apartments','villas','studios','duplexes'])[1 + g % 4] || ' close to schools and offices',
+       'Apartment', 1 + g % 40,
+       CAST(json_build_array((ARRAY['Gym','Swimming Pool','Parking','Clubhouse','Garden'])[1 + g % 5], 'Lift') AS JSON),
+       CAST(json_build_array((ARRAY['Peaceful','City Center','Sea view','Metro nearby'])[1 + g % 4]) AS JSON)
+FROM generate_series(1, :properties) g;
+ANALYZE properties;
+"""
+
+QUERIES = ["sunrise", "swimming pool", "lakeview heights", "hyderabad", "sunr", "lakevew"]
+
+
+def ilike_query(q: str, owner_id=None):
+    """Baseline: substring match on every field, no ranking."""
+    pattern = f"%{q}%"
+    stmt = select(Property.id, Property.name).where(or_(
+        Property.name.ilike(pattern), Property.address.ilike(pattern), Property.description.ilike(pattern),
+        cast(Property.amenities, String).ilike(pattern), cast(Property.highlights, String).ilike(pattern),
+    ))
+    if owner_id is not None:
+        stmt = stmt.where(Property.owner_id == owner_id)
+    return stmt.order_by(Property.id).limit(51)
+
+
+async def timed(fn, rounds: int) -> list:
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        await fn()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def fmt(samples: list) -> str:
+    p95 = sorted(samples)[max(0, int(len(samples) * 0.95) - 1)]
+    return f"p50 {statistics.median(samples) * 1000:7.2f} ms  p95 {p95 * 1000:7.2f} ms"
+
+
+async def main(properties: int, owners: int, rounds: int):
+    print(f"Seeding {properties} properties for {owners} owners ...")
+    async with engine.begin() as conn:
+        for statement in SEED_SQL.split(";\n"):
+            if statement.strip():
+                await conn.execute(text(statement), {"properties": properties, "owners": owners})
+
+    names = PROPERTY_FIELDS.parse(None)
+    admin = SimpleNamespace(id=0, role="ADMIN")
+    owner = SimpleNamespace(id=1, role="OWNER")
+    async with AsyncSessionLocal() as db:
+        print(f"pg_trgm installed: {await has_extension(db, 'pg_trgm')}\n")
+        for scope, user in (("all properties", admin), ("one owner", owner)):
+            print(f"-- {scope}")
+            for q in QUERIES:
+                tokens = tokenize(q)
+                page = await search_properties_postgres(db, user, q, tokens, names, 50, None)
+                search = await timed(lambda: search_properties_postgres(db, user, q, tokens, names, 50, None), rounds)
+                owner_id = None if user is admin else user.id
+                baseline = await timed(lambda: db.execute(ilike_query(q, owner_id)), rounds)
+                print(f"{q!r:<20} {len(page['items']):>3} on page   search {fmt(search)}   ilike {fmt(baseline)}")
+            print()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--properties", type=int, default=100000)
+    parser.add_argument("--owners", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=30)
+    parser.add_argument("--yes", action="store_true", help="confirm that the database may be wiped")
+    args = parser.parse_args()
+    if not args.yes:
+        sys.exit("Refusing to TRUNCATE without --yes (point DATABASE_URL at a throwaway database)")
+    asyncio.run(main(args.properties, args.owners, args.rounds))
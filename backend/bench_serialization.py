@@ -0,0 +1,90 @@
+"""
+Serialization benchmark for list endpoints such as GET /finance/payments: the
+previous path (ORM instances walked by jsonable_encoder, then the stdlib-json
+JSONResponse) versus the current one (PaymentResponse validated and dumped by
+pydantic-core through the route's response model, then ORJSONResponse).
+
+The rows are built in memory; DATABASE_URL only has to be set for the app config,
+nothing connects to it.
+
+    DATABASE_URL=postgresql://localhost/koko_bench python bench_serialization.py [--rows 10000] [--rounds 20]
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import os
+import time
+from datetime import date, timedelta
+from typing import List
+
+sys.path.append(os.getcwd())
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.models import Payment
+from app.schemas import PaymentResponse
+
+
+def make_payments(rows: int) -> list:
+    start = date(2020, 1, 1)
+    return [
+        Payment(
+            id=i, tenancy_id=i % 700 + 1, unit_id=None, amount=1000.0 + i % 500,
+            payment_type="RENT" if i % 6 else "MAINTENANCE",
+            payment_date=start + timedelta(days=i % 2000), status="PAID",
+        )
+        for i in range(1, rows + 1)
+    ]
+
+
+async def legacy(payments: list) -> bytes:
+    # What FastAPI does for a route without a response model
+    return JSONResponse(jsonable_encoder(payments)).body
+
+
+async def current(payments: list, field) -> bytes:
+    content = await serialize_response(field=field, response_content=payments, is_coroutine=True)
+    return ORJSONResponse(content).body
+
+
+async def timed(fn, rounds: int) -> list:
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        await fn()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def report(name: str, samples: list, rows: int) -> float:
+    median = statistics.median(samples)
+    print(f"{name:<8} median {median * 1000:8.1f} ms   p95 {sorted(samples)[int(len(samples) * 0.95) - 1] * 1000:8.1f} ms"
+          f"   {rows / median:12,.0f} rows/s")
+    return median
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    payments = make_payments(args.rows)
+    field = create_response_field(name="response", type_=List[PaymentResponse])
+
+    old_body, new_body = await legacy(payments), await current(payments, field)
+    assert json.loads(old_body) == json.loads(new_body), "serializations differ"
+    print(f"{args.rows} payments, {len(new_body) / 1024:.0f} KiB body, {args.rounds} rounds\n")
+
+    old = report("legacy", await timed(lambda: legacy(payments), args.rounds), args.rows)
+    new = report("current", await timed(lambda: current(payments, field), args.rounds), args.rows)
+    print(f"\nspeedup: {old / new:.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
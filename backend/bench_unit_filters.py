@@ -0,0 +1,126 @@
+"""
+Latency benchmark for the JSONB containment filters: GET /properties/units as a
+vacancy finder (?status=VACANT&bhk=2&amenity=Gym) and GET /properties/?amenity=,
+across every property (admin scope), versus loading all units and properties and
+filtering in Python.
+
+Seeds a *throwaway* Postgres database (TRUNCATEs every table), then times both.
+
+    DATABASE_URL=postgresql://localhost/koko_bench alembic upgrade head
+    DATABASE_URL=postgresql://localhost/koko_bench python bench_unit_filters.py --yes [--properties 10000]
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import os
+import time
+from types import SimpleNamespace
+
+sys.path.append(os.getcwd())
+
+from fastapi import Response
+from sqlalchemy import select, text
+
+from app.database import engine, AsyncSessionLocal
+from app.models import Property, Unit
+from app.routers.properties import find_units, get_my_properties
+from app.utils.pagination import PageParams
+
+SEED_SQL = """
+TRUNCATE maintenance_comments, maintenance_requests, payments, tenancies, units, properties, users RESTART IDENTITY CASCADE;
+INSERT INTO users (firebase_uid, email, role, name)
+SELECT 'owner-' || g, 'owner' || g || '@example.com', 'OWNER', 'Owner ' || g FROM generate_series(1, :owners) g;
+INSERT INTO properties (owner_id, name, address, units_count, amenities)
+SELECT 1 + (g / 100) % :owners, 'Property ' || g, g || ' Main Street', :units,
+       CAST(CASE WHEN g % 20 = 0 THEN '["Gym", "Swimming Pool", "Lift"]'
+                 WHEN g % 5 = 0 THEN '["Swimming Pool", "Parking"]'
+                 ELSE '["Parking", "Lift"]' END AS jsonb)
+FROM generate_series(1, :properties) g;
+INSERT INTO units (property_id, unit_number, status, specifications)
+SELECT p, 'U-' || u, CASE WHEN u % 6 = 0 THEN 'VACANT' ELSE 'OCCUPIED' END,
+       jsonb_build_object('bhk', 1 + (u + p / 20) % 4, 'sqft', 500 + u * 50)
+FROM generate_series(1, :properties) p, generate_series(1, :units) u;
+ANALYZE properties;
+ANALYZE units;
+"""
+
+ADMIN = SimpleNamespace(id=0, role="ADMIN")
+
+
+async def vacancy_finder(db):
+    return await find_units(
+        response=Response(), page=PageParams(cursor=None, limit=50), fields=None, property_id=None,
+        status="VACANT", bhk=2, amenity=["Gym"], user=ADMIN, db=db,
+    )
+
+
+async def vacancy_finder_baseline(db):
+    """Before: every unit and its property's amenities loaded, then filtered in Python."""
+    rows = (await db.execute(
+        select(Unit, Property.amenities).join(Property, Unit.property_id == Property.id).order_by(Unit.id)
+    )).all()
+    return [
+        unit for unit, amenities in rows
+        if unit.status == "VACANT" and (unit.specifications or {}).get("bhk") == 2 and "Gym" in (amenities or [])
+    ][:50]
+
+
+async def amenity_list(db):
+    return await get_my_properties(
+        response=Response(), page=PageParams(cursor=None, limit=50), fields=None,
+        amenity=["Gym", "Swimming Pool"], highlight=[], house_rule=[], user=ADMIN, db=db,
+    )
+
+
+async def amenity_list_baseline(db):
+    props = (await db.execute(select(Property).order_by(Property.id))).scalars().all()
+    return [p for p in props if {"Gym", "Swimming Pool"} <= set(p.amenities or [])][:50]
+
+
+async def timed(fn, rounds: int) -> list:
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        await fn()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def fmt(samples: list) -> str:
+    p95 = sorted(samples)[max(0, int(len(samples) * 0.95) - 1)]
+    return f"p50 {statistics.median(samples) * 1000:8.2f} ms  p95 {p95 * 1000:8.2f} ms"
+
+
+async def main(properties: int, units: int, owners: int, rounds: int):
+    print(f"Seeding {properties} properties x {units} units ...")
+    async with engine.begin() as conn:
+        for statement in SEED_SQL.split(";\n"):
+            if statement.strip():
+                await conn.execute(text(statement), {"properties": properties, "units": units, "owners": owners})
+
+    async with AsyncSessionLocal() as db:
+        for label, fast_fn, slow_fn in (
+            ("vacancy finder", vacancy_finder, vacancy_finder_baseline),
+            ("amenity list", amenity_list, amenity_list_baseline),
+        ):
+            page = await fast_fn(db)
+            expected = await slow_fn(db)
+            assert [item.id for item in page["items"]] == [row.id for row in expected], f"{label}: results differ"
+            fast = await timed(lambda: fast_fn(db), rounds)
+            slow = await timed(lambda: slow_fn(db), max(3, rounds // 10))
+            print(f"{label:<15} {len(page['items']):>3} on page   indexed {fmt(fast)}   python {fmt(slow)}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--properties", type=int, default=10000)
+    parser.add_argument("--units", type=int, default=20, help="units per property")
+    parser.add_argument("--owners", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=30)
+    parser.add_argument("--yes", action="store_true", help="confirm that the database may be wiped")
+    args = parser.parse_args()
+    if not args.yes:
+        sys.exit("Refusing to TRUNCATE without --yes (point DATABASE_URL at a throwaway database)")
+    asyncio.run(main(args.properties, args.units, args.owners, args.rounds))
@@ -0,0 +1,101 @@
+"""
+Self-check for LocalTokenVerifier (app/utils/local_verifier.py) against a locally
+generated RSA key pair: signs ID tokens the way Firebase does and checks that good
+tokens verify and bad ones raise the matching firebase_admin.auth error. Needs no
+network access or Firebase project.
+
+    python check_local_verifier.py
+"""
+import asyncio
+import sys
+import os
+import time
+
+sys.path.append(os.getcwd())
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from firebase_admin import auth
+
+from app.utils.local_verifier import LocalTokenVerifier, PublicKeySet, RevokedUidSet
+
+PROJECT_ID = "koko-local-check"
+KID = "local-key"
+
+
+def generate_key():
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+def public_pem(private_key) -> str:
+    return private_key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    ).decode()
+
+
+def sign(private_key, kid: str = KID, algorithm: str = "RS256", **overrides) -> str:
+    now = int(time.time())
+    claims = {
+        "iss": f"https://securetoken.google.com/{PROJECT_ID}",
+        "aud": PROJECT_ID,
+        "sub": "uid-1",
+        "iat": now - 10,
+        "exp": now + 3600,
+        "auth_time": now - 10,
+    }
+    claims.update(overrides)
+    claims = {k: v for k, v in claims.items() if v is not None}
+    return jwt.encode(claims, private_key, algorithm=algorithm, headers={"kid": kid})
+
+
+async def main() -> int:
+    key, other_key = generate_key(), generate_key()
+    revocations = {"revoked-uid": time.time()}
+    verifier = LocalTokenVerifier(
+        project_id=PROJECT_ID,
+        keys=PublicKeySet(lambda: ({KID: public_pem(key)}, 3600)),
+        revoked=RevokedUidSet(lambda: revocations),
+    )
+    await verifier.keys.refresh()
+    await verifier.revoked.sync()
+
+    hs256_key = "x" * 32
+    cases = [
+        ("valid token", sign(key), None),
+        ("expired", sign(key, exp=int(time.time()) - 60), auth.ExpiredIdTokenError),
+        ("wrong audience", sign(key, aud="someone-else"), auth.InvalidIdTokenError),
+        ("wrong issuer", sign(key, iss="https://example.com"), auth.InvalidIdTokenError),
+        ("missing subject", sign(key, sub=None), auth.InvalidIdTokenError),
+        ("future auth_time", sign(key, auth_time=int(time.time()) + 3600), auth.InvalidIdTokenError),
+        ("signed by another key", sign(other_key), auth.InvalidIdTokenError),
+        ("unknown key id", sign(key, kid="rotated-out"), auth.InvalidIdTokenError),
+        ("HS256", jwt.encode({"sub": "uid-1"}, hs256_key, algorithm="HS256", headers={"kid": KID}), auth.InvalidIdTokenError),
+        ("malformed", "not-a-jwt", auth.InvalidIdTokenError),
+        ("revoked", sign(key, sub="revoked-uid", iat=int(time.time()) - 60), auth.RevokedIdTokenError),
+    ]
+
+    failures = 0
+    for name, token, expected in cases:
+        try:
+            claims = verifier(token, check_revoked=True)
+            outcome = None if claims.get("uid") == "uid-1" else "wrong uid"
+        except Exception as e:
+            outcome = type(e)
+        ok = outcome is expected
+        failures += not ok
+        print(f"{'ok  ' if ok else 'FAIL'} {name}" + ("" if ok else f" (expected {expected}, got {outcome})"))
+
+    try:
+        LocalTokenVerifier(project_id=None, keys=verifier.keys, revoked=verifier.revoked)
+        print("FAIL missing project id accepted")
+        failures += 1
+    except ValueError:
+        print("ok   missing project id rejected")
+
+    print(f"\n{failures} failure(s)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,183 @@
+"""
+Query-plan regression check for the owner-scoped hot paths.
+
+Seeds a large synthetic dataset into a *throwaway* Postgres database, calls the
+owner/tenant endpoints through the app, captures every SQL statement they issue,
+and EXPLAINs each one. Fails if any statement sequentially scans a large table.
+
+    DATABASE_URL=postgresql://localhost/koko_plans alembic upgrade head
+    DATABASE_URL=postgresql://localhost/koko_plans python check_query_plans.py --yes [--scale 1000]
+
+Requires httpx (for fastapi.testclient). The seed step TRUNCATEs every table.
+"""
+import argparse
+import json
+import sys
+import os
+
+sys.path.append(os.getcwd())
+
+from sqlalchemy import create_engine, event, text
+
+from app.database import DATABASE_URL, engine
+from app.dependencies import get_current_user_uid
+from app.utils.rollups import ROLLUP_SOURCES
+
+# Tables big enough after seeding that a Seq Scan means a missing index
+LARGE_TABLES = {"properties", "units", "tenancies", "payments", "maintenance_requests", "maintenance_comments"}
+
+SEED_SQL = """
+TRUNCATE maintenance_comments, maintenance_requests, payments, tenancies, units, properties, users RESTART IDENTITY CASCADE;
+
+INSERT INTO users (firebase_uid, email, role, name)
+SELECT 'owner-' || g, 'owner' || g || '@example.com', 'OWNER', 'Owner ' || g FROM generate_series(1, :owners) g;
+INSERT INTO users (firebase_uid, email, role, name)
+SELECT 'tenant-' || g, 'tenant' || g || '@example.com', 'TENANT', 'Tenant ' || g FROM generate_series(1, :owners * 20) g;
+
+INSERT INTO properties (owner_id, name, address, units_count, location_lat, location_lng, amenities)
+SELECT 1 + (g % :owners), 'Property ' || g, g || ' Main Street', 20, 12.5 + (g % 997) * 0.001, 77.1 + (g % 991) * 0.001,
+       CASE WHEN g % 7 = 0 THEN '["Gym", "Pool"]' ELSE '["Parking"]' END::jsonb
+FROM generate_series(1, :owners * 5) g;
+
+INSERT INTO units (property_id, unit_number, status, specifications)
+SELECT p, 'U-' || u, CASE WHEN u % 10 = 0 THEN 'VACANT' ELSE 'OCCUPIED' END, jsonb_build_object('bhk', 1 + u % 4)
+FROM generate_series(1, :owners * 5) p, generate_series(1, 20) u;
+
+-- One historic and one current tenancy per unit
+INSERT INTO tenancies (unit_id, tenant_id, payment_structure, rent_amount, start_date, end_date, status, is_active)
+SELECT id, :owners + 1 + (id % (:owners * 20)), 'RENT', 1000 + (id % 500),
+       CURRENT_DATE - 800, CURRENT_DATE - 400, 'HISTORIC', false
+FROM units;
+INSERT INTO tenancies (unit_id, tenant_id, payment_structure, rent_amount, start_date, end_date, status, is_active)
+SELECT id, :owners + 1 + (id % (:owners * 20)), 'RENT', 1000 + (id % 500),
+       CURRENT_DATE - 365, CURRENT_DATE + (id % 365), 'ACTIVE', true
+FROM units WHERE status = 'OCCUPIED';
+
+-- Twelve monthly payments per tenancy
+INSERT INTO payments (tenancy_id, unit_id, amount, payment_type, payment_date, status)
+SELECT t.id, t.unit_id, t.rent_amount, CASE WHEN m % 6 = 0 THEN 'MAINTENANCE' ELSE 'RENT' END,
+       t.start_date + (m * 30), 'PAID'
+FROM tenancies t, generate_series(0, 11) m;
+
+INSERT INTO maintenance_requests (unit_id, tenant_id, reported_by_id, title, description, status, created_at)
+SELECT id, :owners + 1 + (id % (:owners * 20)), :owners + 1 + (id % (:owners * 20)),
+       'Leak', 'Kitchen tap is leaking', 'OPEN', now() - (id % 365) * interval '1 day'
+FROM units WHERE id % 3 = 0;
+
+INSERT INTO maintenance_comments (request_id, user_id, content)
+SELECT id, reported_by_id, 'Any update?' FROM maintenance_requests;
+"""
+
+
+def seed(sync_engine, scale: int) -> None:
+    print(f"Seeding {scale} owners / {scale * 100} units ...")
+    with sync_engine.begin() as conn:
+        for statement in SEED_SQL.split(";\n"):
+            if statement.strip():
+                conn.execute(text(statement), {"owners": scale})
+        for table, source in ROLLUP_SOURCES.items():
+            conn.execute(text(f"INSERT INTO {table} {source}"))
+        conn.execute(text("ANALYZE"))
+
+
+def seq_scans(plan: dict) -> list:
+    found = []
+    if plan.get("Node Type") == "Seq Scan" and plan.get("Relation Name") in LARGE_TABLES:
+        found.append(plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        found.extend(seq_scans(child))
+    return found
+
+
+def main(scale: int) -> int:
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    sync_engine = create_engine(DATABASE_URL)
+    seed(sync_engine, scale)
+
+    with sync_engine.connect() as conn:
+        owner_uid = "owner-1"
+        property_id = conn.execute(text("SELECT id FROM properties WHERE owner_id = 1 LIMIT 1")).scalar()
+        unit_id = conn.execute(text("SELECT id FROM units WHERE property_id = :p LIMIT 1"), {"p": property_id}).scalar()
+        request_id = conn.execute(
+            text("SELECT m.id FROM maintenance_requests m JOIN units u ON u.id = m.unit_id WHERE u.property_id = :p LIMIT 1"),
+            {"p": property_id},
+        ).scalar()
+        tenant_uid = conn.execute(
+            text("SELECT u.firebase_uid FROM users u JOIN tenancies t ON t.tenant_id = u.id WHERE t.status = 'ACTIVE' LIMIT 1")
+        ).scalar()
+
+    routes = [
+        (owner_uid, "/owner/stats"),
+        (owner_uid, "/properties/"),
+        (owner_uid, "/properties/?limit=50&amenity=Gym"),
+        (owner_uid, "/properties/units?limit=50&status=VACANT&bhk=2&amenity=Gym"),
+        (owner_uid, "/properties/search?q=property"),
+        (owner_uid, "/properties/nearby?lat=12.9&lng=77.5&radius_km=5"),
+        (owner_uid, "/properties/nearby?min_lat=12.8&min_lng=77.4&max_lat=13.0&max_lng=77.6"),
+        (owner_uid, f"/properties/{property_id}"),
+        (owner_uid, f"/properties/{property_id}/analytics"),
+        (owner_uid, f"/properties/units/{unit_id}"),
+        (owner_uid, f"/properties/units/{unit_id}/tenancies"),
+        (owner_uid, f"/properties/units/{unit_id}/payments"),
+        (owner_uid, "/finance/payments"),
+        (owner_uid, "/finance/payments?limit=50"),
+        (owner_uid, "/maintenance/"),
+        (owner_uid, "/maintenance/?limit=50"),
+        (owner_uid, "/maintenance/?limit=50&status=OPEN"),
+        (owner_uid, f"/maintenance/?limit=50&property_id={property_id}&sort=status"),
+        (tenant_uid, "/maintenance/?limit=50"),
+        (owner_uid, f"/maintenance/{request_id}/comments"),
+        (tenant_uid, "/tenancy/me"),
+    ]
+
+    captured = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    current_uid = {"uid": owner_uid}
+    app.dependency_overrides[get_current_user_uid] = lambda: current_uid["uid"]
+
+    failures = 0
+    with TestClient(app) as client:
+        for uid, path in routes:
+            current_uid["uid"] = uid
+            captured.clear()
+            response = client.get(path)
+            if response.status_code != 200:
+                print(f"FAIL {path}: HTTP {response.status_code} {response.text[:200]}")
+                failures += 1
+                continue
+
+            path_failures = 0
+            with sync_engine.connect() as conn:
+                for statement, parameters in list(captured):
+                    plan = conn.exec_driver_sql("EXPLAIN (FORMAT JSON) " + statement, parameters).scalar()
+                    if isinstance(plan, str):
+                        plan = json.loads(plan)
+                    scans = seq_scans(plan[0]["Plan"])
+                    if scans:
+                        path_failures += 1
+                        print(f"FAIL {path}: Seq Scan on {', '.join(sorted(set(scans)))}")
+                        print("     " + " ".join(statement.split())[:300])
+            failures += path_failures
+            if not path_failures:
+                print(f"ok   {path} ({len(captured)} statements)")
+
+    print(f"\n{failures} plan regression(s)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scale", type=int, default=500, help="number of owners to seed (100 units each)")
+    parser.add_argument("--yes", action="store_true", help="confirm the target database may be wiped")
+    args = parser.parse_args()
+    if not args.yes:
+        print("Refusing to run: this TRUNCATEs every table in DATABASE_URL. Pass --yes on a throwaway database.")
+        sys.exit(2)
+    sys.exit(main(args.scale))
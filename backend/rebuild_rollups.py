@@ -0,0 +1,54 @@
+"""
+Recompute the dashboard rollup tables (owner_rollups, property_rollups,
+revenue_rollups, payment_monthly_rollups) from the raw units/tenancies/payments,
+or check them for drift.
+
+    python rebuild_rollups.py            # rebuild in one transaction, then verify
+    python rebuild_rollups.py --verify   # report mismatches only; exit 1 on drift
+
+Postgres only. Safe to run on a live database: the rebuild replaces every row
+inside a single transaction, so readers see either the old or the new values.
+"""
+import argparse
+import asyncio
+import sys
+import os
+
+sys.path.append(os.getcwd())
+
+from sqlalchemy import text
+
+from app.database import engine
+from app.utils.rollups import rebuild_rollups, verify_rollups
+
+
+async def main(verify_only: bool) -> int:
+    if not verify_only:
+        async with engine.begin() as conn:
+            # Block concurrent writers so no increment lands between DELETE and INSERT
+            await conn.execute(text(
+                "LOCK TABLE owner_rollups, property_rollups, revenue_rollups, payment_monthly_rollups "
+                "IN SHARE ROW EXCLUSIVE MODE"
+            ))
+            counts = await rebuild_rollups(conn)
+        for table, count in counts.items():
+            print(f"Rebuilt {table}: {count} rows")
+
+    async with engine.connect() as conn:
+        problems = await verify_rollups(conn)
+    await engine.dispose()
+
+    if problems:
+        print(f"!! {len(problems)} rollup mismatches:")
+        for problem in problems[:50]:
+            print(f"   {problem}")
+        return 1
+    print("Rollups match the raw tables.")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--verify", action="store_true", help="only compare stored rollups with a fresh recomputation")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.verify)))
@@ -11,14 +11,19 @@ export default function UnitDetailsPage() {
     const { id, unit_id } = useParams(); // property id, unit id (matches [unit_id] folder)
     const router = useRouter();
     const [unit, setUnit] = useState<any>(null);
+    const [history, setHistory] = useState<any[]>([]);
     const [loading, setLoading] = useState(true);
 
     useEffect(() => {
         const fetchUnit = async () => {
             try {
-                // Fetch from our new endpoint
-                const res = await api.get(`/properties/units/${unit_id}`);
+                // Unit detail no longer embeds the tenancy history; it is paged separately
+                const [res, historyRes] = await Promise.all([
+                    api.get(`/properties/units/${unit_id}`),
+                    api.get(`/properties/units/${unit_id}/tenancies`, { params: { limit: 20 } }),
+                ]);
                 setUnit(res.data);
+                setHistory(historyRes.data.items || []);
             } catch (err) {
                 console.error(err);
             } finally {
@@ -32,7 +37,8 @@ export default function UnitDetailsPage() {
     if (!unit) return <div className="p-10 text-foreground">Unit not found.</div>;
 
     const currentTenancy = unit.tenancy;
-    const pastTenancies = unit.tenancies?.filter((t: any) => t.id !== currentTenancy?.id) || [];
+    const pastTenancies = history.filter((t: any) => t.id !== currentTenancy?.id);
+    const summary = unit.summary;
 
     return (
         <div className="space-y-6 max-w-5xl mx-auto pb-12">
@@ -65,6 +71,12 @@ export default function UnitDetailsPage() {
                 <p className="text-muted-foreground">
                     {unit.specifications?.bhk || 2} BHK • {unit.size_sqft} sq ft • {unit.facing} Facing
                 </p>
+                {summary && (
+                    <p className="text-sm text-muted-foreground mt-1">
+                        {summary.tenancies_count} tenancies • {summary.payments_count} payments • ${summary.payments_total} collected
+                        {summary.last_payment_date && <> • last paid {format(new Date(summary.last_payment_date), 'PPP')}</>}
+                    </p>
+                )}
             </div>
 
             {/* Current Tenant Card */}